@@ -0,0 +1,129 @@
+# core/editor_log.py
+"""
+Journal de l'éditeur, basé sur le module logging.
+
+    from core.editor_log import get_logger
+    log = get_logger("gizmos")
+    log.debug("Axe %s → distance écran %.4f", axis, dist)
+
+Chaque sous-système a son logger ("editor.<sous-système>") et son propre niveau :
+un message sous le niveau est écarté par isEnabledFor() avant tout formatage
+(les arguments sont passés à part, jamais en f-string). Les enregistrements
+(sous-système, niveau, horodatage, message) sont remis tels quels aux sinks
+enregistrés avec add_sink() — la console les filtre sans analyser le texte.
+
+Niveaux au démarrage : variable d'environnement EDITOR_LOG, par exemple
+EDITOR_LOG="info,gizmos=debug,scripts=warn" (le premier terme sans "=" fixe
+le niveau par défaut).
+"""
+import logging
+import os
+import sys
+import threading
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+ROOT = "editor"
+DEFAULT_LEVEL = INFO
+
+# Préfixes déjà utilisés dans les messages de l'éditeur
+LEVEL_TAGS = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERREUR", logging.CRITICAL: "ERREUR"}
+_LEVEL_NAMES = {"debug": DEBUG, "info": INFO, "warn": WARNING, "warning": WARNING,
+                "error": ERROR, "erreur": ERROR, "off": logging.CRITICAL + 1}
+
+_root = logging.getLogger(ROOT)
+_root.propagate = False
+_sinks = []
+_sinks_lock = threading.Lock()
+
+
+def subsystem_of(record):
+    """Sous-système d'un enregistrement ("editor.gizmos" -> "gizmos")."""
+    name = record.name
+    return name[len(ROOT) + 1:] if name.startswith(ROOT + ".") else name
+
+
+def format_record(record):
+    """Ligne de texte d'un enregistrement : "[NIVEAU] [sous-système] message"."""
+    tag = LEVEL_TAGS.get(record.levelno, record.levelname)
+    line = f"[{tag}] [{subsystem_of(record)}] {record.getMessage()}"
+    if record.exc_info:
+        line += "\n" + logging.Formatter().formatException(record.exc_info)
+    return line
+
+
+class _SinkHandler(logging.Handler):
+    """Distribue les enregistrements aux sinks ; sans sink, écrit sur stderr."""
+
+    def emit(self, record):
+        sinks = _sinks
+        if not sinks:
+            try:
+                print(format_record(record), file=sys.stderr)
+            except Exception:
+                self.handleError(record)
+            return
+        for sink in sinks:
+            try:
+                sink(record)
+            except Exception:
+                self.handleError(record)
+
+
+_root.addHandler(_SinkHandler())
+_root.setLevel(DEFAULT_LEVEL)
+
+
+def get_logger(subsystem):
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def parse_level(level):
+    if isinstance(level, int):
+        return level
+    try:
+        return _LEVEL_NAMES[str(level).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Niveau de log inconnu : {level}") from None
+
+
+def set_level(level, subsystem=None):
+    """Niveau d'un sous-système (ou niveau par défaut si subsystem est None)."""
+    logger = _root if subsystem is None else get_logger(subsystem)
+    logger.setLevel(parse_level(level))
+
+
+def enable(subsystem, enabled=True):
+    """Active ou coupe entièrement un sous-système (son niveau revient au défaut s'il est réactivé)."""
+    get_logger(subsystem).setLevel(logging.NOTSET if enabled else _LEVEL_NAMES["off"])
+
+
+def configure(spec):
+    """Applique une configuration "info,gizmos=debug,scripts=off"."""
+    for term in filter(None, (t.strip() for t in spec.split(","))):
+        subsystem, sep, level = term.rpartition("=")
+        set_level(level, subsystem if sep else None)
+
+
+def add_sink(sink):
+    """sink(record) est appelé depuis le thread qui journalise : il doit être thread-safe."""
+    with _sinks_lock:
+        global _sinks
+        if sink not in _sinks:
+            _sinks = _sinks + [sink]  # copie : emit() lit la liste sans verrou
+
+
+def remove_sink(sink):
+    with _sinks_lock:
+        global _sinks
+        _sinks = [s for s in _sinks if s != sink]
+
+
+if os.environ.get("EDITOR_LOG"):
+    try:
+        configure(os.environ["EDITOR_LOG"])
+    except ValueError as e:
+        print(f"[WARN] EDITOR_LOG ignoré : {e}", file=sys.stderr)
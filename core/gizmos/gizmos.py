@@ -11,10 +11,14 @@ from panda3d.core import (
 )
 import math
 
+from core.editor_log import DEBUG, get_logger
+
+log = get_logger("gizmos")
+
 
 class Gizmos:
     def __init__(self, render_node, scale=1.0, handle_dist=1.0, handle_screen_radius=0.05):
-        print("[Gizmos] Initialisation...")
+        log.debug("Initialisation...")
         self.render = render_node
         self._scale = float(scale)
         self._handle_dist = float(handle_dist)
@@ -23,15 +27,16 @@ class Gizmos:
         self.axis_colors = {'x': VBase4(1, 0, 0, 1), 'y': VBase4(0, 1, 0, 1), 'z': VBase4(0, 0, 1, 1)}
         self._highlight_color = VBase4(1, 1, 0, 1)
 
-        print("[Gizmos] Construction des axes principaux...")
+        log.debug("Construction des axes principaux...")
         self._node = self._build_gizmo(self._scale)
         self._node.reparentTo(self.render)
 
-        print("[Gizmos] Construction des handles...")
+        log.debug("Construction des handles...")
         self.handles = {}
         self._build_handles()
 
         self.target = None
+        self.on_target_changed = None  # callback(target) appelé quand le drag modifie la cible
         self._drag_mode = None
         self._selected_axis = None
         self._start_point_world = None
@@ -42,20 +47,20 @@ class Gizmos:
         self._start_handle_length = None
         self._start_rot_vector = None
 
-        print("[Gizmos] Initialisation terminée ✅")
+        log.debug("Initialisation terminée ✅")
 
     @property
     def node(self):
         return self._node
 
     def _build_gizmo(self, scale):
-        print(f"[Gizmos] Création du gizmo de taille {scale}")
+        log.debug("Création du gizmo de taille %s", scale)
         lines = LineSegs()
         lines.setThickness(10.0)
         for axis, col, end in [('x', self.axis_colors['x'], (scale, 0, 0)),
                                ('y', self.axis_colors['y'], (0, scale, 0)),
                                ('z', self.axis_colors['z'], (0, 0, scale))]:
-            print(f"[Gizmos] Axe {axis} → couleur {col}, extrémité {end}")
+            log.debug("Axe %s → couleur %s, extrémité %s", axis, col, end)
             lines.setColor(col)
             lines.moveTo(0, 0, 0)
             lines.drawTo(*end)
@@ -63,7 +68,7 @@ class Gizmos:
         return NodePath(geom_node)
 
     def _make_handle_visual(self, axis, size=0.06):
-        print(f"[Gizmos] Création du handle pour l’axe {axis} (taille {size})")
+        log.debug("Création du handle pour l’axe %s (taille %s)", axis, size)
         ls = LineSegs()
         ls.setThickness(10.0)
         col = self.axis_colors.get(axis, VBase4(1, 1, 0, 1))
@@ -90,31 +95,33 @@ class Gizmos:
                 pos = (0, self._handle_dist, 0)
             else:
                 pos = (0, 0, self._handle_dist)
-            print(f"[Gizmos] Position du handle {axis} → {pos}")
+            log.debug("Position du handle %s → %s", axis, pos)
             h.setPos(*pos)
             h.reparentTo(self._node)
             self.handles[axis] = h
 
     def show(self):
-        print("[Gizmos] Gizmo visible")
+        log.debug("Gizmo visible")
         self._node.show()
 
     def hide(self):
-        print("[Gizmos] Gizmo caché")
+        log.debug("Gizmo caché")
         self._node.hide()
 
     def set_target(self, nodepath):
-        print(f"[Gizmos] set_target({nodepath})")
+        log.debug("set_target(%s)", nodepath)
         self.target = nodepath
         if nodepath is None:
-            print("[Gizmos] Aucun target, gizmo désactivé.")
+            log.debug("Aucun target, gizmo désactivé.")
             return
         pos = nodepath.getPos(self.render)
-        print(f"[Gizmos] Position du gizmo alignée sur la cible → {pos}")
+        log.debug("Position du gizmo alignée sur la cible → %s", pos)
         self._node.setPos(pos)
 
     def pick_handle(self, mouse_pos, base):
-        print(f"[Gizmos] pick_handle(mouse_pos={mouse_pos})")
+        debug = log.isEnabledFor(DEBUG)  # une seule vérification pour toute la boucle
+        if debug:
+            log.debug("pick_handle(mouse_pos=%s)", mouse_pos)
         best = None
         best_dist = 1e9
         for axis, hp in self.handles.items():
@@ -123,25 +130,27 @@ class Gizmos:
             p2 = Point2()
             ok = base.camLens.project(cam_pos, p2)
             if not ok:
-                print(f"[Gizmos] {axis}: hors champ")
+                if debug:
+                    log.debug("%s: hors champ", axis)
                 continue
             dx = mouse_pos.getX() - p2.getX()
             dy = mouse_pos.getY() - p2.getY()
             dist = math.sqrt(dx * dx + dy * dy)
-            print(f"[Gizmos] Axe {axis} → distance écran {dist:.4f}")
+            if debug:
+                log.debug("Axe %s → distance écran %.4f", axis, dist)
             if dist < best_dist:
                 best_dist = dist
                 best = axis
         if best and best_dist <= self._handle_screen_radius:
-            print(f"[Gizmos] Axe sélectionné: {best} (dist={best_dist:.4f})")
+            log.debug("Axe sélectionné: %s (dist=%.4f)", best, best_dist)
             return best
-        print("[Gizmos] Aucun axe sélectionné")
+        log.debug("Aucun axe sélectionné")
         return None
 
     def _mouse_to_world_line(self, mouse_pos, base):
         near_cam = Point3(); far_cam = Point3()
         if not base.camLens.extrude(mouse_pos, near_cam, far_cam):
-            print("[Gizmos] Extrusion de rayon échouée")
+            log.warning("Extrusion de rayon échouée")
             return None, None
         cam_mat = base.cam.getMat(self.render)
         near_world = cam_mat.xformPoint(near_cam)
@@ -157,9 +166,9 @@ class Gizmos:
 
         # (le reste de ton code start_drag habituel)
 
-        print(f"[Gizmos] start_drag(mode={mode}, mouse_pos={mouse_pos})")
+        log.debug("start_drag(mode=%s, mouse_pos=%s)", mode, mouse_pos)
         if self.target is None:
-            print("[Gizmos] Aucun target → annulation")
+            log.debug("Aucun target → annulation")
             return False
         self._drag_mode = mode
         self._selected_axis = self.pick_handle(mouse_pos, base)
@@ -180,12 +189,12 @@ class Gizmos:
         if got:
             self._start_point_world = Point3(p)
         else:
-            print("[Gizmos] Aucune intersection trouvée")
+            log.debug("Aucune intersection trouvée")
             self._start_point_world = Point3(self._start_target_pos)
         if self._selected_axis:
             self._start_handle_world = self._handle_world_pos(self._selected_axis)
             self._start_handle_length = (self._start_handle_world - self._start_target_pos).length()
-        print("[Gizmos] Drag démarré ✅")
+        log.debug("Drag démarré ✅")
         return True
 
     def update_drag(self, mouse_pos, base):
@@ -202,7 +211,7 @@ class Gizmos:
 
         cur_point = Point3()
         if not plane.intersectsLine(cur_point, near_w, far_w):
-            print("[Gizmos] Pas d’intersection pendant le drag")
+            log.debug("Pas d’intersection pendant le drag")
             return
 
 
@@ -251,6 +260,9 @@ class Gizmos:
         # Optionnel : repositionner le gizmo visuel
         self._node.setPos(self.target.getPos(self.render))
 
+        if self.on_target_changed:
+            self.on_target_changed(self.target)
+
     def stop_drag(self):
         self._drag_mode = None
         self._selected_axis = None
@@ -329,12 +341,12 @@ class Gizmos:
         self.target.setMat(self.render, new_mat)
 
     def detach(self):
-        print("[Gizmos] detach() → gizmo détaché")
+        log.debug("detach() → gizmo détaché")
         if self._node:
             self._node.detachNode()
 
     def attach_to(self, nodepath):
-        print(f"[Gizmos] attach_to({nodepath})")
+        log.debug("attach_to(%s)", nodepath)
         if self._node and nodepath:
             self._node.reparentTo(self.render)
             self._node.setPos(nodepath.getPos(self.render))
@@ -0,0 +1,230 @@
+# core/log_file.py
+import atexit
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from core.editor_log import format_record
+
+
+class LogFileWriter:
+    """
+    Copie de la console dans <projet>/.editor_cache/logs/editor.log.
+
+    write_text()/write_record() ne font qu'empiler dans une file (appelables
+    depuis n'importe quel thread) ; un thread dédié horodate les lignes, les écrit
+    par lots et ne vide le fichier qu'une fois par flush_interval. Au-delà de
+    max_bytes, le fichier tourne : editor.log -> editor.log.1 -> ... -> editor.log.<backups>.
+    """
+
+    CACHE_DIRNAME = ".editor_cache"
+    FILENAME = "editor.log"
+
+    def __init__(self, root_getter, max_bytes=5 * 1024 * 1024, backups=3,
+                 flush_interval=0.5, max_queued=50000):
+        """:param root_getter: fonction retournant le dossier racine du projet courant"""
+        self._root_getter = root_getter
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._thread = None
+        self._file = None
+        self._file_path = None
+        self._partial = {}  # thread -> début de ligne sans retour à la ligne
+        self.dropped = 0  # lignes perdues depuis le dernier avertissement (sous _dropped_lock)
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def path(self):
+        """Fichier de log du projet courant (None tant que le projet n'est pas connu)."""
+        try:
+            root = Path(self._root_getter())
+        except Exception:
+            return None
+        if not root.is_dir():
+            return None
+        return root / self.CACHE_DIRNAME / "logs" / self.FILENAME
+
+    # ---------------- Entrées (n'importe quel thread) ----------------
+    def write_text(self, text):
+        self._put((time.time(), threading.get_ident(), text))
+
+    def write_record(self, record):
+        self._put((record.created, None, record))
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Disque trop lent : on perd des lignes plutôt que de bloquer
+            with self._dropped_lock:
+                self.dropped += 1
+
+    # ---------------- Thread d'écriture ----------------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="log-file-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)  # dernières lignes écrites même sans arrêt explicite
+
+    def stop(self):
+        """Écrit ce qui reste en file puis ferme le fichier."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Regroupe tout ce qui arrive pendant flush_interval en une seule écriture
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            self._write_batch([i for i in batch if i is not None])
+            if batch[-1] is None:
+                self._close()
+                return
+
+    def _lines(self, batch):
+        lines = []
+        for created, thread, payload in batch:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created)) + f".{int(created % 1 * 1000):03d}"
+            if thread is None:
+                text = format_record(payload)
+                lines.extend(f"{stamp} {line}" for line in text.split("\n"))
+                continue
+            *done, self._partial[thread] = (self._partial.get(thread, "") + payload).split("\n")
+            lines.extend(f"{stamp} {line}" for line in done if line.strip())
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            lines.append(f"[WARN] Journal : {dropped} ligne(s) perdue(s)")
+        return lines
+
+    def _write_batch(self, batch):
+        lines = self._lines(batch)
+        if not lines:
+            return
+        try:
+            f = self._open()
+            if f is None:
+                return
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            if f.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            self._close()  # disque plein, projet supprimé... : on réessaiera au prochain lot
+
+    def _open(self):
+        path = self.path
+        if path is None:
+            return None
+        if self._file is not None and self._file_path == path:
+            return self._file
+        self._close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", newline="\n")
+        self._file_path = path
+        return self._file
+
+    def _close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+            self._file_path = None
+
+    def _rotate(self):
+        path = self._file_path
+        self._close()
+        for i in range(self.backups - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{i}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+        if self.backups > 0:
+            os.replace(path, path.with_name(f"{path.name}.1"))
+        else:
+            path.unlink()
+
+
+class LogFileReader:
+    """
+    Lecture par pages d'un fichier de log sans le charger en mémoire.
+
+    Le fichier est parcouru une fois par blocs pour noter l'offset du début de
+    chaque page de page_lines lignes ; page(n) se place ensuite directement sur
+    cet offset. refresh() ne relit que ce qui a été ajouté depuis (le fichier est
+    réindexé s'il a rétréci, après une rotation).
+    """
+
+    def __init__(self, path, page_lines=200):
+        self.path = Path(path)
+        self.page_lines = page_lines
+        self._offsets = [0]      # offset du début de chaque page
+        self._indexed_to = 0     # octets déjà indexés
+        self._lines_in_last = 0  # lignes complètes de la dernière page
+        self.refresh()
+
+    def refresh(self):
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        if size < self._indexed_to:
+            self._offsets, self._indexed_to, self._lines_in_last = [0], 0, 0
+        if size == self._indexed_to:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed_to)
+            offset = self._indexed_to
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                start = 0
+                while True:
+                    nl = chunk.find(b"\n", start)
+                    if nl < 0:
+                        break
+                    start = nl + 1
+                    self._lines_in_last += 1
+                    if self._lines_in_last == self.page_lines:
+                        self._offsets.append(offset + start)
+                        self._lines_in_last = 0
+                    # Une ligne incomplète (écriture en cours) sera lue au prochain refresh()
+                    self._indexed_to = offset + start
+                offset += len(chunk)
+
+    @property
+    def num_pages(self):
+        return len(self._offsets) if self._lines_in_last or len(self._offsets) == 1 else len(self._offsets) - 1
+
+    def page(self, index):
+        """Lignes de la page `index` (les index négatifs partent de la fin)."""
+        count = self.num_pages
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            return []
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._indexed_to
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                data = f.read(end - start)
+        except OSError:
+            return []  # fichier déplacé par une rotation
+        return data.decode("utf-8", errors="replace").splitlines()
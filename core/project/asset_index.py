@@ -0,0 +1,413 @@
+# core/project/asset_index.py
+import hashlib
+import json
+import os
+import queue
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import zlib
+from pathlib import Path
+
+from core.project.watcher import ADDED, MODIFIED, REMOVED, RENAMED, RESCAN, IGNORED_DIRS
+from core.project.dependencies import journal_scene, references, resolve_reference
+
+SCHEMA_VERSION = 2
+COMMIT_EVERY = 500
+
+KINDS = {
+    ".egg": "model", ".bam": "model", ".gltf": "model", ".glb": "model", ".pz": "model",
+    ".json": "scene", ".p3ds": "scene",
+    ".py": "script",
+    ".png": "texture", ".jpg": "texture", ".jpeg": "texture", ".tga": "texture", ".dds": "texture",
+    ".wav": "audio", ".ogg": "audio", ".mp3": "audio",
+}
+
+
+def kind_of(path: Path) -> str:
+    return KINDS.get(path.suffix.lower(), "other")
+
+
+# ---------------- Statistiques de géométrie (sans charger le modèle dans la scène) ----------------
+_EGG_VERTEX = re.compile(rb"<Vertex>")
+_EGG_VERTEX_REF = re.compile(rb"<VertexRef>\s*\{([^<}]*)")
+
+
+def egg_stats(data: bytes):
+    """(sommets, triangles) d'un .egg : chaque polygone à n sommets compte n - 2 triangles."""
+    vertices = len(_EGG_VERTEX.findall(data))
+    triangles = 0
+    for refs in _EGG_VERTEX_REF.findall(data):
+        triangles += max(0, len(refs.split()) - 2)
+    return vertices, triangles
+
+
+def gltf_stats(doc: dict):
+    """(sommets, triangles) des primitives d'un document glTF 2.0."""
+    accessors = doc.get("accessors", [])
+    vertices = triangles = 0
+    for mesh in doc.get("meshes", []):
+        for prim in mesh.get("primitives", []):
+            position = prim.get("attributes", {}).get("POSITION")
+            if position is None or position >= len(accessors):
+                continue
+            count = accessors[position].get("count", 0)
+            vertices += count
+            indices = prim.get("indices")
+            if indices is not None and indices < len(accessors):
+                count = accessors[indices].get("count", 0)
+            mode = prim.get("mode", 4)
+            if mode == 4:        # TRIANGLES
+                triangles += count // 3
+            elif mode in (5, 6):  # TRIANGLE_STRIP / TRIANGLE_FAN
+                triangles += max(0, count - 2)
+    return vertices, triangles
+
+
+def geometry_stats(path: Path):
+    """(sommets, triangles) lus dans le fichier, ou (None, None) si le format n'est pas lisible ici."""
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".egg":
+            return egg_stats(path.read_bytes())
+        if suffix == ".pz" and path.stem.lower().endswith(".egg"):
+            return egg_stats(zlib.decompress(path.read_bytes()))
+        if suffix == ".gltf":
+            with open(path, "r", encoding="utf-8") as f:
+                return gltf_stats(json.load(f))
+        if suffix == ".glb":
+            with open(path, "rb") as f:
+                magic, _, _ = struct.unpack("<4sII", f.read(12))
+                length, chunk_type = struct.unpack("<II", f.read(8))
+                if magic != b"glTF" or chunk_type != 0x4E4F534A:  # 'JSON'
+                    return None, None
+                return gltf_stats(json.loads(f.read(length)))
+    except (OSError, ValueError, zlib.error, struct.error):
+        pass
+    return None, None
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ---------------- Index ----------------
+class AssetIndex:
+    """
+    Index sqlite des fichiers du projet (<projet>/.editor_cache/assets.sqlite).
+
+    Un thread dédié fait un premier inventaire (seuls les fichiers dont la taille
+    ou le mtime ont changé sont relus et hachés), puis applique les événements du
+    ProjectWatcher transmis par notify(). Les requêtes (children, search, get) se
+    font depuis le thread principal sur une connexion séparée, en mode WAL.
+    """
+
+    def __init__(self, root, db_path=None):
+        self.root = Path(os.path.abspath(root))
+        self.db_path = Path(db_path) if db_path else self.root / ".editor_cache" / "assets.sqlite"
+        self.ready = threading.Event()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._reader = None
+
+    # ---------------- Cycle de vie ----------------
+    def start(self):
+        if self._thread is not None:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="asset-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def notify(self, events):
+        """Transmet des FsEvent du watcher au thread d'indexation."""
+        self._queue.put(list(events))
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ---------------- Thread d'indexation ----------------
+    def _run(self):
+        try:
+            conn = self._connect()
+            self._create_schema(conn)
+            self._full_scan(conn)
+        except Exception as e:
+            print(f"[WARN] Index des assets indisponible : {e}", file=sys.stderr)
+            return
+        self.ready.set()
+        while True:
+            events = self._queue.get()
+            if events is None:
+                break
+            try:
+                self._apply(conn, events)
+            except Exception as e:
+                print(f"[WARN] Mise à jour de l'index des assets : {e}", file=sys.stderr)
+        conn.close()
+
+    @staticmethod
+    def _create_schema(conn):
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS assets")
+            conn.execute("DROP TABLE IF EXISTS deps")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS assets (
+                path TEXT PRIMARY KEY,
+                parent TEXT NOT NULL,
+                name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                size INTEGER,
+                mtime_ns INTEGER,
+                hash TEXT,
+                vertices INTEGER,
+                triangles INTEGER
+            )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS assets_parent ON assets(parent)")
+        conn.execute("CREATE INDEX IF NOT EXISTS assets_kind ON assets(kind)")
+        # Graphe de dépendances : source (scène, script) -> cible (chemin relatif, ou absolu hors projet)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS deps (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                PRIMARY KEY (source, target)
+            )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS deps_target ON deps(target)")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+    def _rel(self, path) -> str:
+        """Chemin relatif à la racine, en posix ('' pour la racine) ; None hors du projet."""
+        try:
+            rel = Path(os.path.abspath(path)).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return "" if rel == "." else rel
+
+    def _row(self, path: Path, rel: str, is_dir: bool, st):
+        parent, _, name = rel.rpartition("/")
+        if is_dir:
+            return (rel, parent, name, "dir", None, st.st_mtime_ns, None, None, None)
+        kind = kind_of(path)
+        vertices, triangles = geometry_stats(path) if kind == "model" else (None, None)
+        return (rel, parent, name, kind, st.st_size, st.st_mtime_ns, file_hash(path), vertices, triangles)
+
+    def _scan_tree(self, conn, top: Path, known=None):
+        """Indexe `top` récursivement ; `known` : {chemin: (taille, mtime)} déjà en base."""
+        seen = set()
+        pending = 0
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                it = os.scandir(directory)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir and entry.name in IGNORED_DIRS:
+                        continue
+                    rel = self._rel(entry.path)
+                    seen.add(rel)
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        stack.append(Path(entry.path))
+                    if known is not None and known.get(rel) == ((None if is_dir else st.st_size), st.st_mtime_ns):
+                        continue
+                    try:
+                        self._store(conn, Path(entry.path), rel, is_dir, st)
+                    except OSError:
+                        continue
+                    pending += 1
+                    if pending >= COMMIT_EVERY:
+                        conn.commit()
+                        pending = 0
+        conn.commit()
+        return seen
+
+    def _store(self, conn, path: Path, rel: str, is_dir: bool, st):
+        row = self._row(path, rel, is_dir, st)
+        conn.execute("INSERT OR REPLACE INTO assets VALUES (?,?,?,?,?,?,?,?,?)", row)
+        if not is_dir:
+            self._index_deps(conn, path, rel, row[3])
+
+    def _index_deps(self, conn, path: Path, rel: str, kind: str):
+        """Remplace les dépendances de `rel` ; un journal met à jour celles de sa scène."""
+        scene = journal_scene(path)
+        if scene is not None:
+            if scene.exists():
+                self._index_deps(conn, scene, self._rel(scene), "scene")
+            return
+        conn.execute("DELETE FROM deps WHERE source = ?", (rel,))
+        targets = set()
+        for ref in references(path, kind):
+            target = resolve_reference(ref, path, self.root)
+            targets.add(self._rel(target) or Path(os.path.abspath(target)).as_posix())
+        conn.executemany("INSERT OR IGNORE INTO deps VALUES (?, ?)", [(rel, target) for target in targets])
+
+    def _full_scan(self, conn):
+        known = {path: (size, mtime) for path, size, mtime
+                 in conn.execute("SELECT path, size, mtime_ns FROM assets")}
+        seen = self._scan_tree(conn, self.root, known)
+        for path in known:
+            if path not in seen:
+                self._delete(conn, path)
+        conn.commit()
+
+    def _delete(self, conn, rel):
+        pattern = _like_escape(rel) + "/%"
+        conn.execute("DELETE FROM assets WHERE path = ? OR path LIKE ? ESCAPE '\\'", (rel, pattern))
+        conn.execute("DELETE FROM deps WHERE source = ? OR source LIKE ? ESCAPE '\\'", (rel, pattern))
+        scene = journal_scene(self.root / rel)
+        if scene is not None and scene.exists():
+            self._index_deps(conn, scene, self._rel(scene), "scene")
+
+    def _update(self, conn, path: Path):
+        rel = self._rel(path)
+        if not rel:
+            return
+        try:
+            st = path.stat()
+        except OSError:
+            self._delete(conn, rel)
+            return
+        is_dir = path.is_dir()
+        self._store(conn, path, rel, is_dir, st)
+        if is_dir:
+            self._scan_tree(conn, path)
+
+    def _apply(self, conn, events):
+        for event in events:
+            if event.kind == RESCAN:
+                self._full_scan(conn)
+            elif event.kind in (ADDED, MODIFIED):
+                self._update(conn, event.path)
+            elif event.kind == REMOVED:
+                rel = self._rel(event.path)
+                if rel:
+                    self._delete(conn, rel)
+            elif event.kind == RENAMED:
+                rel = self._rel(event.path)
+                if rel:
+                    self._delete(conn, rel)
+                self._update(conn, event.dest)
+        conn.commit()
+
+    # ---------------- Requêtes (thread principal) ----------------
+    def _query(self, sql, params=()):
+        if not self.ready.is_set():
+            return None
+        if self._reader is None:
+            self._reader = self._connect()
+        return self._reader.execute(sql, params).fetchall()
+
+    def children(self, directory):
+        """[(nom, dossier ?)] triés (dossiers d'abord), ou None si l'index ne peut pas répondre."""
+        rel = self._rel(directory)
+        if rel is None:
+            return None
+        if rel and not self._query("SELECT 1 FROM assets WHERE path = ? AND kind = 'dir'", (rel,)):
+            return None  # dossier non indexé (ignoré, ou pas encore vu)
+        rows = self._query("SELECT name, kind = 'dir' FROM assets WHERE parent = ?", (rel,))
+        if rows is None:
+            return None
+        entries = [(name, bool(is_dir)) for name, is_dir in rows]
+        entries.sort(key=lambda e: (not e[1], e[0].lower()))
+        return entries
+
+    def has_children(self, directory):
+        rel = self._rel(directory)
+        if rel is None:
+            return None
+        if rel and not self._query("SELECT 1 FROM assets WHERE path = ? AND kind = 'dir'", (rel,)):
+            return None
+        rows = self._query("SELECT 1 FROM assets WHERE parent = ? LIMIT 1", (rel,))
+        return None if rows is None else bool(rows)
+
+    def get(self, path):
+        """Fiche d'un fichier indexé (dict), ou None."""
+        rel = self._rel(path)
+        rows = self._query("SELECT * FROM assets WHERE path = ?", (rel,)) if rel else None
+        if not rows:
+            return None
+        return dict(zip(_COLUMNS, rows[0]))
+
+    def search(self, text, kinds=None, limit=200):
+        """Fichiers dont le nom contient `text` (insensible à la casse), filtrés par type."""
+        sql = "SELECT * FROM assets WHERE name LIKE ? ESCAPE '\\'"
+        params = ["%" + _like_escape(text) + "%"]
+        if kinds:
+            sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY kind = 'dir' DESC, length(name), name LIMIT ?"
+        params.append(limit)
+        rows = self._query(sql, params)
+        if rows is None:
+            return None
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def path_of(self, rel):
+        return self.root / rel
+
+    # ---------------- Dépendances ----------------
+    def _target_key(self, path):
+        return self._rel(path) or Path(os.path.abspath(path)).as_posix()
+
+    def users_of(self, path):
+        """Scènes et scripts qui utilisent `path` (chemins relatifs), ou None si l'index n'est pas prêt."""
+        rows = self._query("SELECT source FROM deps WHERE target = ? ORDER BY source", (self._target_key(path),))
+        return None if rows is None else [source for source, in rows]
+
+    def needs(self, path, transitive=True):
+        """Fichiers utilisés par une scène ou un script (et, par défaut, par ce qu'ils utilisent)."""
+        start = self._rel(path)
+        if self._query("SELECT 1") is None:
+            return None
+        found, pending = [], [start]
+        seen = {start}
+        while pending:
+            source = pending.pop()
+            for target, in self._query("SELECT target FROM deps WHERE source = ? ORDER BY target", (source,)):
+                if target in seen:
+                    continue
+                seen.add(target)
+                found.append(target)
+                if transitive:
+                    pending.append(target)
+        return found
+
+    def unused(self, kinds=("model",)):
+        """Assets des types donnés qu'aucune scène ni aucun script du projet ne référence."""
+        rows = self._query(
+            f"SELECT path FROM assets WHERE kind IN ({','.join('?' * len(kinds))}) "
+            "AND path NOT IN (SELECT target FROM deps) ORDER BY path", tuple(kinds))
+        return None if rows is None else [path for path, in rows]
+
+
+_COLUMNS = ("path", "parent", "name", "kind", "size", "mtime_ns", "hash", "vertices", "triangles")
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
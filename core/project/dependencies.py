@@ -0,0 +1,88 @@
+# core/project/dependencies.py
+"""
+Références d'un fichier du projet vers d'autres assets.
+
+Une scène (.json/.p3ds, journal compris) dépend des fichiers cités dans les
+"file.path" de ses entrées ; un script dépend des chemins d'assets écrits en
+toutes lettres dans son code (loader.loadModel('models/x.egg'), ...).
+L'AssetIndex range ces liens dans sa table deps.
+"""
+import re
+from pathlib import Path
+
+from core.scene.change_tracker import JOURNAL_SUFFIX, apply_journal, read_journal
+from core.scene.scene_format import SceneFormatError, read_scene
+
+ASSET_SUFFIXES = (".egg", ".bam", ".gltf", ".glb", ".pz", ".json", ".p3ds",
+                  ".png", ".jpg", ".jpeg", ".tga", ".dds", ".wav", ".ogg", ".mp3")
+_SCRIPT_REF = re.compile(
+    r"""["']([^"'\n]+?(?:%s))["']""" % "|".join(re.escape(s) for s in ASSET_SUFFIXES),
+    re.IGNORECASE,
+)
+
+
+def scene_references(path):
+    """Chemins (tels qu'écrits) des fichiers utilisés par une scène et son journal."""
+    try:
+        data = read_scene(path)
+    except (OSError, SceneFormatError, ValueError):
+        return set()
+    if not isinstance(data, list):
+        return set()  # JSON qui n'est pas une scène
+    try:
+        apply_journal(data, read_journal(path))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    refs = set()
+    stack = list(data)
+    while stack:
+        entry = stack.pop()
+        if not isinstance(entry, dict):
+            continue
+        file_info = entry.get("file")
+        if isinstance(file_info, dict) and file_info.get("path"):
+            refs.add(str(file_info["path"]))
+        stack.extend(entry.get("childs") or ())
+    return refs
+
+
+def script_references(path):
+    """Chemins d'assets écrits sous forme de chaînes dans un script."""
+    try:
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return set()
+    return set(_SCRIPT_REF.findall(text))
+
+
+def references(path, kind):
+    if kind == "scene":
+        return scene_references(path)
+    if kind == "script":
+        return script_references(path)
+    return set()
+
+
+def resolve_reference(ref, source, root):
+    """
+    Chemin absolu désigné par `ref` : tel quel s'il est absolu, sinon relatif au
+    dossier du fichier source, au dossier courant (chemins enregistrés par
+    l'éditeur) ou à la racine du projet, dans cet ordre.
+    """
+    ref = Path(ref)
+    if ref.is_absolute():
+        return ref
+    candidates = (Path(source).parent / ref, Path.cwd() / ref, Path(root) / ref)
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return Path(root) / ref
+
+
+def journal_scene(path):
+    """Scène dont `path` est le journal, ou None."""
+    path = Path(path)
+    if path.name.endswith(JOURNAL_SUFFIX):
+        return path.with_name(path.name[:-len(JOURNAL_SUFFIX)])
+    return None
@@ -0,0 +1,43 @@
+# core/project/indexed_fs.py
+from pathlib import Path
+
+from kivy.uix.filechooser import FileSystemLocal
+
+
+class IndexedFileSystem(FileSystemLocal):
+    """
+    file_system des FileChooser de l'éditeur : dans le dossier projet, les listes
+    de fichiers, tailles et types viennent de l'index des assets ; ailleurs (ou
+    tant que l'index n'est pas prêt) on retombe sur le disque.
+    """
+
+    def __init__(self, index_getter):
+        super().__init__()
+        self._index_getter = index_getter
+
+    def _index(self):
+        index = self._index_getter()
+        if index is None or not index.ready.is_set():
+            return None
+        return index
+
+    def listdir(self, fn):
+        index = self._index()
+        entries = index.children(fn) if index is not None else None
+        if entries is None:
+            return super().listdir(fn)
+        return [name for name, _ in entries]
+
+    def getsize(self, fn):
+        index = self._index()
+        record = index.get(fn) if index is not None else None
+        if record is None or record["size"] is None:
+            return super().getsize(fn)
+        return record["size"]
+
+    def is_dir(self, fn):
+        index = self._index()
+        record = index.get(fn) if index is not None else None
+        if record is None:
+            return super().is_dir(fn)
+        return record["kind"] == "dir"
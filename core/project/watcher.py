@@ -0,0 +1,358 @@
+# core/project/watcher.py
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Dossiers jamais surveillés (caches de l'éditeur, VCS)
+IGNORED_DIRS = {".git", ".editor_cache", "__pycache__"}
+
+ADDED = "added"
+REMOVED = "removed"
+RENAMED = "renamed"
+MODIFIED = "modified"
+RESCAN = "rescan"  # file d'événements perdue : l'arbre doit être relu
+
+
+class FsEvent:
+    """Changement dans le projet ; `dest` n'est renseigné que pour RENAMED."""
+
+    __slots__ = ("kind", "path", "is_dir", "dest")
+
+    def __init__(self, kind, path, is_dir=False, dest=None):
+        self.kind = kind
+        self.path = path
+        self.is_dir = is_dir
+        self.dest = dest
+
+    def __repr__(self):
+        dest = f" -> {self.dest}" if self.dest is not None else ""
+        return f"FsEvent({self.kind}, {self.path}{dest})"
+
+
+class ProjectWatcher:
+    """
+    Surveille `root` sur un thread dédié et appelle on_events(liste de FsEvent)
+    depuis ce thread (au consommateur de repasser sur le thread principal).
+
+    inotify (Linux, via ctypes) quand il est disponible ; sinon scrutation par lots :
+    à chaque intervalle, seul un lot de dossiers est relu avec os.scandir et comparé
+    au relevé précédent, ce qui garde un coût au repos négligeable même sur de gros
+    projets (au prix d'une latence proportionnelle au nombre de dossiers).
+
+    Le backend (watches inotify ou relevé initial de l'arbre) est construit sur le
+    thread de surveillance : start() rend la main tout de suite, même sur un gros projet.
+    """
+
+    def __init__(self, root, on_events, poll_interval=0.5, poll_batch=100, force_polling=False):
+        self.root = Path(root)
+        self.on_events = on_events
+        self.poll_interval = poll_interval
+        self.poll_batch = poll_batch
+        self.force_polling = force_polling
+        self.backend = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()  # propre à ce thread : un ancien thread encore actif reste arrêté
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="project-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _create_backend(self):
+        backend = None if self.force_polling else _InotifyBackend.create(self.root)
+        return backend or _PollingBackend(self.root, self.poll_batch)
+
+    def _run(self, stop):
+        try:
+            backend = self._create_backend()
+        except Exception as e:
+            print(f"[WARN] Surveillance du projet impossible : {e}", file=sys.stderr)
+            return
+        self.backend = backend
+        try:
+            self._loop(backend, stop)
+        finally:
+            backend.close()
+            if self.backend is backend:
+                self.backend = None
+
+    def _loop(self, backend, stop):
+        while not stop.is_set():
+            try:
+                events = backend.wait(self.poll_interval)
+            except Exception as e:
+                print(f"[WARN] Surveillance du projet interrompue : {e}", file=sys.stderr)
+                return
+            if events and not stop.is_set():
+                self.on_events(events)
+
+
+def _ignored(name):
+    return name in IGNORED_DIRS
+
+
+# ---------------- inotify (Linux) ----------------
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+               | _IN_DELETE | _IN_DELETE_SELF | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _InotifyBackend:
+    def __init__(self, libc, fd, root):
+        self._libc = libc
+        self._fd = fd
+        self._paths = {}  # wd -> dossier surveillé
+        self._wds = {}    # dossier -> wd
+        self._watch_tree(root)
+
+    @classmethod
+    def create(cls, root):
+        """Backend inotify, ou None s'il n'est pas utilisable (autre OS, limite de watches...)."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        try:
+            return cls(libc, fd, Path(root))
+        except OSError:
+            os.close(fd)
+            return None
+
+    def _watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == 28:  # ENOSPC : limite max_user_watches atteinte
+                raise OSError(err, "inotify: max_user_watches atteint")
+            return
+        self._paths[wd] = directory
+        self._wds[directory] = wd
+
+    def _watch_tree(self, root, events=None):
+        """
+        Surveille `root` et ses sous-dossiers ; si `events` est fourni, y ajoute un
+        ADDED pour ce qui existe déjà sous `root` (créé avant que le watch soit posé).
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            self._watch(directory)
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir and _ignored(entry.name):
+                            continue
+                        if events is not None:
+                            events.append(FsEvent(ADDED, Path(entry.path), is_dir))
+                        if is_dir:
+                            stack.append(Path(entry.path))
+            except OSError:
+                pass
+
+    def _forget_tree(self, directory):
+        for path in [p for p in self._wds if p == directory or directory in p.parents]:
+            self._paths.pop(self._wds.pop(path), None)
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        moved_from = {}  # cookie -> (index de l'événement, chemin, dossier ?)
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                events.append(FsEvent(RESCAN, None, True))
+                continue
+            if mask & _IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            directory = self._paths.get(wd)
+            if directory is None or mask & _IN_DELETE_SELF or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            is_dir = bool(mask & _IN_ISDIR)
+            if is_dir and _ignored(path.name):
+                continue
+
+            if mask & _IN_CREATE:
+                events.append(FsEvent(ADDED, path, is_dir))
+                if is_dir:
+                    self._watch_tree(path, events)
+            elif mask & _IN_DELETE:
+                events.append(FsEvent(REMOVED, path, is_dir))
+            elif mask & _IN_MOVED_FROM:
+                moved_from[cookie] = (len(events), path, is_dir)
+                events.append(FsEvent(REMOVED, path, is_dir))
+            elif mask & _IN_MOVED_TO:
+                source = moved_from.pop(cookie, None)
+                if source is not None:
+                    index, old_path, _ = source
+                    events[index] = FsEvent(RENAMED, old_path, is_dir, dest=path)
+                    if is_dir:
+                        self._forget_tree(old_path)
+                        self._watch_tree(path)
+                else:
+                    events.append(FsEvent(ADDED, path, is_dir))
+                    if is_dir:
+                        self._watch_tree(path, events)
+            elif mask & (_IN_CLOSE_WRITE | _IN_MODIFY):
+                events.append(FsEvent(MODIFIED, path, is_dir))
+
+        # Déplacé hors du projet : plus de watch à garder pour ce dossier
+        for _, path, is_dir in moved_from.values():
+            if is_dir:
+                self._forget_tree(path)
+        return events
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+# ---------------- Scrutation par lots (repli portable) ----------------
+class _PollingBackend:
+    def __init__(self, root, batch):
+        self._root = Path(root)
+        self._batch = batch
+        self._dirs = {}    # dossier -> {nom: (dossier ?, mtime, taille)}
+        self._order = []   # dossiers à visiter, parcourus en tourniquet
+        self._cursor = 0
+        self._scan_tree(self._root)
+
+    @staticmethod
+    def _listing(directory):
+        entries = {}
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=False)
+                entries[entry.name] = (is_dir, st.st_mtime_ns, 0 if is_dir else st.st_size)
+        return entries
+
+    def _scan_tree(self, root, events=None):
+        """
+        Enregistre `root` et ses sous-dossiers ; si `events` est fourni, y ajoute un
+        ADDED pour chaque élément trouvé sous `root` (dossier apparu entre deux relevés).
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = self._listing(directory)
+            except OSError:
+                continue
+            if directory not in self._dirs:
+                self._order.append(directory)
+            self._dirs[directory] = entries
+            for name, (is_dir, _, _) in entries.items():
+                if events is not None and not (is_dir and _ignored(name)):
+                    events.append(FsEvent(ADDED, directory / name, is_dir))
+                if is_dir and not _ignored(name):
+                    stack.append(directory / name)
+
+    def _forget_tree(self, directory):
+        for path in [p for p in self._dirs if p == directory or directory in p.parents]:
+            del self._dirs[path]
+        self._order = [p for p in self._order if p in self._dirs]
+        self._cursor = min(self._cursor, len(self._order))
+
+    def _check(self, directory, events):
+        old_entries = self._dirs.get(directory)
+        if old_entries is None:
+            return
+        try:
+            entries = self._listing(directory)
+        except OSError:
+            return  # dossier supprimé : signalé par la relecture de son parent
+        if entries == old_entries:
+            return
+        self._dirs[directory] = entries
+
+        removed = {name: info for name, info in old_entries.items() if name not in entries}
+        added = {name: info for name, info in entries.items() if name not in old_entries}
+        # Renommage dans le même dossier : même type, même taille et même mtime
+        for old_name, old_info in list(removed.items()):
+            for new_name, new_info in added.items():
+                if old_info == new_info:
+                    events.append(FsEvent(RENAMED, directory / old_name, old_info[0], dest=directory / new_name))
+                    del removed[old_name], added[new_name]
+                    if old_info[0]:
+                        self._forget_tree(directory / old_name)
+                        if not _ignored(new_name):
+                            self._scan_tree(directory / new_name)
+                    break
+        for name, (is_dir, _, _) in removed.items():
+            events.append(FsEvent(REMOVED, directory / name, is_dir))
+            if is_dir:
+                self._forget_tree(directory / name)
+        for name, (is_dir, _, _) in added.items():
+            events.append(FsEvent(ADDED, directory / name, is_dir))
+            if is_dir and not _ignored(name):
+                self._scan_tree(directory / name, events)
+        for name, info in entries.items():
+            old_info = old_entries.get(name)
+            if old_info is not None and not info[0] and old_info != info:
+                events.append(FsEvent(MODIFIED, directory / name, False))
+
+    def wait(self, timeout):
+        """Relit un lot de dossiers (tourniquet) ; un tour complet couvre tout le projet."""
+        time.sleep(timeout)
+        events = []
+        for _ in range(min(self._batch, len(self._order))):
+            if self._cursor >= len(self._order):
+                self._cursor = 0
+            directory = self._order[self._cursor]
+            self._cursor += 1
+            self._check(directory, events)
+        return events
+
+    def close(self):
+        pass
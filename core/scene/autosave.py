@@ -0,0 +1,132 @@
+# core/scene/autosave.py
+import os
+import queue
+import threading
+from pathlib import Path
+
+from kivy.clock import Clock
+
+from core.scene.scene_format import write_scene
+from core.editor_log import get_logger
+
+log = get_logger("autosave")
+
+
+class AutosaveService:
+    """
+    Sauvegarde automatique de la scène à intervalle régulier.
+
+    Un tick ne fait rien si le ChangeTracker n'a vu aucune modification depuis la
+    sauvegarde automatique précédente (compteur `revision`). Sinon, on prend sur
+    le thread principal un instantané léger du graphe (entrées décrites par
+    Save.describe_visit, sans objets Panda3D ni chargement de modèle : seuls les
+    gabarits déjà en cache servent aux overrides). L'encodage et l'écriture se
+    font sur un thread dédié, de façon atomique (fichier temporaire + rename).
+    """
+
+    def __init__(self, editor_ui, interval=120):
+        self.editor_ui = editor_ui
+        self.interval = interval
+        self._event = None
+        self._last_snapshot = None
+        self._last_revision = editor_ui.changes.revision
+        self._queue = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._worker, name="autosave", daemon=True)
+        self._thread.start()
+        if interval > 0:
+            self.start()
+
+    # ---------------- Planification (thread principal) ----------------
+    def start(self):
+        self.stop()
+        self._event = Clock.schedule_interval(self._tick, self.interval)
+
+    def stop(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def set_interval(self, seconds):
+        """Change l'intervalle (en secondes) ; 0 désactive la sauvegarde automatique."""
+        self.interval = seconds
+        if seconds > 0:
+            self.start()
+        else:
+            self.stop()
+
+    def target_path(self) -> Path:
+        """Fichier de sauvegarde automatique : à côté de la scène courante, sinon dans le cache du projet."""
+        current = self.editor_ui.current_scene_file
+        if current:
+            current = Path(current)
+            return current.with_name(f"{current.stem}.autosave{current.suffix}")
+        root = Path(self.editor_ui.project_hierarchic_sidebar.project_root)
+        return root / ".editor_cache" / "autosave.json"
+
+    def snapshot(self):
+        """Instantané du graphe : liste de (entrée sans enfants, index du parent)."""
+        save_tool = self.editor_ui.menu.save_tool
+        flat = _FlatSnapshot()
+        self.editor_ui.scene_walker.walk(self.editor_ui.panda.render.get_children(),
+                                         save_tool.scene_consumer(flat, load_templates=False))
+        return flat.entries
+
+    def _tick(self, dt):
+        open_tool = self.editor_ui.menu.open_scene_tool
+        if getattr(open_tool, "loading_job", None) is not None:
+            return  # scène en cours de chargement : instantané incomplet
+        revision = self.editor_ui.changes.revision
+        if revision == self._last_revision:
+            return  # rien de modifié depuis la dernière sauvegarde automatique
+        if self._queue.full():
+            return  # l'écriture précédente n'est pas terminée, on attend le prochain tick
+        self._queue.put_nowait((self.snapshot(), self.target_path()))
+        self._last_revision = revision
+
+    # ---------------- Écriture (thread dédié) ----------------
+    def _worker(self):
+        while True:
+            flat, path = self._queue.get()
+            if flat == self._last_snapshot:
+                continue
+            try:
+                self._write(flat, path)
+                self._last_snapshot = flat
+                log.info("Sauvegarde automatique : %s", path)  # journal thread-safe
+            except Exception as e:
+                log.error("Sauvegarde automatique impossible : %s", e)
+
+    @staticmethod
+    def _write(flat, path):
+        data = []
+        entries = []
+        for entry, parent_idx in flat:
+            entry = dict(entry, childs=[])  # l'instantané reste intact pour la comparaison suivante
+            entries.append(entry)
+            (data if parent_idx < 0 else entries[parent_idx]["childs"]).append(entry)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Même extension que la cible : write_scene choisit le format d'après elle
+        tmp = path.with_name(f".{path.stem}.tmp{path.suffix}")
+        write_scene(tmp, data)
+        os.replace(tmp, path)
+
+
+class _FlatSnapshot:
+    """Writer (interface de scene_format) qui aplatit les entrées en (entrée, index du parent)."""
+
+    def __init__(self):
+        self.entries = []
+        self._parents = [-1]
+
+    def begin(self, entry):
+        if entry.get("file"):
+            entry = dict(entry, file=dict(entry["file"]))  # copie : self.models reste sur le thread principal
+        self._parents.append(len(self.entries))
+        self.entries.append((entry, self._parents[-2]))
+
+    def end(self):
+        self._parents.pop()
+
+    def close(self):
+        pass
@@ -0,0 +1,123 @@
+# core/scene/bam_cache.py
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from panda3d.core import Filename, PandaSystem
+
+
+class BamCache:
+    """
+    Cache disque des modèles .egg convertis en .bam, dans le dossier du projet.
+
+    Une entrée est identifiée par le chemin source, le hash de son contenu et la
+    version de Panda3D : un .egg modifié ou une mise à jour de Panda3D produisent
+    une nouvelle entrée au lieu de relire un .bam périmé. Les hashs déjà calculés
+    sont mémorisés (avec mtime/taille) dans manifest.json pour ne pas relire les
+    sources à chaque ouverture du projet.
+    """
+
+    CACHE_DIRNAME = ".editor_cache"
+    SOURCE_SUFFIXES = (".egg", ".pz")
+
+    def __init__(self, root_getter):
+        """:param root_getter: fonction retournant le dossier racine du projet courant"""
+        self._root_getter = root_getter
+        self._manifest = None
+        self._manifest_dir = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_dir(self) -> Path:
+        return Path(self._root_getter()) / self.CACHE_DIRNAME / "bam"
+
+    def handles(self, path) -> bool:
+        return str(path).lower().endswith(self.SOURCE_SUFFIXES)
+
+    # ---------------- Manifest des hashs ----------------
+    def _load_manifest(self):
+        cache_dir = self.cache_dir
+        if self._manifest is not None and self._manifest_dir == cache_dir:
+            return self._manifest
+        self._manifest_dir = cache_dir
+        try:
+            with open(cache_dir / "manifest.json", "r", encoding="utf-8") as f:
+                self._manifest = json.load(f)
+        except (OSError, ValueError):
+            self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        cache_dir = self.cache_dir
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_dir / "manifest.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, cache_dir / "manifest.json")
+
+    def _content_hash(self, resolved):
+        st = os.stat(resolved)
+        manifest = self._load_manifest()
+        known = manifest.get(resolved)
+        if known and known[0] == st.st_mtime and known[1] == st.st_size:
+            return known[2]
+
+        digest = hashlib.sha1()
+        with open(resolved, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+        manifest[resolved] = [st.st_mtime, st.st_size, content_hash]
+        return content_hash
+
+    # ---------------- Entrées du cache ----------------
+    def bam_path(self, source) -> Path:
+        """Chemin du .bam correspondant à la version actuelle de `source`."""
+        resolved = os.path.realpath(str(source))
+        key = hashlib.sha1(
+            f"{resolved}|{self._content_hash(resolved)}|{PandaSystem.get_version_string()}".encode("utf-8")
+        ).hexdigest()
+        return self.cache_dir / f"{Path(resolved).name}-{key[:16]}.bam"
+
+    def lookup(self, source):
+        """Retourne le .bam en cache pour `source`, ou None s'il faut convertir."""
+        bam = self.bam_path(source)
+        if bam.exists():
+            self.hits += 1
+            return bam
+        self.misses += 1
+        return None
+
+    def store(self, source, model) -> Path:
+        """Écrit `model` (chargé depuis `source`) dans le cache."""
+        bam = self.bam_path(source)
+        bam.parent.mkdir(parents=True, exist_ok=True)
+        tmp = bam.with_suffix(".tmp")
+        if not model.write_bam_file(Filename.from_os_specific(str(tmp))):
+            print(f"[WARN] Cache bam : écriture impossible pour {source}")
+            return None
+        os.replace(tmp, bam)
+        self._save_manifest()
+        return bam
+
+    def status(self):
+        cache_dir = self.cache_dir
+        files = list(cache_dir.glob("*.bam")) if cache_dir.exists() else []
+        return {
+            "dir": str(cache_dir),
+            "files": len(files),
+            "bytes": sum(f.stat().st_size for f in files),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        cache_dir = self.cache_dir
+        if cache_dir.exists():
+            shutil.rmtree(cache_dir)
+        self._manifest = None
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,87 @@
+# core/scene/bam_export.py
+from panda3d.core import Filename, GeomNode, NodePath
+
+# Tag posé par le panneau Propriétés : "static" (aplati à l'export) ou "dynamic"
+MOBILITY_TAG = "editor_mobility"
+MOBILITY_VALUES = ("static", "dynamic")
+
+# Nodes techniques de l'éditeur, jamais exportés
+SKIPPED_NAMES = {"camera", "cam", "lines"}
+
+
+def scene_stats(root):
+    """Nombre de nodes et de Geoms sous `root` (inclus)."""
+    nodes = 0
+    geoms = 0
+    stack = [root]
+    while stack:
+        np = stack.pop()
+        nodes += 1
+        node = np.node()
+        if isinstance(node, GeomNode):
+            geoms += node.get_num_geoms()
+        stack.extend(np.get_children())
+    return {"nodes": nodes, "geoms": geoms}
+
+
+def _topmost(matches, root):
+    """Garde les nodes qui n'ont pas d'ancêtre dans `matches` (sous `root`)."""
+    keys = {np.get_key() for np in matches}
+    result = []
+    for np in matches:
+        parent = np.get_parent()
+        nested = False
+        while parent != root and not parent.is_empty():
+            if parent.get_key() in keys:
+                nested = True
+                break
+            parent = parent.get_parent()
+        if not nested:
+            result.append(np)
+    return result
+
+
+def flatten_static(root):
+    """
+    Aplatit (clearModelNodes + flattenStrong) chaque sous-arbre marqué "static".
+    Les nodes marqués "dynamic" à l'intérieur sont mis de côté pendant l'aplatissement
+    puis rattachés à leur racine statique, en gardant leur nom et leur position monde.
+    """
+    static_roots = _topmost(list(root.find_all_matches(f"**/={MOBILITY_TAG}=static")), root)
+    for static_np in static_roots:
+        dynamic = _topmost(list(static_np.find_all_matches(f"**/={MOBILITY_TAG}=dynamic")), static_np)
+        for dynamic_np in dynamic:
+            dynamic_np.wrt_reparent_to(root)
+
+        static_np.clear_model_nodes()
+        static_np.flatten_strong()
+
+        for dynamic_np in dynamic:
+            dynamic_np.wrt_reparent_to(static_np)
+    return len(static_roots)
+
+
+def export_bam(scene_root, path, flatten=True):
+    """
+    Écrit une copie de la scène dans le fichier .bam `path`.
+    Retourne les statistiques avant/après aplatissement.
+    """
+    export_root = NodePath("scene")
+    for child in scene_root.get_children():
+        if child.get_name() in SKIPPED_NAMES:
+            continue
+        child.copy_to(export_root)
+
+    # Les lights sont activées sur render dans l'éditeur : on les réactive sur la racine exportée
+    for light_np in export_root.find_all_matches("**/+Light"):
+        export_root.set_light(light_np)
+
+    before = scene_stats(export_root)
+    flattened = flatten_static(export_root) if flatten else 0
+    after = scene_stats(export_root)
+
+    ok = export_root.write_bam_file(Filename.from_os_specific(str(path)))
+    export_root.remove_node()
+    if not ok:
+        raise IOError(f"écriture impossible : {path}")
+    return {"before": before, "after": after, "flattened": flattened}
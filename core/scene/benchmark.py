@@ -0,0 +1,82 @@
+# core/scene/benchmark.py
+"""
+Compare les formats de scène JSON et binaire sur une scène synthétique.
+
+    python -m core.scene.benchmark [nb_nodes]
+"""
+import io
+import json
+import random
+import sys
+import time
+from array import array
+
+from core.scene.scene_format import read_binary, write_binary
+
+
+def make_scene(count, seed=0):
+    """Scène de `count` nodes : des groupes de props adossés à quelques fichiers."""
+    rng = random.Random(seed)
+
+    def f32(value):
+        # Les transforms Panda3D sont en float32
+        return array("f", [value])[0]
+
+    def transform():
+        return {
+            "pos": [f32(rng.uniform(-500, 500)) for _ in range(3)],
+            "hpr": [f32(rng.uniform(-180, 180)) for _ in range(3)],
+            "scale": [f32(rng.uniform(0.5, 2.0)) for _ in range(3)],
+        }
+
+    roots = []
+    groups = []
+    for i in range(count):
+        if i % 50 == 0 or not groups:
+            entry = {"name": f"group_{i}", "type": "group", "file": None, "transform": transform(),
+                     "is_container": False, "childs": []}
+            roots.append(entry)
+            groups.append(entry)
+            continue
+        model = f"models/prop_{i % 20}.egg"
+        entry = {"name": f"prop_{i}", "type": "group",
+                 "file": {"name": f"prop_{i % 20}", "path": model, "data": None},
+                 "transform": transform(), "is_container": False, "childs": []}
+        groups[-1]["childs"].append(entry)
+    return roots
+
+
+def _timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(count):
+    scene = make_scene(count)
+
+    json_write, text = _timed(lambda: json.dumps(scene, indent=2, ensure_ascii=False))
+    json_read, _ = _timed(lambda: json.loads(text))
+
+    def to_binary():
+        buffer = io.BytesIO()
+        write_binary(buffer, scene)
+        return buffer.getvalue()
+
+    bin_write, blob = _timed(to_binary)
+    bin_read, decoded = _timed(lambda: read_binary(io.BytesIO(blob)))
+    assert decoded == scene, "la conversion binaire n'est pas sans perte"
+
+    size_json = len(text.encode("utf-8"))
+    print(f"Scène synthétique : {count} nodes")
+    print(f"{'format':<8}{'écriture':>12}{'lecture':>12}{'taille':>14}")
+    print(f"{'json':<8}{json_write * 1000:>10.1f}ms{json_read * 1000:>10.1f}ms{size_json / 1024:>11.1f} Ko")
+    print(f"{'binaire':<8}{bin_write * 1000:>10.1f}ms{bin_read * 1000:>10.1f}ms{len(blob) / 1024:>11.1f} Ko")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
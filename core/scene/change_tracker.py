@@ -0,0 +1,203 @@
+# core/scene/change_tracker.py
+"""
+Suivi des modifications de la scène et journal de sauvegarde incrémentale.
+
+Le ChangeTracker note les nodes ajoutés, supprimés ou déplacés depuis la
+dernière sauvegarde. Save peut alors ajouter ces seules opérations au journal
+"<scène>.journal" (une opération JSON par ligne) au lieu de réécrire toute la
+scène ; OpenScene rejoue le journal sur le fichier de base, et une sauvegarde
+complète le compacte dans la base. Les modifications que le tracker ne voit pas
+(scripts, renommages, reparentages) passent par mark_untracked() et imposent
+une sauvegarde complète.
+"""
+import json
+from pathlib import Path
+
+from core.scene.node_index import relative_path, split_segment
+
+JOURNAL_SUFFIX = ".journal"
+
+
+def journal_path(scene_path) -> Path:
+    scene_path = Path(scene_path)
+    return scene_path.with_name(scene_path.name + JOURNAL_SUFFIX)
+
+
+class ChangeTracker:
+    def __init__(self, root):
+        """:param root: NodePath racine de la scène (render)"""
+        self.root = root
+        self.base_path = None
+        self.revision = 0  # incrémenté à chaque modification notifiée (jamais remis à zéro)
+        self.reset()
+
+    def reset(self, base_path=None):
+        """Repart d'une scène propre, identique au fichier `base_path`."""
+        self.base_path = Path(base_path) if base_path else None
+        self._structure = []    # opérations dans l'ordre : ("add", clé, np) / ("remove", chemin)
+        self._added = set()     # clés des nodes ajoutés depuis la sauvegarde
+        self._transformed = {}  # clé -> NodePath dont la transformation a changé
+        self.full_save_required = False
+
+    @property
+    def dirty(self):
+        return bool(self._structure or self._transformed)
+
+    def _path(self, np):
+        return relative_path(np, self.root)
+
+    # ---------------- Notifications ----------------
+    def mark_added(self, np):
+        self.revision += 1
+        key = np.get_key()
+        self._added.add(key)
+        self._structure.append(("add", key, np))
+
+    def mark_transformed(self, np):
+        if np is not None and not np.is_empty():
+            self.revision += 1
+            self._transformed[np.get_key()] = np
+
+    def mark_removed(self, np):
+        """À appeler AVANT de retirer `np` de la scène."""
+        self.revision += 1
+        key = np.get_key()
+        self._transformed.pop(key, None)
+        if key in self._added:
+            # Ajouté puis supprimé depuis la sauvegarde : rien à journaliser
+            self._added.discard(key)
+            self._structure = [op for op in self._structure if op[0] == "remove" or op[1] != key]
+            return
+        self._structure.append(("remove", self._path(np)))
+
+    def mark_untracked(self):
+        """Modification que le journal ne sait pas décrire : la prochaine sauvegarde sera complète."""
+        self.revision += 1
+        self.full_save_required = True
+
+    # ---------------- Journal ----------------
+    def journal_records(self, describe_subtree):
+        """
+        Opérations à ajouter au journal depuis la dernière sauvegarde.
+        :param describe_subtree: describe_subtree(np) -> entrée complète du node et de ses enfants
+        """
+        records = []
+        written = set()
+        for op in self._structure:
+            if op[0] == "remove":
+                records.append({"op": "remove", "path": op[1]})
+                continue
+            key, np = op[1], op[2]
+            if np.is_empty() or key in written:
+                continue
+            entry = describe_subtree(np)
+            if entry is None:
+                continue
+            parent = np.get_parent()
+            records.append({
+                "op": "add",
+                "parent": "" if parent == self.root else self._path(parent),
+                "entry": entry,
+            })
+            written.add(key)
+
+        for key, np in self._transformed.items():
+            if key in written or np.is_empty():
+                continue
+            records.append({
+                "op": "transform",
+                "path": self._path(np),
+                "transform": {
+                    "pos": list(np.get_pos()),
+                    "hpr": list(np.get_hpr()),
+                    "scale": list(np.get_scale()),
+                },
+            })
+        return records
+
+
+# ---------------- Rejeu du journal sur les données de scène ----------------
+def _child_entry(entries, segment):
+    name, rank = split_segment(segment)
+    for entry in entries:
+        if entry.get("name") == name:
+            if rank == 0:
+                return entry
+            rank -= 1
+    return None
+
+
+def _locate(data, path):
+    """
+    Retourne (liste contenant l'entrée, entrée, reste du chemin).
+    Le reste est non vide quand le chemin descend dans le modèle d'un conteneur
+    fichier (les nodes internes n'existent que sous forme d'overrides).
+    """
+    siblings, entry = data, None
+    segments = path.split("/") if path else []
+    for i, segment in enumerate(segments):
+        if entry is not None:
+            siblings = entry.setdefault("childs", [])
+        child = _child_entry(siblings, segment)
+        if child is None:
+            if entry is not None and "overrides" in entry:
+                return None, entry, "/".join(segments[i:])
+            return None, None, None
+        entry = child
+    return siblings, entry, ""
+
+
+def apply_journal(data, records):
+    """Applique les opérations du journal à la liste d'entrées `data` ; retourne le nb d'opérations ignorées."""
+    skipped = 0
+    for record in records:
+        op = record.get("op")
+        if op == "remove":
+            siblings, entry, rest = _locate(data, record["path"])
+            if entry is None or rest:
+                skipped += 1
+                continue
+            siblings.remove(entry)
+        elif op == "add":
+            if record.get("parent"):
+                _, parent, rest = _locate(data, record["parent"])
+                if parent is None or rest:
+                    skipped += 1
+                    continue
+                parent.setdefault("childs", []).append(record["entry"])
+            else:
+                data.append(record["entry"])
+        elif op == "transform":
+            _, entry, rest = _locate(data, record["path"])
+            if entry is None:
+                skipped += 1
+            elif rest:
+                entry.setdefault("overrides", {})[rest] = record["transform"]
+            else:
+                entry["transform"] = record["transform"]
+        else:
+            skipped += 1
+    return skipped
+
+
+def read_journal(scene_path):
+    """Lit le journal d'une scène (liste vide s'il n'existe pas)."""
+    path = journal_path(scene_path)
+    if not path.exists():
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def append_journal(scene_path, records):
+    """Ajoute des opérations au journal ; retourne sa taille en octets."""
+    path = journal_path(scene_path)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path.stat().st_size
@@ -0,0 +1,135 @@
+# core/scene/model_cache.py
+import os
+
+from panda3d.core import Filename, get_model_path
+
+
+class ModelCache:
+    """
+    Cache de modèles partagé par le chargement de scène et les imports.
+
+    Chaque fichier n'est chargé qu'une fois (clé : chemin résolu + mtime) et garde
+    un modèle "gabarit" détaché de la scène. Les placements suivants sont des
+    `copyTo` du gabarit (Geoms partagés). Avec un `bam_cache`, les .egg sont lus
+    depuis leur conversion .bam en cache.
+    """
+
+    def __init__(self, loader, bam_cache=None):
+        self.loader = loader
+        self.bam_cache = bam_cache
+        self._templates = {}  # (chemin résolu, mtime ou None) -> NodePath gabarit
+        self._keys = {}       # chemin résolu -> clé courante
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, path):
+        """
+        Chemin résolu et mtime de `path`. Un chemin relatif introuvable tel quel est
+        cherché dans le model-path de Panda3D ; un fichier qui n'est pas sur le
+        disque (multifile, VFS) garde son chemin d'origine et un mtime None.
+        """
+        path = str(path)
+        if not os.path.exists(path):
+            filename = Filename.from_os_specific(path)
+            if not filename.resolve_filename(get_model_path().get_value()):
+                return path, None
+            path = filename.to_os_specific()
+        try:
+            return os.path.realpath(path), os.stat(path).st_mtime
+        except OSError:
+            return path, None
+
+    def get_template(self, path):
+        """Retourne le modèle gabarit de `path`, en le chargeant si besoin."""
+        key = self._key(path)
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            return template
+
+        self.misses += 1
+        source, cached = self._source_for(key)
+        template = self.loader.loadModel(Filename.from_os_specific(source).get_fullpath())
+        self._store(key, self._from_source(key, template, cached))
+        return template
+
+    def cached_template(self, path):
+        """Gabarit de `path` s'il est déjà en cache, sans jamais charger le fichier (sinon None)."""
+        return self._templates.get(self._key(path))
+
+    def request_template(self, path, callback):
+        """
+        Version asynchrone de get_template() via le loader asynchrone de Panda3D.
+        `callback(template)` reçoit le gabarit, ou None si le chargement a échoué.
+        Retourne la requête du loader (annulable avec loader.cancelRequest), ou
+        None si le gabarit était déjà en cache.
+        """
+        key = self._key(path)
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            callback(template)
+            return None
+
+        self.misses += 1
+        source, cached = self._source_for(key)
+
+        def on_loaded(model):
+            if model is not None:
+                self._store(key, self._from_source(key, model, cached))
+            callback(model)
+
+        return self.loader.loadModel(Filename.from_os_specific(source).get_fullpath(), callback=on_loaded)
+
+    def _uses_bam_cache(self, key):
+        # Le cache .bam hashe le fichier source : il doit être sur le disque
+        return self.bam_cache is not None and key[1] is not None and self.bam_cache.handles(key[0])
+
+    def _source_for(self, key):
+        """Fichier à lire pour `key` : sa conversion .bam si elle est en cache."""
+        resolved = key[0]
+        if self._uses_bam_cache(key):
+            bam = self.bam_cache.lookup(resolved)
+            if bam is not None:
+                return str(bam), True
+        return resolved, False
+
+    def _from_source(self, key, model, cached):
+        resolved = key[0]
+        if cached:
+            # Garde le nom du fichier d'origine (les scènes sauvegardées y font référence)
+            model.set_name(os.path.basename(resolved))
+        elif self._uses_bam_cache(key):
+            self.bam_cache.store(resolved, model)
+        return model
+
+    def _store(self, key, template):
+        # Le fichier a changé sur le disque : on oublie l'ancien gabarit
+        resolved = key[0]
+        stale = self._keys.get(resolved)
+        if stale is not None and stale != key:
+            old = self._templates.pop(stale, None)
+            if old is not None:
+                old.remove_node()
+        self._keys[resolved] = key
+        self._templates[key] = template
+
+    def instantiate(self, path, parent):
+        """Place une copie légère (copyTo) du modèle `path` sous `parent` et retourne le NodePath créé."""
+        return self.get_template(path).copy_to(parent)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "templates": len(self._templates),
+        }
+
+    def clear(self):
+        """Oublie les gabarits : les prochains placements relisent les fichiers."""
+        for template in self._templates.values():
+            template.remove_node()
+        self._templates.clear()
+        self._keys.clear()
+        self.hits = 0
+        self.misses = 0
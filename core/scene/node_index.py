@@ -0,0 +1,98 @@
+# core/scene/node_index.py
+
+
+class NodeIndex:
+    """
+    Index nom -> enfants directs d'un NodePath, construit une seule fois par conteneur.
+
+    Remplace les `parent.find("**/nom")` du chargement de scène : chaque conteneur
+    n'est parcouru qu'une fois (au premier accès) et la résolution ne regarde que
+    les enfants directs, ce qui évite de confondre un node homonyme situé plus bas
+    dans l'arbre avec celui qu'on est en train de charger.
+    """
+
+    def __init__(self):
+        self._by_parent = {}  # clé du parent -> {nom: [enfants non encore réclamés]}
+
+    def _children_of(self, parent_np):
+        key = parent_np.get_key()
+        table = self._by_parent.get(key)
+        if table is None:
+            table = {}
+            for child in parent_np.get_children():
+                table.setdefault(child.get_name(), []).append(child)
+            # Ordre inversé pour réclamer les homonymes dans l'ordre avec pop()
+            for siblings in table.values():
+                siblings.reverse()
+            self._by_parent[key] = table
+        return table
+
+    def resolve(self, parent_np, name):
+        """
+        Retourne le premier enfant direct de `parent_np` nommé `name` et le réserve,
+        pour que deux nodes JSON homonymes ne pointent pas vers le même NodePath.
+        Retourne None si aucun enfant ne correspond.
+        """
+        siblings = self._children_of(parent_np).get(name)
+        if siblings:
+            return siblings.pop()
+        return None
+
+    def clear(self):
+        self._by_parent.clear()
+
+
+def path_segment(node):
+    """
+    Segment de chemin de `node` sous son parent : son nom, suivi de "[i]" s'il est
+    le i-ème (i > 0) d'une fratrie d'homonymes.
+    """
+    name = node.get_name()
+    if not node.has_parent():
+        return name
+    rank = 0
+    for sibling in node.get_parent().get_children():
+        if sibling == node:
+            break
+        if sibling.get_name() == name:
+            rank += 1
+    return f"{name}[{rank}]" if rank else name
+
+
+def relative_path(node, ancestor):
+    """Chemin "a/b[1]/c" de `node` depuis `ancestor` (exclu)."""
+    segments = []
+    current = node
+    while current != ancestor and not current.is_empty():
+        segments.append(path_segment(current))
+        if not current.has_parent():
+            break
+        current = current.get_parent()
+    return "/".join(reversed(segments))
+
+
+def split_segment(segment):
+    """"nom[2]" -> ("nom", 2) ; "nom" -> ("nom", 0)."""
+    if segment.endswith("]") and "[" in segment:
+        name, _, rank = segment[:-1].rpartition("[")
+        if rank.isdigit():
+            return name, int(rank)
+    return segment, 0
+
+
+def resolve_path(root, path):
+    """Retrouve le NodePath désigné par `path` (voir relative_path) sous `root`, ou None."""
+    current = root
+    for segment in path.split("/"):
+        name, rank = split_segment(segment)
+        found = None
+        for child in current.get_children():
+            if child.get_name() == name:
+                if rank == 0:
+                    found = child
+                    break
+                rank -= 1
+        if found is None:
+            return None
+        current = found
+    return current
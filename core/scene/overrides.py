@@ -0,0 +1,65 @@
+# core/scene/overrides.py
+from panda3d.core import ModelRoot
+
+from core.scene.node_index import path_segment, resolve_path
+
+# Écart en dessous duquel une transformation est considérée inchangée
+EPSILON = 1e-4
+
+
+def is_model_root(np):
+    """Vrai si `np` est la racine d'un modèle chargé depuis un fichier."""
+    return np.node().is_of_type(ModelRoot.get_class_type())
+
+
+def _differs(a, b):
+    return any(abs(x - y) > EPSILON for x, y in zip(a, b))
+
+
+def _transform(np):
+    return {
+        "pos": list(np.get_pos()),
+        "hpr": list(np.get_hpr()),
+        "scale": list(np.get_scale()),
+    }
+
+
+def compute_overrides(container, template):
+    """
+    Compare les modèles chargés sous `container` à leur gabarit et retourne
+    {chemin relatif au conteneur: transform} pour les seuls nodes modifiés.
+    """
+    overrides = {}
+    stack = []
+    for child in container.get_children():
+        if is_model_root(child):
+            stack.append((child, template, path_segment(child)))
+
+    while stack:
+        node, reference, path = stack.pop()
+        if (_differs(node.get_pos(), reference.get_pos())
+                or _differs(node.get_hpr(), reference.get_hpr())
+                or _differs(node.get_scale(), reference.get_scale())):
+            overrides[path] = _transform(node)
+
+        children = node.get_children()
+        references = reference.get_children()
+        for i in range(min(children.get_num_paths(), references.get_num_paths())):
+            child = children[i]
+            if child.get_name() == references[i].get_name():
+                stack.append((child, references[i], f"{path}/{path_segment(child)}"))
+    return overrides
+
+
+def apply_overrides(container, overrides):
+    """Réapplique les transformations sauvegardées sur un modèle fraîchement chargé."""
+    missing = 0
+    for path, transform in overrides.items():
+        np = resolve_path(container, path)
+        if np is None:
+            missing += 1
+            continue
+        np.set_pos(*transform.get("pos", (0, 0, 0)))
+        np.set_hpr(*transform.get("hpr", (0, 0, 0)))
+        np.set_scale(*transform.get("scale", (1, 1, 1)))
+    return missing
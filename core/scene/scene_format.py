@@ -0,0 +1,381 @@
+# core/scene/scene_format.py
+"""
+Formats de fichier de scène : JSON (historique) et binaire compact (.p3ds).
+
+Les deux formats contiennent la même liste d'entrées {name, type, file,
+transform, is_container, childs, ...} ; read_scene()/write_scene() choisissent le
+format d'après l'extension et convert_scene() passe de l'un à l'autre sans perte.
+
+Disposition du binaire (little-endian) :
+    en-tête     MAGIC, version u16, flags u16, nb nodes u32, nb chaînes u32
+    chaînes     u32 longueur + UTF-8, dédupliquées (noms, types, chemins...)
+    parents     int32 par node, -1 pour une racine (les parents précèdent leurs enfants)
+    name, type  u32 par node (index dans la table de chaînes)
+    file        int32 chemin + int32 nom par node (-1 si absent)
+    extra       int32 par node : JSON des champs restants (overrides...), -1 si aucun
+    bits        u8 par node (voir _BIT_*)
+    transforms  9 float32 par node (pos, hpr, scale), float64 si FLAG_F64
+"""
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+BINARY_SUFFIX = ".p3ds"
+MAGIC = b"P3DSCENE"
+VERSION = 1
+
+FLAG_F64 = 1  # transforms stockées en float64 (valeurs non représentables en float32)
+
+_HEADER = struct.Struct("<8sHHII")
+_U32 = struct.Struct("<I")
+
+_BIT_CONTAINER = 1        # is_container vaut True
+_BIT_HAS_CONTAINER = 2    # la clé is_container est présente
+_BIT_FILE_NONE = 4        # la clé file est présente et vaut None
+_BIT_FILE_COLUMNS = 8     # file = {"name", "path", "data": None} stocké dans les colonnes
+_BIT_TRANSFORM = 16       # transform = {pos, hpr, scale} stocké dans le bloc de floats
+_BIT_CHILDS = 32          # la clé childs est présente
+_BIT_NO_NAME = 64         # pas de nom chaîne dans la colonne (absent, ou autre type -> extra)
+_BIT_NO_TYPE = 128        # pas de type chaîne dans la colonne (absent, ou autre type -> extra)
+
+_CORE_KEYS = ("name", "type", "file", "transform", "is_container", "childs")
+
+
+class SceneFormatError(ValueError):
+    """Fichier de scène illisible (format inconnu, version ou contenu invalide)."""
+
+
+def _little_endian(arr):
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _flatten(data):
+    """Parcours pré-ordre itératif : liste de (entrée, index du parent)."""
+    flat = []
+    stack = [(entry, -1) for entry in reversed(data)]
+    while stack:
+        entry, parent_idx = stack.pop()
+        idx = len(flat)
+        flat.append((entry, parent_idx))
+        for child in reversed(entry.get("childs") or ()):
+            stack.append((child, idx))
+    return flat
+
+
+def _packed_transform(transform):
+    if not isinstance(transform, dict) or set(transform) != {"pos", "hpr", "scale"}:
+        return None
+    values = []
+    for key in ("pos", "hpr", "scale"):
+        vec = transform[key]
+        if not isinstance(vec, (list, tuple)) or len(vec) != 3:
+            return None
+        values.extend(vec)
+    # Floats seulement : des entiers reviendraient en float, ils restent dans l'extra JSON
+    if not all(type(v) is float for v in values):
+        return None
+    return values
+
+
+def _columns_file(file_info):
+    return (isinstance(file_info, dict) and set(file_info) == {"name", "path", "data"}
+            and file_info["data"] is None
+            and isinstance(file_info["name"], str) and isinstance(file_info["path"], str))
+
+
+# ---------------- Binaire ----------------
+def write_binary(f, data):
+    """Écrit la liste d'entrées `data` au format binaire dans le flux `f`."""
+    flat = _flatten(data)
+    strings = {}
+
+    def intern(text):
+        idx = strings.get(text)
+        if idx is None:
+            idx = strings[text] = len(strings)
+        return idx
+
+    parents = array("i")
+    names = array("I")
+    types = array("I")
+    file_paths = array("i")
+    file_names = array("i")
+    extras = array("i")
+    bits = bytearray()
+    floats = []
+
+    for entry, parent_idx in flat:
+        parents.append(parent_idx)
+        b = _BIT_CHILDS if "childs" in entry else 0
+        extra = {k: v for k, v in entry.items() if k not in _CORE_KEYS}
+
+        for key, column, bit in (("name", names, _BIT_NO_NAME), ("type", types, _BIT_NO_TYPE)):
+            value = entry.get(key)
+            if isinstance(value, str):
+                column.append(intern(value))
+            else:
+                column.append(0)
+                b |= bit
+                if key in entry:
+                    extra[key] = value
+
+        if "is_container" in entry:
+            if isinstance(entry["is_container"], bool):
+                b |= _BIT_HAS_CONTAINER | (_BIT_CONTAINER if entry["is_container"] else 0)
+            else:
+                extra["is_container"] = entry["is_container"]
+
+        file_info = entry.get("file")
+        if "file" in entry and file_info is None:
+            b |= _BIT_FILE_NONE
+        if _columns_file(file_info):
+            b |= _BIT_FILE_COLUMNS
+            file_paths.append(intern(file_info["path"]))
+            file_names.append(intern(file_info["name"]))
+        else:
+            file_paths.append(-1)
+            file_names.append(-1)
+            if file_info is not None:
+                extra["file"] = file_info
+
+        values = _packed_transform(entry.get("transform"))
+        if values is not None:
+            b |= _BIT_TRANSFORM
+            floats.extend(values)
+        else:
+            floats.extend((0.0,) * 9)
+            if "transform" in entry:
+                extra["transform"] = entry["transform"]
+
+        extras.append(intern(json.dumps(extra, ensure_ascii=False)) if extra else -1)
+        bits.append(b)
+
+    # float32 si toutes les valeurs y survivent (cas des transforms Panda3D), sinon float64
+    packed = array("f", floats)
+    flags = 0
+    if list(packed) != [float(v) for v in floats]:
+        packed = array("d", floats)
+        flags |= FLAG_F64
+
+    f.write(_HEADER.pack(MAGIC, VERSION, flags, len(flat), len(strings)))
+    for text in strings:
+        encoded = text.encode("utf-8")
+        f.write(_U32.pack(len(encoded)))
+        f.write(encoded)
+    for arr in (parents, names, types, file_paths, file_names, extras):
+        f.write(_little_endian(arr).tobytes())
+    f.write(bytes(bits))
+    f.write(_little_endian(packed).tobytes())
+
+
+def read_binary(f):
+    """Lit une scène binaire depuis le flux `f` et retourne la liste d'entrées racines."""
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise SceneFormatError("fichier de scène binaire tronqué")
+    magic, version, flags, count, string_count = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise SceneFormatError("ce n'est pas une scène binaire")
+    if version > VERSION:
+        raise SceneFormatError(f"version de scène binaire non supportée : {version}")
+
+    def read_exact(length):
+        raw = f.read(length)
+        if len(raw) != length:
+            raise SceneFormatError("fichier de scène binaire tronqué")
+        return raw
+
+    strings = []
+    for _ in range(string_count):
+        (length,) = _U32.unpack(read_exact(_U32.size))
+        try:
+            strings.append(read_exact(length).decode("utf-8"))
+        except UnicodeDecodeError as e:
+            raise SceneFormatError(f"chaîne invalide dans la scène binaire : {e}") from e
+
+    def read_array(typecode, length):
+        arr = array(typecode)
+        raw = f.read(arr.itemsize * length)
+        if len(raw) != arr.itemsize * length:
+            raise SceneFormatError("fichier de scène binaire tronqué")
+        arr.frombytes(raw)
+        return _little_endian(arr)
+
+    parents = read_array("i", count)
+    names = read_array("I", count)
+    types = read_array("I", count)
+    file_paths = read_array("i", count)
+    file_names = read_array("i", count)
+    extras = read_array("i", count)
+    bits = read_exact(count)
+    floats = read_array("d" if flags & FLAG_F64 else "f", count * 9).tolist()
+
+    try:
+        return _build_entries(count, strings, parents, names, types, file_paths,
+                              file_names, extras, bits, floats)
+    except (IndexError, KeyError, TypeError, ValueError, AttributeError) as e:
+        # Index hors table, parent après son enfant, extra JSON invalide...
+        raise SceneFormatError(f"scène binaire corrompue : {e}") from e
+
+
+def _build_entries(count, strings, parents, names, types, file_paths, file_names, extras, bits, floats):
+    roots = []
+    nodes = []
+    for i in range(count):
+        b = bits[i]
+        extra = json.loads(strings[extras[i]]) if extras[i] >= 0 else {}
+        entry = {}
+        if not b & _BIT_NO_NAME:
+            entry["name"] = strings[names[i]]
+        elif "name" in extra:
+            entry["name"] = extra.pop("name")
+        if not b & _BIT_NO_TYPE:
+            entry["type"] = strings[types[i]]
+        elif "type" in extra:
+            entry["type"] = extra.pop("type")
+
+        if b & _BIT_FILE_COLUMNS:
+            entry["file"] = {"name": strings[file_names[i]], "path": strings[file_paths[i]], "data": None}
+        elif b & _BIT_FILE_NONE:
+            entry["file"] = None
+        elif "file" in extra:
+            entry["file"] = extra.pop("file")
+
+        if b & _BIT_TRANSFORM:
+            t = floats[i * 9:i * 9 + 9]
+            entry["transform"] = {"pos": t[0:3], "hpr": t[3:6], "scale": t[6:9]}
+        elif "transform" in extra:
+            entry["transform"] = extra.pop("transform")
+
+        if b & _BIT_HAS_CONTAINER:
+            entry["is_container"] = bool(b & _BIT_CONTAINER)
+        elif "is_container" in extra:
+            entry["is_container"] = extra.pop("is_container")
+
+        if b & _BIT_CHILDS:
+            entry["childs"] = []
+        entry.update(extra)
+        nodes.append(entry)
+        if parents[i] < 0:
+            roots.append(entry)
+        elif parents[i] >= i:
+            raise ValueError(f"parent {parents[i]} du node {i} invalide")
+        else:
+            nodes[parents[i]]["childs"].append(entry)
+    return roots
+
+
+# ---------------- Écriture en flux ----------------
+def _dumps_at(value, indent):
+    """json.dumps(indent=2) d'une valeur imbriquée à la profondeur `indent`."""
+    return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + indent)
+
+
+class JsonStreamWriter:
+    """
+    Écrit une scène JSON au fil de l'eau : begin(entry) ouvre une entrée et sa
+    liste "childs", end() la referme, close() termine le document.
+
+    La mémoire dépend de la profondeur de l'arbre, pas du nombre de nodes. La
+    sortie est identique à json.dump(..., indent=2, ensure_ascii=False) du
+    document équivalent, avec "childs" en dernière clé de chaque entrée.
+    """
+
+    def __init__(self, f):
+        self._write = f.write
+        self._write("[")
+        # Chaque liste ouverte : [profondeur, nb d'entrées écrites]
+        self._levels = [[1, 0]]
+
+    def begin(self, entry):
+        level = self._levels[-1]
+        depth = level[0]
+        write = self._write
+        write(("," if level[1] else "") + "\n" + "  " * depth + "{")
+        level[1] += 1
+
+        indent = "  " * (depth + 1)
+        for key, value in entry.items():
+            if key != "childs":
+                write("\n" + indent + json.dumps(key) + ": " + _dumps_at(value, indent) + ",")
+        write("\n" + indent + '"childs": [')
+        self._levels.append([depth + 2, 0])
+
+    def _close_list(self):
+        depth, count = self._levels.pop()
+        self._write("\n" + "  " * (depth - 1) + "]" if count else "]")
+        return depth
+
+    def end(self):
+        depth = self._close_list()
+        self._write("\n" + "  " * (depth - 2) + "}")
+
+    def close(self):
+        self._close_list()
+
+
+class EntryTreeBuilder:
+    """Même interface que JsonStreamWriter, mais construit la liste d'entrées imbriquées (data)."""
+
+    def __init__(self):
+        self.data = []
+        self._lists = [self.data]
+
+    def begin(self, entry):
+        entry = dict(entry)
+        entry["childs"] = []
+        self._lists[-1].append(entry)
+        self._lists.append(entry["childs"])
+
+    def end(self):
+        self._lists.pop()
+
+    def close(self):
+        pass
+
+
+# ---------------- Lecture / écriture selon l'extension ----------------
+def is_binary_path(path):
+    return Path(path).suffix.lower() == BINARY_SUFFIX
+
+
+def read_scene(path):
+    """Lit un fichier de scène (JSON ou binaire) ; lève SceneFormatError s'il est invalide."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            f.seek(0)
+            return read_binary(f)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        raise SceneFormatError(f"JSON invalide : {e}") from e
+
+
+def write_scene(path, data):
+    """Écrit `data` en binaire si `path` finit par .p3ds, en JSON sinon."""
+    path = Path(path)
+    if is_binary_path(path):
+        with open(path, "wb") as f:
+            write_binary(f, data)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def convert_scene(src, dst):
+    """Convertit une scène JSON <-> binaire (le format de sortie suit l'extension de `dst`)."""
+    write_scene(dst, read_scene(src))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage : python -m core.scene.scene_format <source> <destination>")
+        sys.exit(1)
+    convert_scene(sys.argv[1], sys.argv[2])
+    print(f"[INFO] {sys.argv[1]} -> {sys.argv[2]}")
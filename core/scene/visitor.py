@@ -0,0 +1,140 @@
+# core/scene/visitor.py
+from pathlib import Path
+
+from panda3d.core import AmbientLight, DirectionalLight, PointLight, Spotlight
+
+LIGHT_TYPES = (AmbientLight, DirectionalLight, PointLight, Spotlight)
+
+
+class NodeVisit:
+    """
+    Un NodePath rencontré pendant le parcours, avec ce que les consommateurs
+    demandent tous : nom, node() et type de lumière, entrée de editor_app.models.
+    Chaque valeur n'est calculée qu'une fois par visite.
+    """
+
+    __slots__ = ("node", "parent", "depth", "name", "obj", "light_kind", "model")
+
+    def __init__(self, node, parent, models):
+        self.node = node
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.name = node.get_name()
+        try:
+            self.obj = node.node()
+        except Exception:
+            self.obj = None
+        self.light_kind = type(self.obj).__name__ if isinstance(self.obj, LIGHT_TYPES) else None
+        model = models.get(self.name)
+        self.model = model if isinstance(model, dict) else None
+
+    @property
+    def is_light(self):
+        return self.light_kind is not None
+
+    @property
+    def file_info(self):
+        """Bloc 'file' de l'entrée du modèle (construit depuis 'path' pour les anciennes entrées)."""
+        if self.model is None:
+            return None
+        file_info = self.model.get("file")
+        if not file_info and self.model.get("path"):
+            file_info = {
+                "name": Path(self.model["path"]).stem,
+                "path": self.model["path"],
+                "data": None
+            }
+        return file_info
+
+    @property
+    def kind(self):
+        if self.light_kind is not None:
+            return "light"
+        file_info = self.file_info
+        if file_info and file_info.get("path"):
+            return "model"
+        return "group"
+
+
+class SceneWalker:
+    """
+    Parcours itératif (pile explicite) du graphe de scène, partagé par plusieurs
+    consommateurs : chaque NodePath n'est visité qu'une fois quel que soit leur nombre.
+
+    Un consommateur expose enter(visit) et, s'il le souhaite, leave(visit).
+    enter() qui retourne False coupe le sous-arbre pour ce seul consommateur
+    (il ne reçoit alors pas de leave()) ; le parcours ne descend plus dès
+    qu'aucun consommateur n'est intéressé.
+    """
+
+    def __init__(self, models):
+        self.models = models
+
+    def visit(self, node, parent=None):
+        return NodeVisit(node, parent, self.models)
+
+    def walk(self, roots, *consumers):
+        # Chaque niveau : [itérateur des enfants, visite parente, consommateurs actifs]
+        stack = [[iter(roots), None, consumers]]
+        while stack:
+            nodes, parent, active = stack[-1]
+            node = next(nodes, None)
+            if node is None:
+                stack.pop()
+                if parent is not None:
+                    for consumer in reversed(active):
+                        leave = getattr(consumer, "leave", None)
+                        if leave is not None:
+                            leave(parent)
+                continue
+
+            visit = NodeVisit(node, parent, self.models)
+            entered = tuple(consumer for consumer in active if consumer.enter(visit) is not False)
+            if entered:
+                stack.append([iter(node.get_children()), visit, entered])
+
+
+class LightCollector:
+    """Consommateur : relève toutes les lumières du graphe (équivalent de find_all_matches('**/+Light'))."""
+
+    def __init__(self):
+        self.lights = []
+
+    def enter(self, visit):
+        if visit.light_kind is not None:
+            self.lights.append(visit)
+        return True
+
+
+class EntryConsumer:
+    """
+    Consommateur : décrit chaque node avec describe(visit, parent_entry) et passe
+    les entrées à un writer de scene_format (JsonStreamWriter, EntryTreeBuilder).
+    describe() retourne None pour ignorer un node et tout son sous-arbre.
+    """
+
+    def __init__(self, describe, writer):
+        self.describe = describe
+        self.writer = writer
+        self._entries = []
+
+    def enter(self, visit):
+        entry = self.describe(visit, self._entries[-1] if self._entries else None)
+        if entry is None:
+            return False
+        self.writer.begin(entry)
+        self._entries.append(entry)
+        return True
+
+    def leave(self, visit):
+        self._entries.pop()
+        self.writer.end()
+
+
+class FunctionConsumer:
+    """Adapte une paire de fonctions enter(visit) / leave(visit) en consommateur."""
+
+    def __init__(self, enter, leave=None):
+        self.enter = enter
+        if leave is not None:
+            self.leave = leave
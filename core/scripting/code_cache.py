@@ -0,0 +1,128 @@
+# core/scripting/code_cache.py
+import hashlib
+import importlib.util
+import marshal
+import os
+import time
+from pathlib import Path
+
+
+class CodeCache:
+    """
+    Code objects des scripts, compilés une fois par version de leur source.
+
+    Comme __pycache__, il y a un fichier par script (nommé d'après son chemin)
+    dans <projet>/.editor_cache/scripts/ : magic number de l'interpréteur, hash
+    du source, puis le code object sérialisé avec marshal. Un source inchangé
+    n'est jamais recompilé (reload, réexécution, prochain lancement) ; un source
+    modifié remplace le fichier du script, sans laisser d'anciennes versions.
+    """
+
+    CACHE_DIRNAME = ".editor_cache"
+
+    def __init__(self, root_getter):
+        """:param root_getter: fonction retournant le dossier racine du projet courant"""
+        self._root_getter = root_getter
+        self._memory = {}  # nom de fichier du script -> (hash du source, code object)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_dir(self):
+        try:
+            root = Path(self._root_getter())
+        except Exception:
+            return None
+        return root / self.CACHE_DIRNAME / "scripts" if root.is_dir() else None
+
+    @staticmethod
+    def source_hash(source):
+        return hashlib.sha1(source.encode("utf-8", "surrogatepass")).digest()
+
+    @staticmethod
+    def cache_name(filename):
+        """Nom du fichier de cache d'un script : <nom>.<hash du chemin>.pyc."""
+        digest = hashlib.sha1(filename.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+        return f"{Path(filename).stem}.{digest}.pyc"
+
+    def compile(self, source, filename):
+        """
+        Retourne (code, durée de compilation en secondes) ; la durée vaut None si
+        le code vient du cache (mémoire ou disque). SyntaxError est propagée.
+        """
+        source_hash = self.source_hash(source)
+        cached = self._memory.get(filename)
+        code = cached[1] if cached is not None and cached[0] == source_hash else None
+        if code is None:
+            code = self._read(filename, source_hash)
+            if code is not None:
+                self._memory[filename] = (source_hash, code)
+        if code is not None:
+            self.hits += 1
+            return code, None
+
+        start = time.perf_counter()
+        code = compile(source, filename, "exec")
+        elapsed = time.perf_counter() - start
+        self.misses += 1
+        self._memory[filename] = (source_hash, code)  # remplace la version précédente
+        self._write(filename, source_hash, code)
+        return code, elapsed
+
+    def _read(self, filename, source_hash):
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            return None
+        try:
+            with open(cache_dir / self.cache_name(filename), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        header = importlib.util.MAGIC_NUMBER + source_hash
+        if not data.startswith(header):
+            return None  # autre version de Python ou source modifié
+        try:
+            return marshal.loads(data[len(header):])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _write(self, filename, source_hash, code):
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            return
+        path = cache_dir / self.cache_name(filename)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(importlib.util.MAGIC_NUMBER)
+                f.write(source_hash)
+                f.write(marshal.dumps(code))
+            os.replace(tmp, path)
+        except OSError:
+            pass  # cache facultatif : on recompilera au prochain lancement
+
+    def status(self):
+        cache_dir = self.cache_dir
+        files = list(cache_dir.glob("*.pyc")) if cache_dir is not None and cache_dir.is_dir() else []
+        return {
+            "dir": cache_dir,
+            "files": len(files),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        """Vide le cache mémoire et supprime les fichiers du cache disque."""
+        self._memory.clear()
+        cache_dir = self.cache_dir
+        if cache_dir is None or not cache_dir.is_dir():
+            return 0
+        removed = 0
+        for path in cache_dir.glob("*.pyc"):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
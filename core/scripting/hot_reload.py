@@ -0,0 +1,139 @@
+# core/scripting/hot_reload.py
+import ast
+import os
+import sys
+from pathlib import Path
+
+from direct.task import TaskManagerGlobal
+
+from core.editor_log import get_logger
+from core.project.watcher import ADDED, MODIFIED, RENAMED
+
+log = get_logger("scripts")
+
+
+def imported_modules(source):
+    """Noms de premier niveau importés par un source ("import a.b" -> "a")."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return names
+
+
+class ScriptReloader:
+    """
+    Recharge automatiquement les scripts chargés quand leur fichier change.
+
+    Les scripts du projet sont signalés par le ProjectWatcher (inotify ou
+    scrutation par lots) via on_fs_events() ; ceux qui sont hors du projet sont
+    vérifiés par une task qui fait un stat() sur un lot de poll_batch scripts à
+    chaque poll_interval. Les changements sont regroupés pendant `debounce`
+    secondes (une rafale de sauvegardes ne recharge qu'une fois), puis seuls les
+    scripts modifiés et ceux qui les importent sont réexécutés.
+    """
+
+    TASK_NAME = "script_hot_reload"
+    POLL_TASK_NAME = "script_hot_reload_poll"
+
+    def __init__(self, manager, watched_root_getter=None, debounce=0.3, poll_interval=1.0, poll_batch=20):
+        """:param watched_root_getter: fonction retournant le dossier surveillé par le ProjectWatcher (ou None)"""
+        self.manager = manager
+        self._watched_root_getter = watched_root_getter
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.poll_batch = poll_batch
+        self.enabled = True
+        self._changed = set()  # chemins (résolus) modifiés depuis le dernier reload
+        self._poll_cursor = 0
+
+    # ---------------- Détection ----------------
+    def on_fs_events(self, events):
+        """Écouteur du panneau projet (thread principal)."""
+        paths = []
+        for event in events:
+            if event.kind in (MODIFIED, ADDED):
+                paths.append(event.path)
+            elif event.kind == RENAMED:
+                paths.append(event.dest)  # sauvegarde atomique : fichier temporaire renommé
+        if paths:
+            self.notify_changed(paths)
+
+    def notify_changed(self, paths):
+        loaded = self._scripts_by_path()
+        hits = {p for p in (self._resolve(path) for path in paths) if p in loaded}
+        if not hits or not self.enabled:
+            return
+        self._changed |= hits
+        # Chaque nouvel événement repousse le reload (debounce)
+        taskMgr = TaskManagerGlobal.taskMgr
+        taskMgr.remove(self.TASK_NAME)
+        taskMgr.doMethodLater(self.debounce, self._flush, self.TASK_NAME)
+
+    def start_polling(self):
+        taskMgr = TaskManagerGlobal.taskMgr
+        taskMgr.remove(self.POLL_TASK_NAME)
+        taskMgr.doMethodLater(self.poll_interval, self._poll, self.POLL_TASK_NAME)
+
+    def stop(self):
+        taskMgr = TaskManagerGlobal.taskMgr
+        taskMgr.remove(self.TASK_NAME)
+        taskMgr.remove(self.POLL_TASK_NAME)
+        self._changed.clear()
+
+    @property
+    def watched_root(self):
+        try:
+            root = self._watched_root_getter() if self._watched_root_getter else None
+        except Exception:
+            return None
+        return self._resolve(root) if root is not None else None
+
+    def _poll(self, task):
+        """Stat d'un lot de scripts hors du dossier surveillé (tourniquet)."""
+        root = self.watched_root
+        outside = [s for s in self.manager.scripts.values()
+                   if s.path is not None and (root is None or root not in self._resolve(s.path).parents)]
+        changed = []
+        for _ in range(min(self.poll_batch, len(outside))):
+            if self._poll_cursor >= len(outside):
+                self._poll_cursor = 0
+            script = outside[self._poll_cursor]
+            self._poll_cursor += 1
+            if script.is_stale():
+                changed.append(script.path)
+        if changed:
+            self.notify_changed(changed)
+        return task.again
+
+    # ---------------- Reload ----------------
+    def _flush(self, task=None):
+        changed, self._changed = self._changed, set()
+        names = [name for name, script in self.manager.scripts.items()
+                 if script.path is not None and self._resolve(script.path) in changed]
+        if names:
+            log.debug("Scripts modifiés : %s", ", ".join(names))
+            self.manager.reload_scripts(names)
+        return None
+
+    def _scripts_by_path(self):
+        return {self._resolve(s.path): name for name, s in self.manager.scripts.items() if s.path is not None}
+
+    @staticmethod
+    def _resolve(path):
+        return Path(os.path.abspath(path))
+
+    @staticmethod
+    def forget_module(path):
+        """Retire de sys.modules le module chargé depuis `path` (le prochain import le relira)."""
+        target = os.path.abspath(path)
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None)
+            if module_file and os.path.abspath(module_file) == target:
+                del sys.modules[name]
@@ -1,8 +1,11 @@
 # core/scripting/script.py
-import traceback
 import types
 from pathlib import Path
 
+from core.editor_log import get_logger
+
+log = get_logger("scripts")
+
 
 class Script:
     """
@@ -26,9 +29,9 @@ class Script:
         try:
             with open(self.path, "r", encoding="utf-8") as f:
                 self.code = f.read()
-            print(f"[SCRIPT] Chargé : {self.path}")
+            log.info("Chargé : %s", self.path)
         except Exception as e:
-            print(f"[ERREUR] Lecture du script {self.path}: {e}")
+            log.error("Lecture du script %s: %s", self.path, e)
 
     def execute(self):
         """Exécute le code du script dans un environnement isolé mais avec le contexte global."""
@@ -37,10 +40,9 @@ class Script:
             env.update(self.locals)
             exec(self.code, env)
             self.locals.update(env)
-            print(f"[SCRIPT] Exécution terminée : {self.path or '<inline>'}")
+            log.debug("Exécution terminée : %s", self.path or '<inline>')
         except Exception:
-            print(f"[ERREUR] Dans le script {self.path or '<inline>'}:")
-            traceback.print_exc()
+            log.error("Dans le script %s:", self.path or '<inline>', exc_info=True)
 
     def call(self, func_name: str, *args, **kwargs):
         """Appelle une fonction définie dans le script."""
@@ -49,9 +51,9 @@ class Script:
             try:
                 return func(*args, **kwargs)
             except Exception:
-                traceback.print_exc()
+                log.error("Erreur lors de l'appel de %s()", func_name, exc_info=True)
         else:
-            print(f"[SCRIPT] Fonction introuvable : {func_name}")
+            log.warning("Fonction introuvable : %s", func_name)
 
     def reload(self):
         """Recharge et réexécute le script depuis son fichier."""
@@ -59,4 +61,4 @@ class Script:
             self.load()
             self.execute()
         else:
-            print("[SCRIPT] Impossible de recharger (fichier introuvable).")
\ No newline at end of file
+            log.warning("Impossible de recharger (fichier introuvable).")
\ No newline at end of file
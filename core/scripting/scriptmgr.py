@@ -7,10 +7,11 @@ from pathlib import Path
 from panda3d.bullet import *
 from panda3d.core import *
 
-import traceback
-import asyncio
-import re
-from pathlib import Path
+from core.editor_log import get_logger
+from core.scripting.code_cache import CodeCache
+from core.scripting.hot_reload import ScriptReloader, imported_modules
+
+log = get_logger("scripts")
 
 class Script:
     """
@@ -23,15 +24,20 @@ class Script:
       - Détection automatique de type (module ou script)
       - Support async
       - Gestion d’erreurs avec traceback
+      - Code compilé une seule fois par version du source (CodeCache)
     """
 
-    def __init__(self, path: Path = None, code: str = None, context=None):
+    def __init__(self, path: Path = None, code: str = None, context=None, code_cache=None):
         self.path = Path(path) if path else None
         self.code = code or ""
         self.context = context or {}
         self.env = dict(self.context)  # espace d’exécution persistant
         self._last_modified = None
         self.type = "unknown"  # 'script' ou 'library'
+        self.code_cache = code_cache
+        self._compiled = None         # code object de self.code
+        self._compiled_source = None  # source dont _compiled est issu
+        self.compile_time = None      # durée de la dernière compilation (None : venu du cache)
 
     # -------------------------------------------------------------
     def detect_type(self):
@@ -52,7 +58,7 @@ class Script:
         try:
             mtime = self.path.stat().st_mtime
         except FileNotFoundError:
-            print(f"[SCRIPT] Fichier introuvable : {self.path}")
+            log.warning("Fichier introuvable : %s", self.path)
             return
 
         if self._last_modified != mtime:
@@ -61,12 +67,31 @@ class Script:
                     self.code = f.read()
                 self._last_modified = mtime
                 self.detect_type()
-                print(f"[SCRIPT] Chargé : {self.path}  → Type : {self.type.upper()}")
+                log.info("Chargé : %s  → Type : %s", self.path, self.type.upper())
             except Exception as e:
-                print(f"[ERREUR] Lecture du script {self.path}: {e}")
-                traceback.print_exc()
+                log.error("Lecture du script %s: %s", self.path, e, exc_info=True)
         else:
-            print(f"[SCRIPT] Pas de changement détecté : {self.path}")
+            log.debug("Pas de changement détecté : %s", self.path)
+
+    # -------------------------------------------------------------
+    def compiled(self):
+        """Code object du source courant, recompilé uniquement si le source a changé."""
+        if self._compiled is not None and self._compiled_source is self.code:
+            return self._compiled
+        filename = str(self.path) if self.path else "<inline>"
+        if self.code_cache is not None:
+            code, elapsed = self.code_cache.compile(self.code, filename)
+        else:
+            start = time.perf_counter()
+            code = compile(self.code, filename, "exec")
+            elapsed = time.perf_counter() - start
+        self._compiled, self._compiled_source = code, self.code
+        self.compile_time = elapsed
+        if elapsed is None:
+            log.debug("Code en cache : %s", filename)
+        else:
+            log.info("Compilé : %s (%.1f ms)", filename, elapsed * 1000)
+        return code
 
     # -------------------------------------------------------------
     def execute(self, reset_env=False):
@@ -76,20 +101,18 @@ class Script:
         """
         try:
             if self.type == "library":
-                print(f"[SCRIPT] {self.path} est une bibliothèque (ismodule=True), non exécutée directement.")
+                log.info("%s est une bibliothèque (ismodule=True), non exécutée directement.", self.path)
                 return
 
             if reset_env:
                 self.env = dict(self.context)
 
-            exec(self.code, self.env)
+            exec(self.compiled(), self.env)
 
-            print(f"[SCRIPT] Exécution terminée : {self.path or '<inline>'}")
+            log.debug("Exécution terminée : %s", self.path or '<inline>')
 
         except Exception as e:
-            msg = f"[SCRIPT ERROR] {self.path or '<inline>'} : {e}"
-            print(msg)
-            traceback.print_exc()
+            log.error("%s : %s", self.path or '<inline>', e, exc_info=True)
 
     # -------------------------------------------------------------
     def call(self, func_name: str, *args, **kwargs):
@@ -105,10 +128,19 @@ class Script:
                     asyncio.create_task(result)
                 return result
             except Exception:
-                print(f"[SCRIPT ERROR] lors de l'appel de {func_name}()")
-                traceback.print_exc()
+                log.error("Erreur lors de l'appel de %s()", func_name, exc_info=True)
         else:
-            print(f"[SCRIPT] Fonction introuvable : {func_name}")
+            log.warning("Fonction introuvable : %s", func_name)
+
+    # -------------------------------------------------------------
+    def is_stale(self):
+        """True si le fichier a changé depuis le dernier chargement."""
+        if not self.path or self._last_modified is None:
+            return False
+        try:
+            return self.path.stat().st_mtime != self._last_modified
+        except OSError:
+            return False
 
     # -------------------------------------------------------------
     def reload(self):
@@ -117,7 +149,7 @@ class Script:
             self.load()
             self.execute(reset_env=False)
         else:
-            print(f"[SCRIPT] Impossible de recharger (fichier introuvable).")
+            log.warning("Impossible de recharger (fichier introuvable).")
 
 
 
@@ -139,6 +171,11 @@ class ScriptManager:
         self.editor_camera = editor_camera  # <--- ✅ caméra d’édition
         self.scripts = {}
         self._registered_tasks = []
+        # code objects des scripts, conservés dans le cache du projet
+        self.code_cache = CodeCache(lambda: editor_app.kivy_ui.project_hierarchic_sidebar.project_root)
+        # rechargement automatique des scripts modifiés (le ProjectWatcher couvre le projet)
+        self.reloader = ScriptReloader(self, lambda: editor_app.kivy_ui.project_hierarchic_sidebar.watcher.root)
+        self.reloader.start_polling()
 
         # --- Contexte partagé avec tous les scripts ---
         self.context = {
@@ -161,18 +198,19 @@ class ScriptManager:
         name = name or f"script_task_{len(self._registered_tasks)}"
         task = taskMgr.add(func, name)
         self._registered_tasks.append((name, task))
-        print(f"[SCRIPT MGR] Task enregistrée : {name}")
+        log.debug("Task enregistrée : %s", name)
         return task
 
     # -------------------------------------------------------------
     def add_script(self, name: str, path: Path = None, code: str = None):
         """Ajoute un script depuis un fichier ou une chaîne et l’exécute immédiatement."""
-        script = Script(path=path, code=code, context=self.context)
+        script = Script(path=path, code=code, context=self.context, code_cache=self.code_cache)
         if path:
             script.load()
         script.execute()
+        self._mark_scene_changed()
         self.scripts[name] = script
-        print(f"[SCRIPT MGR] Script ajouté : {name}")
+        log.info("Script ajouté : %s", name)
         return script
 
     # -------------------------------------------------------------
@@ -191,16 +229,59 @@ class ScriptManager:
         """Appelle une fonction d’un script déjà chargé."""
         script = self.scripts.get(name)
         if not script:
-            print(f"[SCRIPT MGR] Script introuvable : {name}")
+            log.warning("Script introuvable : %s", name)
             return None
+        self._mark_scene_changed()
         return script.call(func_name, *args, **kwargs)
 
     # -------------------------------------------------------------
     def reload_all(self):
         """Recharge et réexécute tous les scripts."""
         for name, script in self.scripts.items():
-            print(f"[SCRIPT MGR] Reload : {name}")
+            log.info("Reload : %s", name)
+            script.reload()
+        self._mark_scene_changed()
+
+    # -------------------------------------------------------------
+    def dependents_of(self, names):
+        """`names` suivis des scripts qui les importent, directement ou non."""
+        ordered = [name for name in names if name in self.scripts]
+        seen = set(ordered)
+        modules = {self.scripts[name].path.stem for name in ordered if self.scripts[name].path}
+        grew = True
+        while grew and modules:
+            grew = False
+            for name, script in self.scripts.items():
+                if name in seen or not imported_modules(script.code) & modules:
+                    continue
+                ordered.append(name)
+                seen.add(name)
+                if script.path:
+                    modules.add(script.path.stem)
+                grew = True
+        return ordered
+
+    def reload_scripts(self, names):
+        """Recharge les scripts `names` puis réexécute ceux qui en dépendent."""
+        for name in self.dependents_of(names):
+            script = self.scripts[name]
+            if script.path:
+                ScriptReloader.forget_module(script.path)
+            log.info("Reload : %s", name)
             script.reload()
+        self._mark_scene_changed()
+
+    # -------------------------------------------------------------
+    def _mark_scene_changed(self):
+        """
+        Un script peut renommer, reparenter ou déplacer des nodes sans que le
+        ChangeTracker le voie : la prochaine sauvegarde sera complète. Appelé une
+        fois quand un script démarre ou est rechargé, jamais à chaque frame de ses
+        tasks (le journal et l'autosave resteraient sinon toujours "modifiés").
+        """
+        changes = getattr(getattr(self.editor_app, "kivy_ui", None), "changes", None)
+        if changes is not None:
+            changes.mark_untracked()
 
     # -------------------------------------------------------------
     def clear_tasks(self):
@@ -208,5 +289,5 @@ class ScriptManager:
         taskMgr = TaskManagerGlobal.taskMgr
         for name, _ in self._registered_tasks:
             taskMgr.remove(name)
-            print(f"[SCRIPT MGR] Task supprimée : {name}")
+            log.debug("Task supprimée : %s", name)
         self._registered_tasks.clear()
\ No newline at end of file
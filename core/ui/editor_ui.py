@@ -18,7 +18,16 @@ from .onglets import ClosableTabBar
 from .menubar.menu import MenuBar
 from .toolbar import TransformToolbar
 from core.gizmos.gizmos import Gizmos
+from core.scene.model_cache import ModelCache
+from core.scene.bam_cache import BamCache
+from core.scene.autosave import AutosaveService
+from core.scene.change_tracker import ChangeTracker
+from core.scene.visitor import SceneWalker
+from core.project.indexed_fs import IndexedFileSystem
+from core.log_file import LogFileWriter
+from core.editor_log import get_logger
 from .script_ui import ScriptEditor
+from .refresh_scheduler import RefreshScheduler
 from panda3d.core import Point2
 from panda3d.core import DirectionalLight, AmbientLight, Vec4, PointLight
 
@@ -32,6 +41,9 @@ from kivy.uix.button import Button
 import json
 import os
 
+log = get_logger("scene")
+gizmo_log = get_logger("gizmos")
+
 
 class KeyboardSetupPopup(Popup):
     def __init__(self, config_path, **kwargs):
@@ -94,6 +106,7 @@ class EditorUI(App):
     """
 
     current_scene_file: Path = None
+    AUTOSAVE_INTERVAL = 120  # secondes entre deux sauvegardes automatiques (0 = désactivée)
 
     def __init__(self, panda, app):
         super().__init__(panda)
@@ -102,9 +115,23 @@ class EditorUI(App):
         self.scripting = None
         self.current_scene_file = None
         self.models = {}  # registre des modèles chargés
+        # gabarits partagés entre placements, .egg relus depuis le cache .bam du projet
+        self.bam_cache = BamCache(lambda: self.project_hierarchic_sidebar.project_root)
+        self.model_cache = ModelCache(self.panda.loader, bam_cache=self.bam_cache)
+        # modifications depuis la dernière sauvegarde (sauvegardes incrémentales)
+        self.changes = ChangeTracker(self.panda.render)
+        # parcours unique du graphe partagé par la sauvegarde, l'export et la hiérarchie
+        self.scene_walker = SceneWalker(self.models)
+        # rafraîchissements de panneaux regroupés à une fois par frame
+        self.refresh_scheduler = RefreshScheduler()
+        # FileChooser servis par l'index des assets du projet
+        self.asset_fs = IndexedFileSystem(lambda: self.project_hierarchic_sidebar.asset_index)
+        # copie de la console dans le dossier du projet (écrite sur un thread dédié)
+        self.log_file = LogFileWriter(lambda: self.project_hierarchic_sidebar.project_root)
 
         # --- Gizmo unique pour tout type de transformation ---
         self.gizmo = Gizmos(self.panda.render)
+        self.gizmo.on_target_changed = self.changes.mark_transformed
         self.gizmo.detach()
         self.current_gizmo_mode = None  # 'translate', 'rotate', 'scale'
 
@@ -135,6 +162,8 @@ class EditorUI(App):
             ui_app=self,
             project_root=str('default')
         )
+        # Scripts modifiés sur le disque : rechargement automatique
+        self.project_hierarchic_sidebar.fs_listeners.append(self._on_project_files_changed)
         # Met le panel dans un Splitter pour pouvoir redimensionner à droite
         self.project_splitter = Splitter(
             sizable_from='right',  # côté où l'on peut tirer pour redimensionner
@@ -159,6 +188,7 @@ class EditorUI(App):
         rightpanel = BoxLayout(orientation='vertical', spacing=0, padding=0, size_hint_x=0.15)
 
         self.sidebar = HierarchySidebar(self, app=self.app)
+        self.refresh_scheduler.register("hierarchy", self.sidebar.refresh_hierarchy, self.sidebar.rebuild_hierarchy)
         rightpanel.add_widget(self.sidebar)
 
         self.properties_sidebar = PropertiesSidebar(editor_app=self)
@@ -198,6 +228,8 @@ class EditorUI(App):
             'vertical', size_hint_y=0.25)
             self.console_splitter.add_widget(console_box)
             self.console = KivyConsole()
+            self.console.log_file = self.log_file
+            self.log_file.start()
             console_box.add_widget(self.console)
             root.add_widget(self.console_splitter)
 
@@ -205,9 +237,12 @@ class EditorUI(App):
         self.menu._setup_file_actions()
         self.setup_mouse_controls()
 
+        # --- Sauvegarde automatique ---
+        self.autosave = AutosaveService(self, interval=self.AUTOSAVE_INTERVAL)
+
 
         self.set_ambient_light()
-        self.sidebar.refresh_hierarchy()
+        self.refresh_scheduler.invalidate("hierarchy")
 
                 # Quand la sidebar gauche change de largeur
         self.project_splitter.bind(width=lambda *args: self.update_viewport_region())
@@ -224,6 +259,10 @@ class EditorUI(App):
         return root
 
     # --- Scripts ---
+    def _on_project_files_changed(self, events):
+        if self.scripting is not None:
+            self.scripting.reloader.on_fs_events(events)
+
     def open_script(self, path: str):
         name = Path(path).name
         if name in self.script_tab_bar.contents:
@@ -262,14 +301,12 @@ class EditorUI(App):
         # stocke le mode actif
         if tool == "move":
             self.current_gizmo_mode = "translate"
-            print('translate')
         elif tool == "rotate":
             self.current_gizmo_mode = "rotate"
         elif tool == "scale":
             self.current_gizmo_mode = "scale"
 
         self.gizmo.set_target(selected)
-        print(selected)
         self.gizmo._node.setScale(2.0)  # augmente la taille pour tester
         self.gizmo.attach_to(selected)
         self.gizmo.show()
@@ -301,13 +338,13 @@ class EditorUI(App):
             return
         ok = self.gizmo.start_drag(mouse_pos, self.panda, self.current_gizmo_mode)
         if ok:
-            print("[EditorUI] Gizmo drag started")
+            gizmo_log.debug("Déplacement du gizmo commencé")
             self.dragging = True
 
     def on_mouse_release(self):
         if self.dragging:
             self.gizmo.stop_drag()
-            print("[EditorUI] Gizmo drag stopped")
+            gizmo_log.debug("Déplacement du gizmo terminé")
             self.dragging = False
 
     def mouse_task(self, task):
@@ -396,8 +433,9 @@ class EditorUI(App):
         dl_np = self.panda.render.attachNewNode(dl)
         dl_np.setHpr(*hpr)
         self.panda.render.setLight(dl_np)
-        print(f"[INFO] DirectionalLight added : {name}")
-        self.sidebar.refresh_hierarchy()
+        self.changes.mark_added(dl_np)
+        log.info("DirectionalLight ajoutée : %s", name)
+        self.refresh_scheduler.invalidate("hierarchy", node=dl_np)
         return dl_np
 
     def set_ambient_light(self, color=(1.0, 0.98, 0.9, 1.0), name='Ambient'):
@@ -408,8 +446,9 @@ class EditorUI(App):
         al.setColor(Vec4(*color))
         al_np = self.panda.render.attachNewNode(al)
         self.panda.render.setLight(al_np)
-        print(f"[EditorUI] Ambient light ajouté : {name}")
-        self.sidebar.refresh_hierarchy()
+        self.changes.mark_added(al_np)
+        log.info("Ambient light ajoutée : %s", name)
+        self.refresh_scheduler.invalidate("hierarchy", node=al_np)
         return al_np
 
     def add_light_to_model(self, model_nodepath, kind='point', color=(1,1,1,1), name_prefix='Light'):
@@ -419,7 +458,7 @@ class EditorUI(App):
         kind: 'point' ou 'spot' (point par défaut)
         """
         if model_nodepath is None:
-            print("[EditorUI] Aucun modèle fourni pour ajouter une light.")
+            log.warning("Aucun modèle fourni pour ajouter une light.")
             return None
 
         if kind == 'point':
@@ -436,12 +475,10 @@ class EditorUI(App):
                 pl_np.setPos(model_nodepath.get_pos())
             # Appliquer la light globalement
             self.panda.render.setLight(pl_np)
-            print(f"[EditorUI] Point light (attachée à render) positionnée sur {model_nodepath.get_name()}")
+            self.changes.mark_added(pl_np)
+            log.info("Point light (attachée à render) positionnée sur %s", model_nodepath.get_name())
             # Rafraîchir la hiérarchie pour afficher la nouvelle light
-            try:
-                self.sidebar.refresh_hierarchy()
-            except Exception:
-                pass
+            self.refresh_scheduler.invalidate("hierarchy", node=pl_np)
             return pl_np
         else:
             # Par défaut fallback sur point light
@@ -0,0 +1,93 @@
+# core/ui/log_viewer.py
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.slider import Slider
+from kivy.uix.spinner import Spinner
+
+from core.log_file import LogFileReader
+
+
+class LogViewerPopup(Popup):
+    """
+    Parcourt le fichier de log du projet (et ses rotations) page par page :
+    seule la page affichée est lue sur le disque (voir LogFileReader).
+    """
+
+    def __init__(self, log_path, page_lines=200, **kwargs):
+        kwargs.setdefault("title", "Journal de l'éditeur")
+        kwargs.setdefault("size_hint", (0.85, 0.85))
+        super().__init__(**kwargs)
+        self.log_path = log_path
+        self.page_lines = page_lines
+        self.reader = None
+        self.current_page = 0
+
+        box = BoxLayout(orientation="vertical", spacing=4)
+
+        top = BoxLayout(size_hint_y=None, height=32, spacing=4)
+        files = [log_path.name] + [p.name for p in sorted(log_path.parent.glob(log_path.name + ".*"))]
+        self.file_spinner = Spinner(text=log_path.name, values=files, size_hint_x=0.3)
+        self.file_spinner.bind(text=lambda *_: self._open(log_path.with_name(self.file_spinner.text)))
+        refresh_btn = Button(text="Actualiser", size_hint_x=None, width=100)
+        refresh_btn.bind(on_release=lambda *_: self._refresh())
+        self.page_label = Label(text="", size_hint_x=0.4)
+        top.add_widget(self.file_spinner)
+        top.add_widget(self.page_label)
+        top.add_widget(refresh_btn)
+        box.add_widget(top)
+
+        self.rv = RecycleView(viewclass="ConsoleLine", bar_width=8, do_scroll_x=False)
+        layout = RecycleBoxLayout(orientation="vertical", default_size=(None, 18),
+                                  default_size_hint=(1, None), size_hint_y=None, padding=(6, 4))
+        layout.bind(minimum_height=layout.setter("height"))
+        self.rv.add_widget(layout)
+        box.add_widget(self.rv)
+
+        nav = BoxLayout(size_hint_y=None, height=32, spacing=4)
+        for text, step in (("<<", None), ("<", -1), (">", 1), (">>", None)):
+            btn = Button(text=text, size_hint_x=None, width=48)
+            if step is None:
+                btn.bind(on_release=lambda _, first=(text == "<<"): self.show_page(0 if first else -1))
+            else:
+                btn.bind(on_release=lambda _, s=step: self.show_page(self.current_page + s))
+            nav.add_widget(btn)
+        # Position dans le fichier : la page n'est lue qu'au relâchement du curseur
+        self.slider = Slider(min=0, max=1, step=1, value=0)
+        self.slider.bind(on_touch_up=self._on_slider_release)
+        nav.add_widget(self.slider)
+        close_btn = Button(text="Fermer", size_hint_x=None, width=90)
+        close_btn.bind(on_release=lambda *_: self.dismiss())
+        nav.add_widget(close_btn)
+        box.add_widget(nav)
+
+        self.content = box
+        self._open(log_path)
+
+    def _open(self, path):
+        self.reader = LogFileReader(path, page_lines=self.page_lines)
+        self.show_page(-1)
+
+    def _refresh(self):
+        at_end = self.current_page >= self.reader.num_pages - 1
+        self.reader.refresh()
+        self.show_page(-1 if at_end else self.current_page)
+
+    def _on_slider_release(self, slider, touch):
+        if slider.collide_point(*touch.pos) and int(slider.value) != self.current_page:
+            self.show_page(int(slider.value))
+
+    def show_page(self, index):
+        count = max(self.reader.num_pages, 1)
+        if index < 0:
+            index += count
+        index = min(max(index, 0), count - 1)
+        self.current_page = index
+        self.rv.data = [{"text": line, "markup": False, "color": (1, 1, 1, 1)} for line in self.reader.page(index)]
+        self.rv.scroll_y = 1
+        self.page_label.text = f"Page {index + 1} / {count}"
+        self.slider.max = max(count - 1, 1)
+        self.slider.value = index
@@ -0,0 +1,52 @@
+from kivy.uix.actionbar import ActionButton
+
+
+class CacheTools:
+    """Commandes du menu Fichier pour consulter et vider les caches du projet (.bam, modèles, scripts compilés)."""
+
+    def __init__(self, editor_app):
+        self.editor_app = editor_app
+        self.bam_cache = editor_app.bam_cache
+        self.model_cache = editor_app.model_cache
+        self.file_group = editor_app.menu.file_group
+
+        self.status_btn = ActionButton(text='Cache status')
+        self.clear_btn = ActionButton(text='Clear cache')
+        self.file_group.add_widget(self.status_btn)
+        self.file_group.add_widget(self.clear_btn)
+
+    def connect_events(self):
+        self.status_btn.bind(on_release=self.print_status)
+        self.clear_btn.bind(on_release=self.clear_cache)
+
+    def print_status(self, *args):
+        """Affiche l'état du cache .bam et du cache de modèles dans la console."""
+        status = self.bam_cache.status()
+        models = self.model_cache.stats()
+        print(f"[INFO] Cache bam : {status['files']} fichier(s), {status['bytes'] / 1024:.1f} Ko dans {status['dir']}")
+        print(f"[INFO] Cache bam : {status['hits']} lecture(s) .bam, {status['misses']} conversion(s) .egg")
+        print(f"[INFO] Cache modèles : {models['templates']} gabarit(s), "
+              f"{models['hits']} réutilisés, {models['misses']} chargés")
+        code_cache = self._code_cache()
+        if code_cache is not None:
+            scripts = code_cache.status()
+            print(f"[INFO] Cache scripts : {scripts['files']} fichier(s), "
+                  f"{scripts['hits']} réutilisé(s), {scripts['misses']} compilé(s)")
+
+    def _code_cache(self):
+        scripting = getattr(self.editor_app, "scripting", None)
+        return scripting.code_cache if scripting is not None else None
+
+    def clear_cache(self, *args):
+        """Supprime les .bam convertis, les gabarits et les scripts compilés ; ils seront régénérés au besoin."""
+        status = self.bam_cache.status()
+        self.bam_cache.clear()
+        print(f"[INFO] Cache bam vidé : {status['files']} fichier(s) supprimé(s) dans {status['dir']}")
+        # Sinon les gabarits déjà en mémoire resteraient ceux lus avant le vidage
+        templates = self.model_cache.stats()["templates"]
+        self.model_cache.clear()
+        print(f"[INFO] Cache modèles vidé : {templates} gabarit(s) oublié(s)")
+        code_cache = self._code_cache()
+        if code_cache is not None:
+            removed = code_cache.clear()
+            print(f"[INFO] Cache scripts vidé : {removed} fichier(s) supprimé(s)")
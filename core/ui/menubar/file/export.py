@@ -12,6 +12,58 @@ import re
 from typing import List
 from panda3d.core import AmbientLight, DirectionalLight, PointLight, Spotlight, Vec4
 from panda3d.core import PerspectiveLens
+from core.scene.bam_export import export_bam
+from core.scene.overrides import compute_overrides, is_model_root
+from core.scene.visitor import FunctionConsumer, LightCollector
+
+# Chargeur généré par l'export "table" : chaque modèle n'est chargé qu'une fois
+# puis copié (copyTo, Geoms partagés) pour chacun de ses placements : chaque copie
+# a ses propres nodes, que les OVERRIDES peuvent déplacer indépendamment.
+_TABLE_LOADER = '''
+MODEL_DIR = Path(__file__).resolve().parent
+LIGHT_TYPES = {'AmbientLight': AmbientLight, 'DirectionalLight': DirectionalLight, 'PointLight': PointLight, 'Spotlight': Spotlight}
+
+
+def _find(root, path):
+    """Retrouve un node interne d'un modèle ; 'nom[i]' = i-ème homonyme."""
+    for segment in path.split('/'):
+        name, rank = segment, 0
+        if segment.endswith(']') and '[' in segment:
+            head, _, tail = segment[:-1].rpartition('[')
+            if tail.isdigit():
+                name, rank = head, int(tail)
+        matches = [child for child in root.getChildren() if child.getName() == name]
+        if len(matches) <= rank:
+            return None
+        root = matches[rank]
+    return root
+
+
+def load_scene(parent, loader=None):
+    if loader is None:
+        import builtins
+        loader = builtins.loader
+    templates = [loader.loadModel(Filename.fromOsSpecific(str(MODEL_DIR / path))) for path in MODELS]
+    nodes = []
+    for name, parent_idx, model_idx, pos, hpr, scale in NODES:
+        np = (parent if parent_idx < 0 else nodes[parent_idx]).attachNewNode(name)
+        if model_idx >= 0:
+            templates[model_idx].copyTo(np)
+        np.setPosHprScale(*pos, *hpr, *scale)
+        nodes.append(np)
+    for node_idx, path, pos, hpr, scale in OVERRIDES:
+        part = _find(nodes[node_idx], path)
+        if part is not None:
+            part.setPosHprScale(*pos, *hpr, *scale)
+    for kind, name, color, pos, hpr in LIGHTS:
+        light = LIGHT_TYPES[kind](name)
+        light.setColor(Vec4(*color))
+        light_np = parent.attachNewNode(light)
+        light_np.setPos(*pos)
+        light_np.setHpr(*hpr)
+        parent.setLight(light_np)
+    return nodes
+'''
 
 class Export:
     """
@@ -28,17 +80,28 @@ class Export:
         # --- Boutons dans le menu Fichier ---
         self.export_btn = ActionButton(text="To python")
         self.file_group.add_widget(self.export_btn)
+        self.export_bam_btn = ActionButton(text="To bam")
+        self.file_group.add_widget(self.export_bam_btn)
 
     def connect_events(self):
         self.export_btn.bind(on_release=self.export_scene)
+        self.export_bam_btn.bind(on_release=self.export_bam_scene)
         #self.export_standalone_btn.bind(on_release=lambda x: self.export_scene(x, standalone=True))
 
-    def serialize_lights(self) -> List[str]:
-        """Retourne les lignes Python pour recréer les lumières dans la scène."""
+    def serialize_lights(self, lights=None) -> List[str]:
+        """
+        Retourne les lignes Python pour recréer les lumières dans la scène.
+        `lights` : visites relevées par un LightCollector (sinon le graphe est parcouru ici).
+        """
+        if lights is None:
+            collector = LightCollector()
+            self.editor_app.scene_walker.walk(self.panda.render.get_children(), collector)
+            lights = collector.lights
         lines = []
-        for light_np in self.panda.render.find_all_matches("**/+Light"):
-            light = light_np.node()
-            name = light_np.get_name()
+        for visit in lights:
+            light_np = visit.node
+            light = visit.obj
+            name = visit.name
             pos = light_np.get_pos()
             hpr = light_np.get_hpr()
             color = light.get_color()
@@ -78,7 +141,7 @@ class Export:
             standalone (bool): Si True, exporte une version standalone avec ShowBase"""
         box = BoxLayout(orientation="vertical", spacing=5)
 
-        chooser = FileChooserListView(filters=["*.py"], path=str(Path.cwd()))
+        chooser = FileChooserListView(filters=["*.py"], path=str(Path.cwd()), file_system=self.editor_app.asset_fs)
         box.add_widget(chooser)
 
         # Text input to allow typing a filename directly
@@ -95,6 +158,14 @@ class Export:
         opt_box.add_widget(include_showbase_cb)
         box.add_widget(opt_box)
 
+        # --- Option table de données (code généré compact) ---
+        table_box = BoxLayout(orientation="horizontal", size_hint_y=None, height=40, padding=10)
+        table_label = Label(text="Table de données (modèles chargés une fois) :", size_hint_x=0.7)
+        table_cb = CheckBox(active=True)
+        table_box.add_widget(table_label)
+        table_box.add_widget(table_cb)
+        box.add_widget(table_box)
+
         # --- Boutons ---
         btn_box = BoxLayout(size_hint_y=None, height=40, spacing=10, padding=5)
         export_btn = Button(text="Exporter", background_color=(0.2, 0.5, 0.3, 1))
@@ -116,12 +187,179 @@ class Export:
             if not path.suffix == ".py":
                 path = path.with_suffix(".py")
             include_showbase = include_showbase_cb.active
-            self._write_py_scene(path, include_showbase)
+            if table_cb.active:
+                self._write_py_table_scene(path, include_showbase)
+            else:
+                self._write_py_scene(path, include_showbase)
+            popup.dismiss()
+
+        export_btn.bind(on_release=do_export)
+        cancel_btn.bind(on_release=lambda *_: popup.dismiss())
+
+    # -----------------------------------------------------------------------
+    def _write_py_table_scene(self, path: Path, include_showbase: bool):
+        """
+        Génère un fichier Python décrivant la scène sous forme de tables (modèles
+        uniques, index de parent, transforms) lues par un petit chargeur générique :
+        la taille du code et le temps d'import restent quasi constants par node.
+        """
+        print(f"[Export] Exportation (table) vers {path} (ShowBase inclus: {include_showbase})")
+
+        def vec(values):
+            return tuple(round(float(v), 4) for v in values)
+
+        models = []       # chemins uniques, relatifs au fichier exporté
+        model_index = {}
+        nodes = []        # (nom, parent, modèle, pos, hpr, scale)
+        overrides = []    # (node, chemin interne, pos, hpr, scale)
+        lights = []       # (type, nom, couleur, pos, hpr)
+
+        parents = [-1]
+
+        def enter(visit):
+            node = visit.node
+            node_name = visit.name
+            # Ignorer nodes techniques (les lumières sont relevées par le LightCollector)
+            if visit.is_light or node_name.lower() in {"camera", "light", "directionallight", "cam", "lines"}:
+                return False
+            parent_idx = parents[-1]
+            # Modèle chargé sous un conteneur fichier : recréé par le chargeur
+            if parent_idx >= 0 and nodes[parent_idx][2] >= 0 and is_model_root(node):
+                return False
+
+            model_idx = -1
+            file_info = visit.file_info
+            if visit.kind == "model":
+                target_path = Path(file_info["path"])
+                try:
+                    model_path = Path(os.path.relpath(target_path, Path(path).resolve().parent)).as_posix()
+                except ValueError:
+                    model_path = target_path.as_posix()
+                if model_path not in model_index:
+                    model_index[model_path] = len(models)
+                    models.append(model_path)
+                model_idx = model_index[model_path]
+
+            idx = len(nodes)
+            nodes.append((node_name, parent_idx, model_idx,
+                          vec(node.get_pos()), vec(node.get_hpr()), vec(node.get_scale())))
+
+            if model_idx >= 0:
+                # Seules les parties modifiées du modèle sont exportées
+                try:
+                    template = self.editor_app.model_cache.get_template(file_info["path"])
+                    for part_path, t in sorted(compute_overrides(node, template).items()):
+                        overrides.append((idx, part_path, vec(t["pos"]), vec(t["hpr"]), vec(t["scale"])))
+                except Exception as e:
+                    print(f"[WARN] {node_name} : modèle source indisponible ({e})")
+            parents.append(idx)
+            return True
+
+        light_collector = LightCollector()
+        self.editor_app.scene_walker.walk(self.panda.render.get_children(),
+                                          FunctionConsumer(enter, lambda visit: parents.pop()),
+                                          light_collector)
+        for visit in light_collector.lights:
+            lights.append((visit.light_kind, visit.name, vec(visit.obj.get_color()),
+                           vec(visit.node.get_pos(self.panda.render)), vec(visit.node.get_hpr(self.panda.render))))
+
+        lines = [
+            "# --- Scene exportée depuis Panda3D Editor (table de données) ---",
+            "from pathlib import Path",
+            "from panda3d.core import *",
+            "",
+            "MODELS = [",
+        ]
+        lines.extend(f"    {model!r}," for model in models)
+        lines.append("]")
+        lines.append("# (nom, parent, modèle, pos, hpr, scale) ; parent -1 = racine, modèle -1 = node vide")
+        lines.append("NODES = [")
+        lines.extend(f"    {row!r}," for row in nodes)
+        lines.append("]")
+        lines.append("# (node, chemin dans le modèle, pos, hpr, scale)")
+        lines.append("OVERRIDES = [")
+        lines.extend(f"    {row!r}," for row in overrides)
+        lines.append("]")
+        lines.append("# (type, nom, couleur, pos, hpr)")
+        lines.append("LIGHTS = [")
+        lines.extend(f"    {row!r}," for row in lights)
+        lines.append("]")
+        lines.append(_TABLE_LOADER)
+
+        if include_showbase:
+            lines.append("from direct.showbase.ShowBase import ShowBase\n")
+            lines.append("class ExportedScene(ShowBase):")
+            lines.append("    def __init__(self):")
+            lines.append("        super().__init__()")
+            lines.append("        load_scene(self.render, self.loader)")
+            lines.append("\nif __name__ == '__main__':")
+            lines.append("    app = ExportedScene()")
+            lines.append("    app.run()")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        print(f"[INFO] {len(nodes)} nodes, {len(models)} modèle(s) unique(s), {len(lights)} light(s)")
+        print(f"[SUCCÈS] Scène exportée vers {path}")
+
+    # -----------------------------------------------------------------------
+    def export_bam_scene(self, *args):
+        """Popup pour exporter la scène en .bam (chargement rapide au lancement du jeu)"""
+        box = BoxLayout(orientation="vertical", spacing=5)
+
+        chooser = FileChooserListView(filters=["*.bam"], path=str(Path.cwd()), file_system=self.editor_app.asset_fs)
+        box.add_widget(chooser)
+
+        name_box = BoxLayout(size_hint_y=None, height=40)
+        name_input = TextInput(hint_text='Nom du fichier (optionnel)', multiline=False)
+        name_box.add_widget(name_input)
+        box.add_widget(name_box)
+
+        # --- Option aplatissement ---
+        opt_box = BoxLayout(orientation="horizontal", size_hint_y=None, height=40, padding=10)
+        opt_label = Label(text="Aplatir les nodes 'static' :", size_hint_x=0.7)
+        flatten_cb = CheckBox(active=True)
+        opt_box.add_widget(opt_label)
+        opt_box.add_widget(flatten_cb)
+        box.add_widget(opt_box)
+
+        btn_box = BoxLayout(size_hint_y=None, height=40, spacing=10, padding=5)
+        export_btn = Button(text="Exporter", background_color=(0.2, 0.5, 0.3, 1))
+        cancel_btn = Button(text="Annuler", background_color=(0.3, 0.3, 0.3, 1))
+        btn_box.add_widget(export_btn)
+        btn_box.add_widget(cancel_btn)
+        box.add_widget(btn_box)
+
+        popup = Popup(title="Exporter la scène en .bam", content=box, size_hint=(0.9, 0.9))
+        popup.open()
+
+        def do_export(*_):
+            typed = name_input.text.strip() if name_input else ''
+            if typed:
+                path = Path(chooser.path) / typed
+            else:
+                path = Path(chooser.selection[0]) if chooser.selection else Path(chooser.path) / "scene_export.bam"
+            if not path.suffix == ".bam":
+                path = path.with_suffix(".bam")
+            self._write_bam_scene(path, flatten_cb.active)
             popup.dismiss()
 
         export_btn.bind(on_release=do_export)
         cancel_btn.bind(on_release=lambda *_: popup.dismiss())
 
+    def _write_bam_scene(self, path: Path, flatten: bool):
+        """Écrit la scène dans un .bam, en aplatissant les nodes marqués 'static'."""
+        print(f"[Export] Exportation vers {path} (aplatissement: {flatten})")
+        try:
+            report = export_bam(self.panda.render, path, flatten=flatten)
+        except Exception as e:
+            print(f"[ERREUR] Export .bam impossible : {e}")
+            return
+        before, after = report["before"], report["after"]
+        print(f"[INFO] {report['flattened']} sous-arbre(s) static aplati(s)")
+        print(f"[INFO] Nodes : {before['nodes']} -> {after['nodes']}, Geoms : {before['geoms']} -> {after['geoms']}")
+        print(f"[SUCCÈS] Scène exportée vers {path}")
+
     # -----------------------------------------------------------------------
     from pathlib import Path
     import re
@@ -137,9 +375,10 @@ class Export:
                 name = "_" + name
             return name
 
-        def serialize_node(node, parent_var: str, level: int = 0):
-            """Retourne une liste de lignes Python avec indentation correcte"""
-            node_name = node.get_name()
+        def serialize_node(visit, parent_var: str, level: int = 0):
+            """Retourne les lignes Python du node (sans ses enfants) avec indentation correcte"""
+            node = visit.node
+            node_name = visit.name
             safe_name = sanitize_name(node_name)
             
             # Ignorer nodes techniques
@@ -149,10 +388,10 @@ class Export:
             indent = " " * (level * 4)
             lines = []
             
-            # Vérifier si le nœud est dans self.models
-            model_info = self.models.get(node_name)
+            # Entrée de self.models (lue une seule fois par la visite)
+            model_info = visit.model
             
-            if model_info is not None and isinstance(model_info, dict):
+            if model_info is not None:
                 if "file" in model_info and isinstance(model_info["file"], dict) and "path" in model_info["file"]:
                     # C'est un modèle chargé, on utilise loadModel
                     target_path = Path(model_info["file"]["path"])
@@ -235,11 +474,6 @@ class Export:
                 lines.append(f"{indent}{safe_name}.setHpr({hpr[0]:.3f}, {hpr[1]:.3f}, {hpr[2]:.3f})")
                 lines.append(f"{indent}{safe_name}.setScale({scale[0]:.3f}, {scale[1]:.3f}, {scale[2]:.3f})")
 
-            # Enfants récursifs
-            for child in node.get_children(): 
-                child_lines = serialize_node(child, safe_name, level + 1)
-                lines.extend(child_lines)
-
             return lines
 
 
@@ -266,11 +500,24 @@ class Export:
             lines.append("def load_scene(parent):")
             base_level = 1  # 1 niveau = 4 espaces
 
-        # Sérialisation de tous les enfants de render
-        for node in self.panda.render.get_children():
-            lines.extend(serialize_node(node, "parent", base_level))
+        # Sérialisation de tous les enfants de render : un seul parcours pour les nodes et les lumières
+        parents = [("parent", base_level - 1)]  # (variable parente, niveau d'indentation)
+
+        def enter(visit):
+            parent_var, parent_level = parents[-1]
+            node_lines = serialize_node(visit, parent_var, parent_level + 1)
+            if not node_lines:
+                return False  # node ignoré : ses enfants aussi
+            lines.extend(node_lines)
+            parents.append((sanitize_name(visit.name), parent_level + 1))
+            return True
+
+        light_collector = LightCollector()
+        self.editor_app.scene_walker.walk(self.panda.render.get_children(),
+                                          FunctionConsumer(enter, lambda visit: parents.pop()),
+                                          light_collector)
 
-        light_lines = self.serialize_lights()
+        light_lines = self.serialize_lights(light_collector.lights)
         lines.extend(light_lines)
 
         # Fin de fichier
@@ -3,10 +3,142 @@ from kivy.uix.button import Button
 from kivy.uix.filechooser import FileChooserListView
 from pathlib import Path
 from kivy.uix.popup import Popup
-from panda3d.core import Filename
+from panda3d.core import Filename, NodePath
 import json
+import time
 from kivy.uix.actionbar import ActionButton
+from kivy.uix.checkbox import CheckBox
+from kivy.uix.label import Label
+from kivy.uix.progressbar import ProgressBar
 from kivy.clock import Clock
+from core.scene.node_index import NodeIndex
+from core.scene.overrides import apply_overrides
+from core.scene.scene_format import BINARY_SUFFIX, SceneFormatError, read_scene
+from core.scene.change_tracker import apply_journal, read_journal
+from core.scene.bam_export import MOBILITY_TAG
+from core.editor_log import get_logger
+
+log = get_logger("scene")
+
+
+class ProgressiveSceneLoad:
+    """
+    Chargement non bloquant d'une scène : les modèles sont demandés au loader
+    asynchrone de Panda3D, puis les nodes sont attachés par paquets depuis une
+    task, sans dépasser `frame_budget` secondes par frame.
+    """
+
+    def __init__(self, open_scene, data, path, frame_budget=0.008):
+        self.open_scene = open_scene
+        self.panda = open_scene.panda
+        self.path = path
+        self.frame_budget = frame_budget
+        self.node_index = NodeIndex()
+        self.cancelled = False
+        self.finished = False
+
+        # Arbre JSON aplati (pré-ordre) : les parents précèdent toujours leurs enfants
+        self.flat = []
+        stack = [(node_data, -1) for node_data in reversed(data)]
+        while stack:
+            json_node, parent_idx = stack.pop()
+            idx = len(self.flat)
+            self.flat.append((json_node, parent_idx))
+            for child_data in reversed(json_node.get("childs", [])):
+                stack.append((child_data, idx))
+        self.nodes = []  # NodePath créé pour chaque entrée de self.flat
+        self._last_percent = -1
+
+        # Modèles uniques à précharger
+        model_paths = []
+        for json_node, _ in self.flat:
+            file_info = json_node.get("file")
+            if file_info and file_info.get("path") and file_info["path"] not in model_paths:
+                model_paths.append(file_info["path"])
+        self.models_total = len(model_paths)
+        self.models_done = 0
+        self._requests = []
+        self._build_popup()
+        for model_path in model_paths:
+            request = self.open_scene.editor_app.model_cache.request_template(model_path, self._on_model_loaded)
+            if request is not None:
+                self._requests.append(request)
+
+        self.task = self.panda.taskMgr.add(self._step, "progressive_scene_load")
+
+    def _build_popup(self):
+        box = BoxLayout(orientation='vertical', spacing=6, padding=6)
+        self.status_label = Label(text=f"Chargement de {self.path.name}...")
+        self.progress_bar = ProgressBar(max=100, value=0, size_hint_y=None, height=24)
+        cancel_btn = Button(text="Cancel", size_hint_y=None, height=36, background_color=(0.3, 0.3, 0.3, 1))
+        cancel_btn.bind(on_release=lambda *_: self.cancel())
+        box.add_widget(self.status_label)
+        box.add_widget(self.progress_bar)
+        box.add_widget(cancel_btn)
+        self.popup = Popup(title="Loading scene", content=box, size_hint=(0.4, 0.25), auto_dismiss=False)
+        self.popup.open()
+
+    def _on_model_loaded(self, model):
+        self.models_done += 1
+        if model is None:
+            log.warning("Un modèle de la scène n'a pas pu être préchargé.")
+
+    def _report(self, percent, text):
+        self.progress_bar.value = percent
+        self.status_label.text = text
+        # Console : une ligne par tranche de 10 %
+        if percent // 10 != self._last_percent // 10:
+            log.info("%s", text)
+        self._last_percent = percent
+
+    def _step(self, task):
+        if self.cancelled:
+            return task.done
+
+        # Phase 1 : attendre les modèles demandés au loader asynchrone
+        if self.models_done < self.models_total:
+            self.status_label.text = f"Modèles : {self.models_done}/{self.models_total}"
+            return task.cont
+
+        # Phase 2 : attacher les nodes par paquets, dans le budget de la frame
+        total = len(self.flat)
+        deadline = time.perf_counter() + self.frame_budget
+        while len(self.nodes) < total and time.perf_counter() < deadline:
+            json_node, parent_idx = self.flat[len(self.nodes)]
+            parent_np = self.panda.render if parent_idx < 0 else self.nodes[parent_idx]
+            self.nodes.append(self.open_scene._merge_node(json_node, parent_np, self.node_index))
+
+        done = len(self.nodes)
+        percent = int(done * 100 / total) if total else 100
+        self._report(percent, f"Chargement de la scène : {percent}% ({done}/{total} nodes)")
+        if done < total:
+            return task.cont
+
+        self.finished = True
+        self.popup.dismiss()
+        self.open_scene._finish_loading(self.path)
+        return task.done
+
+    def cancel(self):
+        """Interrompt le chargement et retire ce qui a déjà été attaché."""
+        if self.finished or self.cancelled:
+            return
+        self.cancelled = True
+        for request in self._requests:
+            try:
+                self.panda.loader.cancelRequest(request)
+            except Exception:
+                pass
+        self.panda.taskMgr.remove(self.task)
+        for (json_node, parent_idx), np in zip(self.flat, self.nodes):
+            if parent_idx < 0 and not np.is_empty():
+                np.remove_node()
+        self.open_scene.models.clear()
+        self.open_scene.editor_app.changes.reset()
+        self.popup.dismiss()
+        log.warning("Chargement annulé : %s", self.path.name)
+        self.open_scene._refresh_panels()
+
 
 class OpenScene:
     def __init__(self, editor_app):
@@ -19,16 +151,26 @@ class OpenScene:
         self.file_group = self.editor_app.menu.file_group
         self.open_btn = ActionButton(text='Open')
         self.file_group.add_widget(self.open_btn)
+        self.loading_job = None  # chargement progressif en cours
+        self._cache_stats = None  # compteurs du cache de modèles au début du chargement
 
     def connect_events(self):
         self.open_btn.bind(on_release=self.open_scene)
 
     def open_scene(self, *args):
-        """Ouvre un fichier .json et recharge la scène"""
+        """Ouvre un fichier .json (ou .p3ds binaire) et recharge la scène"""
         box = BoxLayout(orientation='vertical')
-        chooser = FileChooserListView(filters=["*.json"], path=str(Path.cwd()))
+        chooser = FileChooserListView(filters=["*.json", f"*{BINARY_SUFFIX}"], path=str(Path.cwd()),
+                                      file_system=self.editor_app.asset_fs)
         box.add_widget(chooser)
 
+        # Option : chargement progressif (non bloquant)
+        opt_box = BoxLayout(size_hint_y=None, height=30)
+        progressive_cb = CheckBox(active=True)
+        opt_box.add_widget(Label(text='Progressive loading', size_hint_x=0.8))
+        opt_box.add_widget(progressive_cb)
+        box.add_widget(opt_box)
+
         btn_box = BoxLayout(size_hint_y=None, height=40)
         load_btn = Button(text="Load", background_color=(0.2, 0.5, 0.3, 1))
         cancel_btn = Button(text="Cancel", background_color=(0.3, 0.3, 0.3, 1))
@@ -42,39 +184,82 @@ class OpenScene:
         def do_load(*args):
             if chooser.selection:
                 path = Path(chooser.selection[0])
-                self.load_scene_from_file(path)
-                self.current_scene_file = path
                 popup.dismiss()
+                self.load_scene_from_file(path, progressive=progressive_cb.active)
+                self.current_scene_file = path
+                self.editor_app.current_scene_file = path
 
         load_btn.bind(on_release=do_load)
         cancel_btn.bind(on_release=lambda *_: popup.dismiss())
 
-    def load_scene_from_file(self, path):
-        """Charge une scène JSON sans remplacer les noms de collections internes par le nom du fichier."""
-        import json
-        from pathlib import Path
-        from panda3d.core import Filename, NodePath
-
+    def load_scene_from_file(self, path, progressive=False):
+        """
+        Charge une scène (JSON ou binaire .p3ds) sans remplacer les noms de collections internes par le nom du fichier.
+        progressive=True rend la main immédiatement : la scène est construite par
+        paquets au fil des frames (voir ProgressiveSceneLoad).
+        """
         path = Path(path)
         if not path.exists():
-            print(f"[ERREUR] Fichier introuvable : {path}")
+            log.error("Fichier introuvable : %s", path)
             return
 
-        # --- Lecture du JSON ---
-        with open(path, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"[ERREUR] JSON invalide : {e}")
-                return
+        # --- Lecture du fichier de scène ---
+        try:
+            data = read_scene(path)
+        except SceneFormatError as e:
+            log.error("Scène invalide : %s", e)
+            return
+
+        # --- Rejouer les sauvegardes incrémentales du journal ---
+        try:
+            records = read_journal(path)
+        except ValueError as e:
+            log.warning("Journal illisible, ignoré : %s", e)
+            records = []
+        if records:
+            skipped = apply_journal(data, records)
+            log.info("Journal : %d modification(s) rejouée(s), %d ignorée(s)", len(records) - skipped, skipped)
+
+        if self.loading_job is not None:
+            self.loading_job.cancel()
+            self.loading_job = None
+
+        self._clear_scene()
+        self._cache_stats = self.editor_app.model_cache.stats()
+        log.info("Chargement de la scène : %s", path.name)
+        self.editor_app.set_ambient_light()
 
+        if progressive:
+            self.loading_job = ProgressiveSceneLoad(self, data, path)
+            return
+
+        # Index nom -> enfants directs, construit une fois par conteneur
+        node_index = NodeIndex()
+
+        def merge_node(json_node, parent_np):
+            """Fusionne récursivement un node JSON dans la scène Panda3D."""
+            np = self._merge_node(json_node, parent_np, node_index)
+
+            # --- Charger les enfants récursivement ---
+            for child_data in json_node.get("childs", []):
+                merge_node(child_data, np)
+
+            return np
+
+        # --- Fusion de toutes les racines ---
+        for node_data in data:
+            merge_node(node_data, self.panda.render)
+
+        self._finish_loading(path)
+
+    def _clear_scene(self):
         # --- Supprimer tous les anciens modèles de la scène ---
-        print("[INFO] Nettoyage de la scène actuelle...")
+        log.info("Nettoyage de la scène actuelle...")
         for name, info in list(self.models.items()):
             np = info.get("node")
             if np and not np.is_empty():
                 np.remove_node()
-                print(f"  - Supprimé : {name}")
+                log.debug("  - Supprimé : %s", name)
         self.models.clear()
 
         # --- Supprimer les enfants de render pour repartir d'une scène vide ---
@@ -83,75 +268,82 @@ class OpenScene:
                 pass
             else:
                 child.remove_node()
-        print("[INFO] Scène Panda3D vidée.")
-        print(f"[INFO] Chargement de la scène : {path.name}")
-        self.editor_app.set_ambient_light()
+        log.info("Scène Panda3D vidée.")
 
-        def merge_node(json_node, parent_np):
-            """Fusionne récursivement un node JSON dans la scène Panda3D."""
-            name = json_node.get("name", "Unnamed")
-            node_type = json_node.get("type", "group")
-            transform = json_node.get("transform", {})
+    def _merge_node(self, json_node, parent_np, node_index):
+        """Fusionne un node JSON (sans ses enfants) sous `parent_np` et retourne son NodePath."""
+        name = json_node.get("name", "Unnamed")
+        node_type = json_node.get("type", "group")
+        transform = json_node.get("transform", {})
 
-            pos = transform.get("pos", [0, 0, 0])
-            hpr = transform.get("hpr", [0, 0, 0])
-            scale = transform.get("scale", [1, 1, 1])
+        pos = transform.get("pos", [0, 0, 0])
+        hpr = transform.get("hpr", [0, 0, 0])
+        scale = transform.get("scale", [1, 1, 1])
 
-            file_info = json_node.get("file")
-            model_path = None
-            if file_info and file_info.get("path"):
-                model_path = Filename.from_os_specific(file_info["path"]).get_fullpath()
-
-            # --- Vérifie si un node du même nom existe déjà ---
-            existing_np = parent_np.find(f"**/{name}")
-            if not existing_np.is_empty():
-                np = existing_np
-            else:
-                # --- Charger un modèle si un chemin est défini ---
-                if model_path:
-                    try:
-                        model = self.panda.loader.loadModel(model_path)
-                        container = NodePath(name)
-                        container.reparent_to(parent_np)
-                        model.reparent_to(container)
-                        np = container
-                        print(f"[CHARGÉ] Modèle 3D importé : {file_info['path']}")
-                    except Exception as e:
-                        print(f"[ERREUR] Impossible de charger {model_path}: {e}")
-                        np = parent_np.attach_new_node(name)
-                else:
-                    # --- Node vide (collection ou group) ---
+        file_info = json_node.get("file")
+        model_path = file_info.get("path") if file_info else None
+
+        # --- Vérifie si un enfant direct du même nom existe déjà ---
+        existing_np = node_index.resolve(parent_np, name)
+        if existing_np is not None:
+            np = existing_np
+        else:
+            # --- Charger un modèle si un chemin est défini ---
+            if model_path:
+                try:
+                    container = NodePath(name)
+                    self.editor_app.model_cache.instantiate(model_path, container)
+                    container.reparent_to(parent_np)
+                    np = container
+                    log.debug("Modèle 3D importé : %s", model_path)
+                except Exception as e:
+                    log.error("Impossible de charger %s: %s", model_path, e)
                     np = parent_np.attach_new_node(name)
+            else:
+                # --- Node vide (collection ou group) ---
+                np = parent_np.attach_new_node(name)
 
-            # --- Appliquer les transformations du JSON ---
-            np.set_pos(*pos)
-            np.set_hpr(*hpr)
-            np.set_scale(*scale)
-
-            # --- Enregistrer le node ---
-            self.models[name] = {
-                "node": np,
-                "type": node_type,
-                "file": file_info,
-                "pos": pos,
-                "hpr": hpr,
-                "scale": scale,
-            }
+        # --- Appliquer les transformations du JSON ---
+        np.set_pos(*pos)
+        np.set_hpr(*hpr)
+        np.set_scale(*scale)
 
-            # --- Charger les enfants récursivement ---
-            for child_data in json_node.get("childs", []):
-                merge_node(child_data, np)
+        # --- Mobilité pour l'export .bam ---
+        if json_node.get("mobility"):
+            np.set_tag(MOBILITY_TAG, json_node["mobility"])
 
-            return np
+        # --- Modifications des nodes internes d'un modèle adossé à un fichier ---
+        overrides = json_node.get("overrides")
+        if overrides:
+            missing = apply_overrides(np, overrides)
+            if missing:
+                log.warning("%s : %d node(s) modifié(s) introuvable(s) dans %s", name, missing, model_path)
 
-        # --- Fusion de toutes les racines ---
-        for node_data in data:
-            merge_node(node_data, self.panda.render)
+        # --- Enregistrer le node ---
+        self.models[name] = {
+            "node": np,
+            "type": node_type,
+            "file": file_info,
+            "pos": pos,
+            "hpr": hpr,
+            "scale": scale,
+        }
+        return np
 
+    def _refresh_panels(self):
         # --- Rafraîchir les panneaux ---
         if hasattr(self, "sidebar"):
-            self.sidebar.refresh_hierarchy()
+            self.editor_app.refresh_scheduler.invalidate("hierarchy", full=True)  # scène entièrement remplacée
         if hasattr(self, "properties_sidebar"):
             self.properties_sidebar.set_node(None)
 
-        print(f"[SUCCÈS] Scène chargée : {path.name}")
\ No newline at end of file
+    def _finish_loading(self, path):
+        self.loading_job = None
+        self.editor_app.changes.reset(base_path=path)
+        self._refresh_panels()
+        # Les compteurs du cache sont cumulés : seul ce chargement est compté
+        stats = self.editor_app.model_cache.stats()
+        before = self._cache_stats or {"hits": 0, "misses": 0}
+        log.info("Cache modèles : %d réutilisés, %d chargés",
+                 stats["hits"] - before["hits"], stats["misses"] - before["misses"])
+        log.info("Scène chargée : %s", path.name)
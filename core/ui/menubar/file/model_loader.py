@@ -8,6 +8,9 @@ from kivy.clock import Clock
 from kivy.uix.checkbox import CheckBox
 from kivy.uix.label import Label
 from panda3d.core import Filename, NodePath
+from core.editor_log import get_logger
+
+log = get_logger("loader")
 
 class ModelLoader:
     def __init__(self, editor_app):
@@ -33,7 +36,8 @@ class ModelLoader:
     # ---------------- File chooser ----------------
     def open_file_chooser(self, instance):
         box = BoxLayout(orientation='vertical')
-        chooser = FileChooserListView(filters=["*.egg", "*.bam", "*.gltf", "*.glb", "*.pz"])
+        chooser = FileChooserListView(filters=["*.egg", "*.bam", "*.gltf", "*.glb", "*.pz"],
+                                      file_system=self.editor_app.asset_fs)
         box.add_widget(chooser)
 
         btn_box = BoxLayout(size_hint_y=None, height=40)
@@ -56,17 +60,14 @@ class ModelLoader:
         def load_model(*args):
             if chooser.selection:
                 path = Path(chooser.selection[0])
-                panda_path = Filename.from_os_specific(str(path)).get_fullpath()
                 try:
-                    model = self.panda.loader.loadModel(panda_path)
-
                     # 🌳 Crée un conteneur racine nommé d'après le fichier
                     container_name = path.stem
                     container = NodePath(container_name)
-                    container.reparentTo(self.panda.render)
 
-                    # Reparent le modèle dans le conteneur
-                    model.reparentTo(container)
+                    # Place une copie du modèle (chargé une seule fois) dans le conteneur
+                    self.editor_app.model_cache.instantiate(path, container)
+                    container.reparentTo(self.panda.render)
 
                     # Nom unique si déjà utilisé
                     base_name = container_name
@@ -92,24 +93,26 @@ class ModelLoader:
                         "type": "group"
                     }
 
+                    self.editor_app.changes.mark_added(container)
+
                     # Si l'option est cochée, ajouter une light simple au conteneur
                     if auto_light_cb.active:
                         try:
                             self.editor_app.add_light_to_model(container)
                         except Exception as e:
-                            print(f"[WARN] Impossible d'ajouter une light automatiquement: {e}")
+                            log.warning("Impossible d'ajouter une light automatiquement: %s", e)
 
-                    print(f"[INFO] Modèle importé et ajouté à la scène : {name}")
+                    log.info("Modèle importé et ajouté à la scène : %s", name)
 
                     popup.dismiss()
-                    self.sidebar.refresh_hierarchy()
+                    self.editor_app.refresh_scheduler.invalidate("hierarchy", node=container)
 
                     # Sélection automatique
                     self.sidebar.selected_node = container
                     self.properties_sidebar.set_node(container)
 
                 except Exception as e:
-                    print(f"[ERREUR] Impossible de charger {path}: {e}")
+                    log.error("Impossible de charger %s: %s", path, e)
 
         select_btn.bind(on_release=load_model)
         cancel_btn.bind(on_release=lambda *_: popup.dismiss())
@@ -119,7 +122,8 @@ class ModelLoader:
         # __file__ -> core/ui/menubar/file; parent.parent.parent.parent => core
         base_dir = Path(__file__).parent.parent.parent.parent / 'models'
         box = BoxLayout(orientation='vertical')
-        chooser = FileChooserListView(filters=["*.egg", "*.bam", "*.gltf", "*.glb"], path=str(base_dir))
+        chooser = FileChooserListView(filters=["*.egg", "*.bam", "*.gltf", "*.glb"], path=str(base_dir),
+                                      file_system=self.editor_app.asset_fs)
         box.add_widget(chooser)
 
         btn_box = BoxLayout(size_hint_y=None, height=40)
@@ -135,13 +139,11 @@ class ModelLoader:
         def do_insert(*args):
             if chooser.selection:
                 path = Path(chooser.selection[0])
-                panda_path = Filename.from_os_specific(str(path)).get_fullpath()
                 try:
-                    model = self.panda.loader.loadModel(panda_path)
                     container_name = path.stem
                     container = NodePath(container_name)
+                    self.editor_app.model_cache.instantiate(path, container)
                     container.reparentTo(self.panda.render)
-                    model.reparentTo(container)
 
                     # Nom unique
                     base_name = container_name
@@ -161,14 +163,15 @@ class ModelLoader:
                         "scale": list(container.get_scale()),
                         "type": "group"
                     }
+                    self.editor_app.changes.mark_added(container)
 
                     popup.dismiss()
-                    self.sidebar.refresh_hierarchy()
+                    self.editor_app.refresh_scheduler.invalidate("hierarchy", node=container)
                     self.sidebar.selected_node = container
                     self.properties_sidebar.set_node(container)
-                    print(f"[INFO] Modèle interne inséré : {name}")
+                    log.info("Modèle interne inséré : %s", name)
                 except Exception as e:
-                    print(f"[ERREUR] Impossible d'insérer le modèle interne {path}: {e}")
+                    log.error("Impossible d'insérer le modèle interne %s: %s", path, e)
 
         insert_btn.bind(on_release=do_insert)
         cancel_btn.bind(on_release=lambda *_: popup.dismiss())
\ No newline at end of file
@@ -1,3 +1,4 @@
+import os
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.filechooser import FileChooserListView
@@ -6,8 +7,17 @@ from kivy.uix.popup import Popup
 from kivy.uix.actionbar import ActionButton
 from kivy.clock import Clock
 from kivy.uix.textinput import TextInput
+from core.scene.overrides import compute_overrides, is_model_root
+from core.scene.scene_format import BINARY_SUFFIX, EntryTreeBuilder, JsonStreamWriter, is_binary_path, write_scene
+from core.scene.visitor import EntryConsumer
+from core.scene.change_tracker import append_journal, journal_path
+from core.scene.bam_export import MOBILITY_TAG
 
 class Save:
+    # Le journal est compacté dans la scène de base au-delà de cette taille
+    # (ou de la moitié de la taille de la base)
+    COMPACT_MIN_BYTES = 64 * 1024
+
     def __init__(self, editor_app):
         self.editor_app = editor_app
         self.panda = self.editor_app.panda
@@ -28,15 +38,19 @@ class Save:
 
     def save_scene(self, *args):
         """Sauvegarde sur le fichier courant, sinon demande 'Enregistrer sous'"""
+        # La scène courante peut aussi venir du menu Open
+        self.current_scene_file = self.editor_app.current_scene_file or self.current_scene_file
         if self.current_scene_file:
-            self._write_scene_to_file(self.current_scene_file)
+            if not self._save_changes(self.current_scene_file):
+                self._write_scene_to_file(self.current_scene_file)
         else:
             self.save_scene_as()
 
     def save_scene_as(self, *args):
         """Ouvre un FileChooser pour choisir où sauvegarder la scène"""
         box = BoxLayout(orientation='vertical')
-        chooser = FileChooserListView(filters=["*.json"], path=str(Path.cwd()))
+        chooser = FileChooserListView(filters=["*.json", f"*{BINARY_SUFFIX}"], path=str(Path.cwd()),
+                                      file_system=self.editor_app.asset_fs)
         box.add_widget(chooser)
 
         # Field to type filename directly
@@ -65,74 +79,148 @@ class Save:
             else:
                 filename = chooser.selection[0] if chooser.selection else "scene.json"
             path = folder / filename
-            if not path.suffix == ".json":
+            # .json par défaut, .p3ds pour le format binaire compact
+            if path.suffix not in (".json", BINARY_SUFFIX):
                 path = path.with_suffix(".json")
             self.current_scene_file = path
+            self.editor_app.current_scene_file = path
             self._write_scene_to_file(path)
             popup.dismiss()
 
         save_btn.bind(on_release=do_save)
         cancel_btn.bind(on_release=lambda *_: popup.dismiss())
 
+    def describe_visit(self, visit, parent_entry=None, load_templates=True):
+        """
+        Décrit un node visité pour le fichier de scène (sans ses enfants), ou None
+        s'il est ignoré avec tout son sous-arbre.
+        load_templates=False n'utilise que les gabarits déjà en cache (jamais de
+        chargement) : un conteneur dont le gabarit manque est décrit en entier.
+        """
+        node = visit.node
+        node_name = visit.name
+
+        # 🔹 Ignorer la caméra et les lumières
+        if node_name.lower() in {"camera", "light", "directionallight"}:
+            return None
+
+        # 🔹 Modèle chargé sous un conteneur fichier : rechargé depuis file.path
+        if parent_entry is not None and "overrides" in parent_entry and is_model_root(node):
+            return None
+
+        # 🔹 Infos depuis self.models (lues une seule fois par la visite)
+        model_info = visit.model or {}
+        node_type = model_info.get("type", "group")
+        file_info = visit.file_info
+
+        # 🔹 Vérifier si c’est un conteneur racine (fichier importé)
+        is_container = bool(file_info and node.has_parent() and node.get_parent() == self.panda.render)
+
+        # 🔹 Conteneur adossé à un fichier : le modèle est rechargé depuis file.path,
+        # on ne garde que les transformations modifiées de ses nodes internes
+        overrides = None
+        if file_info and file_info.get("path"):
+            try:
+                model_cache = self.editor_app.model_cache
+                if load_templates:
+                    template = model_cache.get_template(file_info["path"])
+                else:
+                    template = model_cache.cached_template(file_info["path"])
+                if template is not None:
+                    overrides = compute_overrides(node, template)
+            except Exception as e:
+                print(f"[WARN] {node_name} : modèle source indisponible ({e}), sauvegarde complète")
+
+        # 🔹 Construire le dictionnaire (les enfants sont ajoutés par le parcours)
+        entry = {
+            "name": node_name,
+            "type": node_type,
+            "file": file_info,
+            "transform": {
+                "pos": list(node.get_pos()),
+                "hpr": list(node.get_hpr()),
+                "scale": list(node.get_scale())
+            },
+            "is_container": is_container,
+        }
+        if overrides is not None:
+            entry["overrides"] = overrides
+        if node.has_tag(MOBILITY_TAG):
+            entry["mobility"] = node.get_tag(MOBILITY_TAG)
+        return entry
+
+    def scene_consumer(self, writer, load_templates=True):
+        """Consommateur du parcours partagé qui passe les entrées de la scène à `writer`."""
+        if load_templates:
+            return EntryConsumer(self.describe_visit, writer)
+        return EntryConsumer(
+            lambda visit, parent_entry: self.describe_visit(visit, parent_entry, load_templates=False),
+            writer)
+
+    def describe_subtree(self, node):
+        """Entrée complète (avec ses enfants) d'un node, pour le journal."""
+        builder = EntryTreeBuilder()
+        self.editor_app.scene_walker.walk([node], self.scene_consumer(builder))
+        return builder.data[0] if builder.data else None
+
+    def _save_changes(self, path: Path) -> bool:
+        """
+        Sauvegarde incrémentale : ajoute au journal de la scène les seules
+        modifications faites depuis la dernière sauvegarde.
+        Retourne False si une sauvegarde complète est nécessaire.
+        """
+        path = Path(path)
+        changes = self.editor_app.changes
+        if changes.full_save_required or changes.base_path != path or not path.exists():
+            return False
+
+        records = changes.journal_records(self.describe_subtree)
+        if not records:
+            print(f"[INFO] Aucune modification depuis la dernière sauvegarde : {path}")
+            return True
+
+        journal_size = append_journal(path, records)
+        changes.reset(base_path=path)
+        print(f"[SUCCÈS] {len(records)} modification(s) ajoutée(s) au journal de {path.name}")
+
+        # Journal trop gros par rapport à la base : on le compacte dans une sauvegarde complète
+        if journal_size > max(self.COMPACT_MIN_BYTES, path.stat().st_size // 2):
+            print("[INFO] Compactage du journal dans la scène de base...")
+            self._write_scene_to_file(path)
+        return True
+
     def _write_scene_to_file(self, path: Path):
-        import json
-        from pathlib import Path
-
-        def serialize_node(node):
-            """Convertit un NodePath et ses enfants en dictionnaire JSON étendu"""
-            node_name = node.get_name()
-
-            # 🔹 Ignorer la caméra et les lumières
-            if node_name.lower() in {"camera", "light", "directionallight"}:
-                return None
-
-            # 🔹 Récupérer les infos depuis self.models
-            model_info = self.models.get(node_name, {})
-            node_type = model_info.get("type", "group")
-            file_info = model_info.get("file")
-
-            # 🔹 Si pas de structure 'file', la construire pour compatibilité
-            if not file_info and model_info.get("path"):
-                file_info = {
-                    "name": Path(model_info["path"]).stem,
-                    "path": model_info["path"],
-                    "data": None
-                }
-
-            # 🔹 Vérifier si c’est un conteneur racine (fichier importé)
-            is_container = bool(file_info and node.has_parent() and node.get_parent() == self.panda.render)
-
-            # 🔹 Construire le dictionnaire
-            entry = {
-                "name": node_name,
-                "type": node_type,
-                "file": file_info,
-                "transform": {
-                    "pos": list(node.get_pos()),
-                    "hpr": list(node.get_hpr()),
-                    "scale": list(node.get_scale())
-                },
-                "is_container": is_container,
-                "childs": []
-            }
-
-            # 🔹 Sérialiser les enfants récursivement
-            for child in node.get_children():
-                child_entry = serialize_node(child)
-                if child_entry:
-                    entry["childs"].append(child_entry)
-
-            return entry
-
-        # --- Construire la scène complète ---
-        scene_data = []
-        for node in self.panda.render.get_children():
-            entry = serialize_node(node)
-            if entry:
-                scene_data.append(entry)
-
-        # --- Sauvegarder en JSON ---
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(scene_data, f, indent=2, ensure_ascii=False)
+        path = Path(path)
+        roots = self.panda.render.get_children()
+        walker = self.editor_app.scene_walker
+
+        # --- Sauvegarder (JSON écrit au fil du parcours, ou binaire si l'extension est .p3ds) ---
+        # Écrit à côté puis renommé : une erreur en cours de parcours laisse la scène précédente intacte.
+        # Même extension que la cible : write_scene choisit le format d'après elle
+        tmp = path.with_name(f".{path.stem}.tmp{path.suffix}")
+        try:
+            if is_binary_path(path):
+                builder = EntryTreeBuilder()
+                walker.walk(roots, self.scene_consumer(builder))
+                write_scene(tmp, builder.data)
+            else:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    writer = JsonStreamWriter(f)
+                    walker.walk(roots, self.scene_consumer(writer))
+                    writer.close()
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+        # --- La base contient désormais tout : le journal est obsolète ---
+        try:
+            journal_path(path).unlink()
+        except FileNotFoundError:
+            pass
+        self.editor_app.changes.reset(base_path=path)
 
         print(f"[SUCCÈS] Scène sauvegardée avec les fichiers et collections : {path}")
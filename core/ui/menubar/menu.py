@@ -3,6 +3,7 @@ from .file.save import Save
 from .file.model_loader import ModelLoader
 from .file.file_ops import OpenScene
 from .file.export import Export
+from .file.cache import CacheTools
 
 from kivy.uix.actionbar import ActionBar, ActionView, ActionPrevious, ActionButton, ActionGroup
 from kivy.uix.boxlayout import BoxLayout
@@ -69,12 +70,14 @@ class MenuBar(ActionBar):
         self.save_tool = Save(self.editor_ui)
 
         self.export_tool = Export(self.editor_ui)
+        self.cache_tool = CacheTools(self.editor_ui)
 
         Clock.schedule_once(lambda dt: (
             self.open_scene_tool.connect_events(),
             self.load_tool.connect_events(),
             self.save_tool.connect_events(),
-            self.export_tool.connect_events()
+            self.export_tool.connect_events(),
+            self.cache_tool.connect_events()
         ))
         # Connect light actions after a short delay to ensure editor_ui exist
         Clock.schedule_once(lambda dt: (
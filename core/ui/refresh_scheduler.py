@@ -0,0 +1,74 @@
+# core/ui/refresh_scheduler.py
+from kivy.clock import Clock
+
+
+class RefreshScheduler:
+    """
+    Invalidation centralisée des panneaux de l'éditeur.
+
+    Les actions marquent un panneau comme à rafraîchir (invalidate) au lieu de le
+    reconstruire elles-mêmes ; un trigger Kivy rafraîchit chaque panneau sale au
+    plus une fois par frame. Les demandes fusionnées sont comptées (stats()).
+    Une action peut nommer le node qu'elle a touché : refresh() reçoit alors la
+    liste de ces nodes et ne relit que leurs branches.
+    """
+
+    def __init__(self):
+        self._panels = {}    # nom -> (refresh, rebuild)
+        self._dirty = {}     # nom -> (reconstruction complète demandée ?, {clé: node} ou None = tout)
+        self._counters = {}  # nom -> {"requested", "merged", "runs"}
+        self._trigger = Clock.create_trigger(self._flush, 0)
+
+    def register(self, name, refresh, rebuild=None):
+        """
+        Déclare un panneau : refresh(nodes) incrémental, rebuild() complet (facultatif).
+        `nodes` est la liste des nodes invalidés, ou None s'il faut tout revoir.
+        """
+        self._panels[name] = (refresh, rebuild or refresh)
+        self._counters.setdefault(name, {"requested": 0, "merged": 0, "runs": 0})
+
+    def invalidate(self, name, full=False, node=None):
+        """
+        Demande le rafraîchissement de `name` à la prochaine frame.
+        :param node: NodePath ajouté, renommé ou dont les enfants ont changé ;
+                     sans node, tout le panneau est revu.
+        """
+        if name not in self._panels:
+            return
+        counters = self._counters[name]
+        counters["requested"] += 1
+        if name in self._dirty:
+            counters["merged"] += 1
+            was_full, nodes = self._dirty[name]
+        else:
+            was_full, nodes = False, {}
+        if node is None:
+            nodes = None
+        elif nodes is not None:
+            nodes[node.get_key()] = node
+        self._dirty[name] = (was_full or full, nodes)
+        self._trigger()
+
+    def flush(self, name=None):
+        """Rafraîchit tout de suite les panneaux sales (ou seulement `name`)."""
+        names = [name] if name is not None else list(self._dirty)
+        for panel in names:
+            if panel not in self._dirty:
+                continue
+            full, nodes = self._dirty.pop(panel)
+            refresh, rebuild = self._panels[panel]
+            self._counters[panel]["runs"] += 1
+            try:
+                if full:
+                    rebuild()
+                else:
+                    refresh(list(nodes.values()) if nodes is not None else None)
+            except Exception as e:
+                print(f"[ERREUR] Rafraîchissement du panneau {panel} impossible : {e}")
+
+    def _flush(self, dt):
+        self.flush()
+
+    def stats(self):
+        """Compteurs par panneau : demandes reçues, demandes fusionnées, rafraîchissements faits."""
+        return {name: dict(counters) for name, counters in self._counters.items()}
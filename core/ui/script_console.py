@@ -4,8 +4,19 @@ from kivy.properties import (
     ObjectProperty, StringProperty, ListProperty, NumericProperty
 )
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.clock import Clock
+from collections import deque
+from itertools import count
 import sys
+import threading
+
+from core.editor_log import DEBUG, ERROR, INFO, WARNING, add_sink, format_record, subsystem_of
+from core.ui.log_viewer import LogViewerPopup
+
+# Couleurs par niveau (enregistrements du journal de l'éditeur)
+LEVEL_COLORS = {DEBUG: "8888aa", INFO: "55ff55", WARNING: "ffaa00", ERROR: "ff5555"}
 
 Builder.load_string('''
 <KivyConsole>:
@@ -40,6 +51,16 @@ Builder.load_string('''
             size_hint_x: 1
             text_size: self.size
 
+        Button:
+            text: "Journal"
+            size_hint_x: None
+            width: 80
+            background_normal: ''
+            background_color: (0.3, 0.3, 0.3, 1)
+            color: (1, 1, 1, 1)
+            font_size: 12
+            on_release: root.open_log_viewer()
+
         Button:
             text: "Effacer"
             size_hint_x: None
@@ -50,85 +71,257 @@ Builder.load_string('''
             font_size: 12
             on_release: root.clear()
 
-    ScrollView:
+    # 🔹 Seules les lignes visibles existent en widgets (recyclées au défilement)
+    RecycleView:
         id: scroll_view
+        viewclass: 'ConsoleLine'
         bar_width: 8
         scroll_type: ['bars', 'content']
         do_scroll_x: False
 
-        Label:
-            id: console_label
-            text: root.log_text
-            markup: True
+        RecycleBoxLayout:
+            orientation: 'vertical'
+            default_size: None, root.font_size + 5
+            default_size_hint: 1, None
             size_hint_y: None
-            text_size: self.width - 12, None  # 🔹 moins de largeur pour éviter le clipping
-            height: self.texture_size[1]
-            color: root.foreground_color
-            font_name: root.font_name
-            font_size: root.font_size
-            halign: 'left'       # 🔹 alignement horizontal
-            valign: 'top'        # 🔹 alignement vertical
+            height: self.minimum_height
             padding: 6, 4        # 🔹 petit espace interne
+
+<ConsoleLine>:
+    markup: True
+    text_size: self.width - 12, None  # 🔹 moins de largeur pour éviter le clipping
+    halign: 'left'       # 🔹 alignement horizontal
+    valign: 'top'
 ''')
 
+
+class ConsoleLine(RecycleDataViewBehavior, Label):
+    """
+    Ligne de console recyclée. Les lignes longues (tracebacks, chemins) passent à
+    la ligne : la hauteur réelle, connue une fois le texte rendu, est reportée
+    dans la donnée de la ligne ("height") pour que le RecycleView la place.
+    """
+
+    index = None
+    rv = None
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.rv = rv
+        self.index = index
+        result = super().refresh_view_attrs(rv, index, data)
+        if "height" not in data:
+            # Une vue recyclée peut garder la même texture_size : mesure immédiate
+            self.texture_update()
+            self._sync_height(self.texture_size)
+        return result
+
+    def on_texture_size(self, instance, size):
+        self._sync_height(size)
+
+    def _sync_height(self, size):
+        rv, index = self.rv, self.index
+        if rv is None or index is None or index >= len(rv.data):
+            return
+        row = rv.data[index]
+        height = max(size[1], rv.layout_manager.default_size[1] or 0)
+        if row.get("height") != height:
+            row["height"] = height  # gardée dans la donnée : pas de nouvelle mesure au défilement
+            rv.refresh_from_layout()
+
+
 class KivyConsole(BoxLayout):
-    """Console de logs avec redirection stdout/stderr et coloration."""
+    """
+    Console de logs avec redirection stdout/stderr et coloration.
 
-    scroll_view = ObjectProperty(None)
-    console_label = ObjectProperty(None)
-    log_text = StringProperty("")
+    Les écritures s'accumulent en lignes en attente ; une fois par frame, elles
+    passent dans un tampon circulaire (deque de max_lines lignes) affiché par un
+    RecycleView : le coût d'un print ne dépend plus de la taille de l'historique.
+
+    write() peut être appelé depuis n'importe quel thread (chargements, autosave,
+    scripts) : il ne touche à aucune propriété Kivy et se contente d'ajouter le
+    texte à une deque bornée (append atomique, sans verrou). Le thread principal
+    la vide à chaque tick d'horloge ; au-delà de max_pending écritures en attente,
+    les plus anciennes sont abandonnées et leur nombre est signalé dans la console.
+
+    Les enregistrements de core.editor_log arrivent par write_record() avec leur
+    niveau et leur sous-système : set_filter() masque les niveaux faibles ou des
+    sous-systèmes entiers sans relire le texte des lignes.
 
+    Si log_file (LogFileWriter) est renseigné, tout ce qui arrive à la console y
+    est aussi copié ; l'historique complet reste consultable avec open_log_viewer().
+    """
+
+    scroll_view = ObjectProperty(None)
     foreground_color = ListProperty((1, 1, 1, 1))
     background_color = ListProperty((0, 0, 0, 1))
     font_name = StringProperty("Roboto")
     font_size = NumericProperty(13)
     max_lines = NumericProperty(500)
+    min_level = NumericProperty(0)  # lignes sous ce niveau masquées (print() = INFO)
+    max_pending = 10000  # écritures en attente avant abandon des plus anciennes
+    drain_interval = 1 / 30.
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self._lines = deque(maxlen=int(self.max_lines))  # lignes affichées (données du RecycleView)
+        self._incoming = deque(maxlen=self.max_pending)  # (thread, texte) écrits par n'importe quel thread
+        self._written = count()  # compteur d'écritures (next() est atomique)
+        self._reads = 0          # valeurs du compteur consommées par _written_total()
+        self._drained = 0        # écritures sorties de la deque (ou perdues)
+        self._partial = {}       # thread -> début de ligne sans retour à la ligne
+        self._hidden = set()     # sous-systèmes masqués
+        self.log_file = None     # copie disque de la console (LogFileWriter)
+        self.bind(max_lines=self._resize_buffer, min_level=self._refresh_data)
         Clock.schedule_once(self._post_init)
+        self._drain_event = Clock.schedule_interval(self._drain, self.drain_interval)
 
     def _post_init(self, *args):
         self.scroll_view = self.ids.scroll_view
-        self.console_label = self.ids.console_label
-        self.console_label.markup = True  # 🔹 Assure la coloration
-        self._scroll_trigger = Clock.create_trigger(self.scroll_to_bottom, 0.05)
 
-        # 🔹 Retarde la redirection pour éviter d’écrire avant que le Label soit prêt
+        # 🔹 Retarde la redirection pour éviter d’écrire avant que la vue soit prête
         Clock.schedule_once(lambda dt: self._redirect_streams(), 0.1)
 
     def _redirect_streams(self):
         sys.stdout = self
         sys.stderr = self
+        add_sink(self.write_record)
+
+    def _resize_buffer(self, *args):
+        self._lines = deque(self._lines, maxlen=int(self.max_lines))
+        self._refresh_data()
+
+    def set_filter(self, min_level=None, hidden_subsystems=None):
+        """Filtre l'affichage par niveau minimal et/ou sous-systèmes masqués."""
+        if hidden_subsystems is not None:
+            self._hidden = set(hidden_subsystems)
+        if min_level is not None and min_level != self.min_level:
+            self.min_level = min_level  # rafraîchit via le bind
+        else:
+            self._refresh_data()
+
+    def _visible(self, level, subsystem):
+        return level >= self.min_level and subsystem not in self._hidden
+
+    def _refresh_data(self, *args):
+        if self.scroll_view:
+            self.scroll_view.data = [row for level, subsystem, row in self._lines
+                                     if self._visible(level, subsystem)]
+
+    @staticmethod
+    def _colorize(line):
+        if "ERROR" in line or "ERREUR" in line:
+            return f"[color=ff5555]{line}[/color]"
+        elif "WARN" in line or "WARNING" in line:
+            return f"[color=ffaa00]{line}[/color]"
+        elif "INFO" in line:
+            return f"[color=55ff55]{line}[/color]"
+        return line
+
+    def write_record(self, record):
+        """Sink de core.editor_log : même file d'attente que write(), formaté au drain."""
+        self._incoming.append((None, record))
+        next(self._written)
+        if self.log_file is not None:
+            self.log_file.write_record(record)
 
     def write(self, text):
-        """Affiche du texte dans la console."""
-        if not text.strip():
+        """Met du texte en attente d'affichage ; sûr depuis n'importe quel thread."""
+        if not text:
             return
+        self._incoming.append((threading.get_ident(), text))
+        next(self._written)
+        if self.log_file is not None:
+            self.log_file.write_text(text)
+
+    def _drain(self, *args):
+        """Thread principal : découpe les écritures reçues en lignes et les affiche."""
+        incoming = self._incoming
+        if not incoming and not self._partial:
+            return
+        pending = []
+        partial = self._partial
+        taken = 0
+        while True:
+            try:
+                thread, text = incoming.popleft()
+            except IndexError:
+                break
+            taken += 1
+            if thread is None:
+                # Enregistrement structuré : niveau et sous-système déjà connus
+                level, subsystem = text.levelno, subsystem_of(text)
+                color = LEVEL_COLORS.get(min(text.levelno, ERROR) // 10 * 10)
+                for line in format_record(text).split("\n"):
+                    pending.append((level, subsystem, f"[color={color}]{line}[/color]" if color else line))
+                continue
+            *lines, partial[thread] = (partial.get(thread, "") + text).split("\n")
+            pending.extend((INFO, None, self._colorize(line)) for line in lines if line.strip())
+        self._drained += taken
+
+        # Texte resté sans retour à la ligne : affiché tel quel au tick suivant
+        # (print() écrit le texte puis "\n" dans la même frame)
+        for thread, rest in list(partial.items()):
+            if not rest:
+                del partial[thread]
+            elif not taken:
+                pending.append((INFO, None, self._colorize(rest)))
+                del partial[thread]
 
-        # Coloration
-        if "ERROR" in text or "ERREUR" in text:
-            text = f"[color=ff5555]{text}[/color]"
-        elif "WARN" in text or "WARNING" in text:
-            text = f"[color=ffaa00]{text}[/color]"
-        elif "INFO" in text:
-            text = f"[color=55ff55]{text}[/color]"
+        # Écritures abandonnées par la deque bornée depuis le dernier drain
+        dropped = self._written_total() - self._drained - len(incoming)
+        if dropped > 0:
+            self._drained += dropped
+            pending.append((WARNING, None, self._colorize(f"[WARN] Console saturée : {dropped} écriture(s) perdue(s)")))
 
-        self.log_text += text + "\n"
+        if pending:
+            self._show(pending)
 
-        # Limite du buffer
-        lines = self.log_text.splitlines()
-        if len(lines) > self.max_lines:
-            lines = lines[-self.max_lines:]
-            self.log_text = "\n".join(lines)
+    def _written_total(self):
+        """Nombre d'écritures reçues (lire le compteur consomme une valeur, décomptée ici)."""
+        total = next(self._written) - self._reads
+        self._reads += 1
+        return total
 
-        self._scroll_trigger()
+    def _show(self, pending):
+        # Seules les max_lines dernières lignes peuvent rester dans le tampon
+        for level, subsystem, text in pending[-self._lines.maxlen:]:
+            self._lines.append((level, subsystem, {
+                "text": text,
+                "color": self.foreground_color,
+                "font_name": self.font_name,
+                "font_size": self.font_size,
+            }))
+        if self.scroll_view:
+            at_bottom = self._at_bottom()
+            self._refresh_data()
+            if at_bottom:
+                self.scroll_to_bottom()
 
     def flush(self):
         pass
 
     def clear(self):
-        self.log_text = ""
+        self._lines.clear()
+        self._incoming.clear()
+        self._drained = self._written_total()
+        self._partial.clear()
+        if self.scroll_view:
+            self.scroll_view.data = []
+
+    def open_log_viewer(self):
+        path = self.log_file.path if self.log_file is not None else None
+        if path is None or not path.exists():
+            self.write("[WARN] Aucun fichier de journal pour ce projet.\n")
+            return
+        LogViewerPopup(path).open()
+
+    def _at_bottom(self):
+        """True si la vue montre la fin du journal (ou si tout tient dans la vue)."""
+        rv = self.scroll_view
+        layout = rv.layout_manager
+        if layout is None or layout.height <= rv.height:
+            return True
+        return rv.scroll_y <= 0.01
 
     def scroll_to_bottom(self, *args):
         if self.scroll_view:
@@ -9,7 +9,13 @@ from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.graphics import Color, Rectangle
 from pathlib import Path
+import os
 from panda3d.core import Filename, NodePath
+from core.project.watcher import ADDED, REMOVED, RENAMED, RESCAN, ProjectWatcher
+from core.project.asset_index import AssetIndex
+from core.editor_log import get_logger
+
+log = get_logger("project")
 
 def truncate_filename(filename, max_chars=12):
     filename = str(filename)
@@ -40,6 +46,11 @@ class ProjectHierarchySidebar(BoxLayout):
         self.loaded_models = set()
         self.selected_node = None
         self.project_root = Path(project_root)
+        self._nodes_by_path = {}  # chemin -> nœud affiché (dossiers déjà ouverts seulement)
+        self.watcher = None
+        self.asset_index = None
+        # Abonnés aux changements du projet, appelés sur le thread principal avec la liste d'événements
+        self.fs_listeners = []
 
         # Fond gris foncé
         with self.canvas.before:
@@ -62,6 +73,13 @@ class ProjectHierarchySidebar(BoxLayout):
         btn_layout.add_widget(refresh_btn)
         self.add_widget(btn_layout)
 
+        # Recherche dans l'index des assets
+        self.search_input = TextInput(hint_text="Search assets", multiline=False, size_hint_y=None, height=28,
+                                      font_size=12)
+        self._search_trigger = Clock.create_trigger(self._run_search, 0.2)
+        self.search_input.bind(text=lambda *_: self._search_trigger())
+        self.add_widget(self.search_input)
+
         # --- Nouveau BoxLayout pour englober le TreeView ---
         self.tree_container = BoxLayout(orientation='vertical', padding=2, spacing=2)
         with self.tree_container.canvas.before:
@@ -85,6 +103,7 @@ class ProjectHierarchySidebar(BoxLayout):
         )
         self.tree.size_hint_y = None
         self.tree.bind(minimum_height=self.tree.setter('height'))
+        self.tree.load_func = self._load_children
 
         self.scroll.add_widget(self.tree)
         self.tree_container.add_widget(self.scroll)
@@ -118,6 +137,9 @@ class ProjectHierarchySidebar(BoxLayout):
 
     def refresh(self):
         """Recharge le contenu du projet avec scroll fonctionnel."""
+        self._nodes_by_path = {}
+        self.selected_node = None
+        self._start_watcher()
         # Supprimer complètement l’ancienne TreeView
         if hasattr(self, 'scroll') and hasattr(self, 'tree'):
             self.scroll.clear_widgets()
@@ -132,34 +154,148 @@ class ProjectHierarchySidebar(BoxLayout):
             size_hint_y=None
         )
         self.tree.bind(minimum_height=self.tree.setter('height'))
+        # Les dossiers ne sont lus qu'à leur première ouverture
+        self.tree.load_func = self._load_children
 
         self.scroll.add_widget(self.tree)
         self.tree_container.add_widget(self.scroll)
         #self.add_widget(self.tree_container)
+        if self.search_input.text.strip():
+            self._search_trigger()
+
+        # Ajouter le nœud racine du projet (ses enfants seront chargés à l'ouverture)
+        if self.project_root.exists():
+            self._add_node(self.project_root, parent=None, is_dir=self.project_root.is_dir())
 
-        # Ajouter les nœuds du projet
-        self._add_node(self.project_root, parent=None)
 
+    # ---------------- Surveillance du dossier projet ----------------
+    def _start_watcher(self):
+        """(Re)lance la surveillance et l'index des assets si le dossier projet a changé."""
+        if self.watcher is not None and self.watcher.root == self.project_root:
+            return
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self.asset_index is not None:
+            self.asset_index.stop()
+            self.asset_index = None
+        if self.project_root.is_dir():
+            self.asset_index = AssetIndex(self.project_root)
+            self.asset_index.start()
+            self.watcher = ProjectWatcher(self.project_root, self._on_watcher_events)
+            self.watcher.start()
+
+    def _on_watcher_events(self, events):
+        # L'index se met à jour sur son propre thread
+        if self.asset_index is not None:
+            self.asset_index.notify(events)
+        # Thread du watcher : l'arbre Kivy n'est modifié que sur le thread principal
+        Clock.schedule_once(lambda dt: self.apply_fs_events(events))
+
+    def apply_fs_events(self, events):
+        """Répercute les changements du disque sur les seuls nœuds concernés."""
+        for event in events:
+            if event.kind == RESCAN:
+                self.refresh()
+                break
+            if event.kind == ADDED:
+                self._patch_added(event.path, event.is_dir)
+            elif event.kind == REMOVED:
+                self._patch_removed(event.path)
+            elif event.kind == RENAMED:
+                self._patch_removed(event.path)
+                self._patch_added(event.dest, event.is_dir)
+        for listener in self.fs_listeners:
+            try:
+                listener(events)
+            except Exception:
+                log.exception("Écouteur des changements du projet")
+
+    def _patch_added(self, path: Path, is_dir: bool):
+        if path in self._nodes_by_path:
+            return
+        parent = self._nodes_by_path.get(path.parent)
+        if parent is None:
+            return  # dossier parent pas affiché
+        if parent.is_loaded:
+            self.tree.add_node(self._make_node(path, is_dir), parent)
+        elif parent.is_leaf:
+            # Dossier jamais ouvert : seule la flèche change
+            parent.is_leaf = False
+            self.tree._trigger_layout()
+
+    def _patch_removed(self, path: Path):
+        node = self._nodes_by_path.get(path)
+        if node is None:
+            return
+        for child in list(self.tree.iterate_all_nodes(node)):
+            self._nodes_by_path.pop(getattr(child, "project_path", None), None)
+            if child is self.selected_node:
+                self.selected_node = None
+        parent = node.parent_node
+        self.tree.remove_node(node)
+        if parent is not None and parent.is_loaded and not parent.nodes:
+            parent.is_leaf = True
 
     def refreshforbtn(self, *_):
         """Recharge l’arborescence depuis le dossier racine (bouton Refresh)."""
         self.refresh()
 
 
-    def _add_node(self, path: Path, parent: TreeViewNode = None):
-        if not path.exists():
+    def _scan_dir(self, path):
+        """Entrées d'un dossier (dossiers d'abord, puis ordre alphabétique), depuis l'index ou os.scandir."""
+        if self.asset_index is not None:
+            entries = self.asset_index.children(path)
+            if entries is not None:
+                return entries
+        try:
+            with os.scandir(path) as it:
+                entries = [(entry.name, entry.is_dir()) for entry in it]
+        except OSError:
+            return []
+        entries.sort(key=lambda e: (not e[1], e[0].lower()))
+        return entries
+
+    def _dir_has_children(self, path):
+        """Indice pour la flèche d'un dossier : index, sinon lecture d'au plus une entrée."""
+        if self.asset_index is not None:
+            hint = self.asset_index.has_children(path)
+            if hint is not None:
+                return hint
+        try:
+            with os.scandir(path) as it:
+                return next(it, None) is not None
+        except OSError:
+            return False
+
+    def _load_children(self, tree, node):
+        """load_func du TreeView : crée les nœuds d'un dossier à sa première ouverture."""
+        path = getattr(node, "project_path", None)
+        if path is None:
             return
+        for name, is_dir in self._scan_dir(path):
+            yield self._make_node(path / name, is_dir)
 
-        display_name = truncate_filename(path.name, max_chars=20)
-        node = TreeViewLabel(text=display_name)
+    def _add_node(self, path: Path, parent: TreeViewNode = None, is_dir: bool = False):
+        node = self._make_node(path, is_dir)
         self.tree.add_node(node, parent)
+        return node
+
+    def _make_node(self, path: Path, is_dir: bool, text: str = None, in_tree: bool = True):
+        display_name = text or truncate_filename(path.name, max_chars=20)
+        node = TreeViewLabel(text=display_name)
+        node.project_path = path
+        if in_tree:
+            self._nodes_by_path[path] = node
+            # Flèche affichée d'après l'indice, enfants lus seulement à l'ouverture
+            node.is_leaf = not (is_dir and self._dir_has_children(path))
 
         def on_select(instance):
             if self.selected_node:
                 self.selected_node.color = (1, 1, 1, 1)
             instance.color = (0.2, 0.4, 0.8, 1)
             self.selected_node = instance
-            if path.is_file() and self.ui_app:
+            if not is_dir and self.ui_app:
                 suffix = path.suffix.lower()
                 if suffix in (".bam", ".egg", ".gltf", ".glb", ".pz"):
                     self.load_model_from_project(path)
@@ -175,20 +311,81 @@ class ProjectHierarchySidebar(BoxLayout):
                 on_select(inst)
 
             # clic droit sur dossier = popup
-            elif touch.button == 'right' and path.is_dir():
+            elif touch.button == 'right' and is_dir:
                 self._maybe_add_node_popup(inst, path)
 
+            # clic droit sur fichier = utilisations / dépendances
+            elif touch.button == 'right':
+                self._show_usages_popup(path)
+
             # on ne bloque pas le touch pour TreeView
             return False
 
         node.bind(on_touch_down=on_touch_down)
+        return node
+
+    # ---------------- Recherche ----------------
+    @staticmethod
+    def _describe_asset(record):
+        """Texte d'un résultat : nom, type et, pour les modèles, taille de la géométrie."""
+        details = record["kind"]
+        if record["triangles"] is not None:
+            details += f", {record['triangles']} tris"
+        elif record["size"] is not None:
+            details += f", {record['size'] // 1024} Ko"
+        return f"{truncate_filename(record['name'], max_chars=20)}  ({details})"
+
+    def _run_search(self, *_):
+        text = self.search_input.text.strip()
+        self.scroll.clear_widgets()
+        if not text:
+            self.scroll.add_widget(self.tree)
+            return
 
-        if path.is_dir():
-            try:
-                for child in sorted(path.iterdir(), key=lambda x: (x.is_file(), x.name.lower())):
-                    self._add_node(child, parent=node)
-            except PermissionError:
-                pass
+        results = TreeView(hide_root=True, indent_level=20, size_hint_y=None)
+        results.bind(minimum_height=results.setter('height'))
+        records = self.asset_index.search(text) if self.asset_index is not None else None
+        if records is None:
+            results.add_node(TreeViewLabel(text="Indexation en cours..."))
+        elif not records:
+            results.add_node(TreeViewLabel(text="Aucun résultat"))
+        for record in records or ():
+            path = self.project_root / record["path"]
+            results.add_node(self._make_node(path, record["kind"] == "dir",
+                                             text=self._describe_asset(record), in_tree=False))
+        self.scroll.add_widget(results)
+
+    def _show_usages_popup(self, path):
+        """Scènes/scripts qui utilisent ce fichier et, pour une scène ou un script, ce dont il a besoin."""
+        index = self.asset_index
+        users = index.users_of(path) if index is not None else None
+        needs = index.needs(path) if index is not None else None
+
+        lines = []
+        if users is None:
+            lines.append("Indexation en cours...")
+        else:
+            lines.append(f"[b]Utilisé par ({len(users)})[/b]")
+            lines.extend(f"  {user}" for user in users)
+            if not users:
+                lines.append("  (aucune scène ni script)")
+            if needs:
+                lines.append(f"[b]Utilise ({len(needs)})[/b]")
+                lines.extend(f"  {target}" for target in needs)
+
+        content = BoxLayout(orientation='vertical', spacing=4)
+        scroll = ScrollView(do_scroll_x=False)
+        label = Label(text="\n".join(lines), markup=True, size_hint_y=None, halign='left', valign='top', font_size=12)
+        label.bind(width=lambda inst, w: setattr(inst, 'text_size', (w, None)),
+                   texture_size=lambda inst, size: setattr(inst, 'height', size[1]))
+        scroll.add_widget(label)
+        content.add_widget(scroll)
+        close_btn = Button(text="Close", size_hint_y=None, height=32)
+        content.add_widget(close_btn)
+
+        popup = Popup(title=f"Usages of {path.name}", content=content, size_hint=(0.5, 0.6))
+        close_btn.bind(on_release=lambda *_: popup.dismiss())
+        popup.open()
 
     def _maybe_add_node_popup(self, node, path):
         # Popup pour ajouter un fichier/dossier
@@ -211,14 +408,14 @@ class ProjectHierarchySidebar(BoxLayout):
             name = input_name.text.strip()
             if name:
                 (path / name).touch(exist_ok=True)
-                self.refresh()
+                self._patch_added(path / name, is_dir=False)
             popup.dismiss()
 
         def create_dir(*_):
             name = input_name.text.strip()
             if name:
                 (path / name).mkdir(exist_ok=True)
-                self.refresh()
+                self._patch_added(path / name, is_dir=True)
             popup.dismiss()
 
         btn_file.bind(on_release=create_file)
@@ -230,16 +427,13 @@ class ProjectHierarchySidebar(BoxLayout):
 
     def load_model_from_project(self, path):
         """Charge un modèle 3D depuis le panneau Projet, encapsulé dans un node portant le nom du fichier."""
-        panda_path = Filename.from_os_specific(str(path)).get_fullpath()
         try:
-            model = self.panda_app.loader.loadModel(panda_path)
-
             container_name = path.stem
             container = NodePath(container_name)
-            container.reparentTo(self.panda_app.render)
 
-            # Reparent le modèle dans le conteneur
-            model.reparentTo(container)
+            # Copie du modèle partagé par le cache de l'éditeur
+            self.ui_app.model_cache.instantiate(path, container)
+            container.reparentTo(self.panda_app.render)
 
             # Donne un nom unique si déjà pris
             base_name = container_name
@@ -264,14 +458,15 @@ class ProjectHierarchySidebar(BoxLayout):
                 "type": "group"
             }
 
-            print(f"[INFO] Modèle ajouté à la scène : {name}")
+            self.ui_app.changes.mark_added(container)
+            log.info("Modèle ajouté à la scène : %s", name)
 
             # Rafraîchit la hiérarchie
-            self.ui_app.sidebar.refresh_hierarchy()
+            self.ui_app.refresh_scheduler.invalidate("hierarchy", node=container)
 
             # Sélectionne le modèle dans les propriétés
             self.ui_app.sidebar.selected_node = container
             self.ui_app.properties_sidebar.set_node(container)
 
         except Exception as e:
-            print(f"[ERREUR] Impossible de charger {path}: {e}")
\ No newline at end of file
+            log.error("Impossible de charger %s: %s", path, e)
\ No newline at end of file
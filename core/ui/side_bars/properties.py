@@ -6,9 +6,15 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.graphics import Color, Rectangle
 from kivy.uix.behaviors import ButtonBehavior
 from kivy.uix.textinput import TextInput
+from kivy.uix.spinner import Spinner
 from panda3d.core import NodePath
+from core.scene.bam_export import MOBILITY_TAG, MOBILITY_VALUES
 # Lights
 from panda3d.core import DirectionalLight, AmbientLight, PointLight, Vec4
+from core.editor_log import get_logger
+
+log = get_logger("properties")
+
 # Barre des propriétés
 
 class PropertiesSidebar(BoxLayout):
@@ -87,6 +93,15 @@ class PropertiesSidebar(BoxLayout):
             scale_row.add_widget(ti)
         self.content.add_widget(scale_row)
 
+        # --- Mobilité : les nodes 'static' sont aplatis à l'export .bam ---
+        mobility_row = BoxLayout(size_hint_y=None, height=28, spacing=2)
+        mobility_row.add_widget(Label(text="Mobility", color=(1,1,1,1)))
+        self._syncing_mobility = False
+        self.mobility_spinner = Spinner(text="default", values=("default",) + MOBILITY_VALUES)
+        self.mobility_spinner.bind(text=self.on_mobility_changed)
+        mobility_row.add_widget(self.mobility_spinner)
+        self.content.add_widget(mobility_row)
+
         # Container pour les contrôles spécifiques aux lights
         self.light_controls_container = BoxLayout(orientation='vertical', size_hint_y=None, spacing=4)
         # assure la hauteur minimale et permet d'ajouter/supprimer des widgets
@@ -109,7 +124,10 @@ class PropertiesSidebar(BoxLayout):
                 ti.text = ""
             for ti in self.scale_inputs.values():
                 ti.text = ""
-            print("[INFO] Aucun node sélectionné (panneau propriétés vidé).")
+            self._syncing_mobility = True
+            self.mobility_spinner.text = "default"
+            self._syncing_mobility = False
+            log.debug("Aucun node sélectionné (panneau propriétés vidé).")
             return
 
         # --- Node valide ---
@@ -130,6 +148,11 @@ class PropertiesSidebar(BoxLayout):
         for axis, ti in self.scale_inputs.items():
             ti.text = str(round(getattr(scale, axis.lower()), 3))
 
+        # Mobilité
+        self._syncing_mobility = True
+        self.mobility_spinner.text = node.get_tag(MOBILITY_TAG) if node.has_tag(MOBILITY_TAG) else "default"
+        self._syncing_mobility = False
+
         # --- Si le node est une light, afficher les contrôles supplémentaires ---
         try:
             node_obj = node.node()
@@ -155,11 +178,24 @@ class PropertiesSidebar(BoxLayout):
 
             # 🔹 Synchroniser avec le dictionnaire de modèles
             if self.editor_app:
+                self.editor_app.changes.mark_transformed(self.selected_node)
                 self.update_model_info(self.selected_node)
 
         except ValueError:
             pass
 
+    def on_mobility_changed(self, spinner, value):
+        """Marque le node sélectionné 'static' / 'dynamic' pour l'export .bam."""
+        if self._syncing_mobility or not self.selected_node:
+            return
+        if value in MOBILITY_VALUES:
+            self.selected_node.set_tag(MOBILITY_TAG, value)
+        else:
+            self.selected_node.clear_tag(MOBILITY_TAG)
+        # Les tags ne passent pas par le journal : prochaine sauvegarde complète
+        if self.editor_app:
+            self.editor_app.changes.mark_untracked()
+
     def update_model_info(self, model):
         """Met à jour les infos du modèle dans self.models"""
         name = model.get_name()
@@ -167,8 +203,7 @@ class PropertiesSidebar(BoxLayout):
             self.editor_app.models[name]["pos"] = list(model.get_pos())
             self.editor_app.models[name]["hpr"] = list(model.get_hpr())
             self.editor_app.models[name]["scale"] = list(model.get_scale())
-            # Debug
-            print(f"[SYNC] {name} mis à jour -> pos={self.editor_app.models[name]['pos']}")
+            log.debug("%s mis à jour -> pos=%s", name, self.editor_app.models[name]["pos"])
 
     # ---------------- Light controls ----------------
     def clear_light_controls(self):
@@ -264,15 +299,15 @@ class PropertiesSidebar(BoxLayout):
             b = float(self.b_input.text)
             a = float(self.a_input.text)
         except Exception:
-            print('[Properties] Valeurs de couleur invalides.')
+            log.warning('Valeurs de couleur invalides.')
             return
 
         try:
             light_obj = self.selected_node.node()
             light_obj.setColor(Vec4(r, g, b, a))
-            print(f"[Properties] Couleur light appliquée: {(r,g,b,a)}")
+            log.debug("Couleur light appliquée: %s", (r, g, b, a))
         except Exception as e:
-            print(f"[Properties] Impossible d'appliquer la couleur: {e}")
+            log.error("Impossible d'appliquer la couleur: %s", e)
 
     def remove_light(self, light_np: NodePath):
         """Retire la light du render et supprime le node."""
@@ -281,17 +316,16 @@ class PropertiesSidebar(BoxLayout):
         except Exception:
             pass
         try:
+            self.editor_app.changes.mark_removed(light_np)
+            parent = light_np.get_parent()
             light_np.remove_node()
-            print(f"[Properties] Light {light_np.get_name()} supprimée.")
+            log.info("Light %s supprimée.", light_np.get_name())
             # vider les contrôles
             self.clear_light_controls()
-            # Rafraîchir la hiérarchie
-            try:
-                self.editor_app.sidebar.refresh_hierarchy()
-            except Exception:
-                pass
+            # Rafraîchir la hiérarchie (seule la branche du parent est relue)
+            self.editor_app.refresh_scheduler.invalidate("hierarchy", node=parent)
         except Exception as e:
-            print(f"[Properties] Impossible de supprimer la light: {e}")
+            log.error("Impossible de supprimer la light: %s", e)
 
     def apply_light_transform(self):
         """Applique la position/HPR depuis les champs vers la light sélectionnée."""
@@ -302,13 +336,14 @@ class PropertiesSidebar(BoxLayout):
             y = float(self.light_pos_inputs['Y'].text)
             z = float(self.light_pos_inputs['Z'].text)
         except Exception:
-            print('[Properties] Valeurs de position invalides.')
+            log.warning('Valeurs de position invalides.')
             return
 
         try:
             self.selected_node.setPos(self.editor_app.panda.render, x, y, z)
+            self.editor_app.changes.mark_transformed(self.selected_node)
         except Exception as e:
-            print(f"[Properties] Impossible d'appliquer la position: {e}")
+            log.error("Impossible d'appliquer la position: %s", e)
 
         # HPR (optionnel pour DirectionalLight)
         try:
@@ -322,4 +357,4 @@ class PropertiesSidebar(BoxLayout):
         except Exception:
             # ignore HPR si non fournie ou non applicable
             pass
-        print('[Properties] Transform appliqué à la light.')
+        log.debug('Transform appliqué à la light.')
@@ -1,12 +1,61 @@
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.treeview import TreeView, TreeViewLabel
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.popup import Popup
 from kivy.uix.button import Button
+from kivy.lang import Builder
+from kivy.properties import BooleanProperty, NumericProperty, ObjectProperty
 from kivy.graphics import Color, Rectangle
 from pathlib import Path
-from panda3d.core import DirectionalLight, AmbientLight, PointLight, NodePath
+from panda3d.core import DirectionalLight, AmbientLight, PointLight, Light, NodePath
+from core.editor_log import get_logger
+from core.scene.visitor import FunctionConsumer
+
+log = get_logger("hierarchy")
+
+ROW_HEIGHT = 22
+INDENT = 15
+
+Builder.load_string('''
+<HierarchyRow>:
+    canvas.before:
+        Color:
+            rgba: (0.2, 0.35, 0.6, 1) if self.selected else (0, 0, 0, 0)
+        Rectangle:
+            pos: self.pos
+            size: self.size
+    halign: 'left'
+    valign: 'middle'
+    shorten: True
+    text_size: self.size
+    padding: 4 + self.depth * 15, 0
+    font_size: 13
+    color: 1, 1, 1, 1
+''')
+
+
+class HierarchyRow(RecycleDataViewBehavior, Label):
+    """Ligne recyclée de la hiérarchie : seules les lignes visibles existent en widgets."""
+
+    key = ObjectProperty(None, allownone=True)
+    sidebar = ObjectProperty(None)
+    depth = NumericProperty(0)
+    has_children = BooleanProperty(False)
+    is_open = BooleanProperty(False)
+    selected = BooleanProperty(False)
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        # Clic sur la flèche (indentation + 1 cran) : ouvrir/fermer, ailleurs : sélectionner
+        if self.has_children and touch.x < self.x + 4 + (self.depth + 1) * INDENT:
+            self.sidebar.toggle_row(self.key)
+        else:
+            self.sidebar.select_row(self.key)
+        return True
+
 
 class HierarchySidebar(BoxLayout):
     def __init__(self, panda_app, app, **kwargs):
@@ -20,6 +69,14 @@ class HierarchySidebar(BoxLayout):
         self.app = app
         self.selected_node = None
         self.models = panda_app.models
+        # Modèle de l'arbre, par clé de scène : (clé du parent, NodePath.get_key()).
+        # Un node reparenté change donc de clé et réapparaît sous son nouveau parent.
+        # Chaque entrée : {"text", "panda_node", "children": [clés] ou None si pas encore
+        # chargés, "hint": le node a-t-il des enfants}
+        self._nodes = {}
+        self._by_node = {}  # NodePath.get_key() -> clés de ses lignes chargées
+        self._expanded = {"render"}
+        self._selected_key = None
 
         # Fond gris foncé
         with self.canvas.before:
@@ -37,24 +94,22 @@ class HierarchySidebar(BoxLayout):
             font_size=15,
         ))
 
-        # --- Nouveau BoxLayout pour englober le TreeView ---
+        # --- Nouveau BoxLayout pour englober la liste ---
         tree_container = BoxLayout(orientation='vertical', padding=2, spacing=2)
         with tree_container.canvas.before:
             Color(0.1, 0.1, 0.1, 1)  # couleur du rectangle
             tree_container.rect = Rectangle(pos=tree_container.pos, size=tree_container.size)
         tree_container.bind(pos=self.update_rect_container, size=self.update_rect_container)
 
-        # Scroll + TreeView
-        self.scroll = ScrollView(do_scroll_x=False, do_scroll_y=True, bar_width=8, size_hint_y=1)
-        self.tree = TreeView(root_options=dict(text="render"), hide_root=False, indent_level=15)
+        # RecycleView sur la liste aplatie des lignes visibles (branches ouvertes)
+        self.rv = RecycleView(viewclass='HierarchyRow', do_scroll_x=False, bar_width=8, size_hint_y=1)
+        rows = RecycleBoxLayout(orientation='vertical', size_hint_y=None,
+                                default_size=(None, ROW_HEIGHT), default_size_hint=(1, None))
+        rows.bind(minimum_height=rows.setter('height'))
+        self.rv.add_widget(rows)
 
-        self.tree.size_hint_y = None
-        self.tree.bind(minimum_height=self.tree.setter('height'))
-        self.tree.bind(selected_node=self.on_select_node)
-
-        self.scroll.add_widget(self.tree)
-        tree_container.add_widget(self.scroll)  # TreeView dans le container
-        self.add_widget(tree_container)          # container dans le panel
+        tree_container.add_widget(self.rv)  # liste dans le container
+        self.add_widget(tree_container)     # container dans le panel
 
         self.refresh_hierarchy()
 
@@ -66,66 +121,291 @@ class HierarchySidebar(BoxLayout):
         instance.rect.pos = instance.pos
         instance.rect.size = instance.size
 
-    def refresh_hierarchy(self):
-        """Affiche la hiérarchie en respectant les collections et fichiers importés."""
-        # Supprime tous les nœuds existants
-        for node in list(self.tree.iterate_all_nodes()):
-            self.tree.remove_node(node)
-        # Helper: ajoute récursivement un panda_node et ses enfants dans l'arbre,
-        # en sautant les nodes de type Light (ils seront listés dans le groupe Lights).
-        def add_node(panda_node, parent_label=None):
-            try:
-                node_obj = panda_node.node()
-            except Exception:
-                node_obj = None
+    def refresh_hierarchy(self, nodes=None):
+        """
+        Met l'arbre à jour d'après la scène ; les branches ouvertes et la sélection
+        sont gardées, et un node reparenté hérite de l'état de son ancienne ligne.
+        `nodes` : nodes ajoutés, renommés ou dont les enfants ont changé (voir
+        RefreshScheduler.invalidate) ; seules les branches qui les contiennent sont
+        relues. Sans `nodes`, toute la partie chargée de l'arbre est relue.
+        Repli sur rebuild_hierarchy().
+        """
+        try:
+            if nodes is None:
+                self._apply_scene_diff()
+            else:
+                self._apply_node_changes(nodes)
+        except Exception as e:
+            print(f"[WARN] Mise à jour de la hiérarchie impossible ({e}), reconstruction complète")
+            self.rebuild_hierarchy()
+
+    def rebuild_hierarchy(self):
+        """Reconstruit tout l'arbre, branches refermées (après le chargement d'une scène, ou en secours)."""
+        self._nodes = {}
+        self._by_node = {}
+        self._expanded = {"render"}
+        self._selected_key = None
+        self._apply_scene_diff()
+
+    def _apply_scene_diff(self):
+        nodes = {
+            "render": {"text": "render", "panda_node": None, "children": None, "hint": True},
+            "lights": {"text": "Lights", "panda_node": None, "children": [], "hint": False},
+        }
+        # Seules les branches ouvertes sont parcourues ; les autres gardent un simple
+        # indice "a des enfants" et se chargent à l'ouverture (voir toggle_row)
+        self._load_children(nodes, "render")
+        nodes["render"]["children"].insert(0, "lights")
+
+        # Lumières relevées côté C++ : pas de parcours Python des branches fermées.
+        # Ensuite, la liste est tenue à jour par les nodes invalidés (_apply_node_changes)
+        for light_np in self.app.find_all_matches("**/+Light"):
+            self._add_light(nodes, light_np)
+
+        # Lignes dont le node a disparu ou changé de parent : l'état passe au nouvel emplacement.
+        # Les clés sous une branche fermée (non chargée) sont gardées telles quelles.
+        def gone(key):
+            if key in nodes:
+                return False
+            parent = nodes.get("render" if key[0] is None else key[0])
+            return parent is not None and parent["children"] is not None
+
+        moved = {key for key in self._expanded if gone(key)}
+        if self._selected_key is not None and gone(self._selected_key):
+            moved.add(self._selected_key)
+
+        self._nodes = nodes
+        self._by_node = {}
+        for key in nodes:
+            self._index(key)
+        self._move_state(moved)
+        self._update_rows()
+
+    def _apply_node_changes(self, nodes):
+        """Relit les seules branches parentes des nodes invalidés, et leurs lumières."""
+        dropped = set()
+        reloaded = set()
+        for np in nodes:
+            if np.is_empty() or np.get_top() != self.app:
+                continue  # retiré depuis : son parent a été invalidé avec lui
+            if np == self.app:
+                parent_keys = ["render"]
+            else:
+                # Lumières du sous-arbre modifié seulement (pas de recherche dans toute la scène)
+                for light_np in [np, *np.find_all_matches("**/+Light")]:
+                    if light_np.node().is_of_type(Light.get_class_type()):
+                        self._add_light(self._nodes, light_np)
+                parent = np.get_parent()
+                parent_keys = ["render"] if parent == self.app else list(self._by_node.get(parent.get_key(), ()))
+            for key in parent_keys:
+                if key in reloaded or key not in self._nodes:
+                    continue
+                reloaded.add(key)
+                node = self._nodes[key]
+                if node["children"] is None:
+                    # Branche jamais chargée : seul l'indice "a des enfants" peut changer
+                    node["hint"] = node["panda_node"].get_num_children() > 0
+                else:
+                    dropped |= self._reload_branch(key)
+        dropped |= self._prune_lights()
+        self._move_state({key for key in dropped if key not in self._nodes})
+        self._update_rows()
 
+    def _reload_branch(self, key):
+        """Relit les enfants chargés de `key` ; retourne les clés qui ont quitté la branche."""
+        old = self._subtree_keys(key)
+        for old_key in old:
+            del self._nodes[old_key]
+            self._unindex(old_key)
+        self._load_children(self._nodes, key)
+        if key == "render":
+            self._nodes["render"]["children"].insert(0, "lights")
+        new = self._subtree_keys(key)
+        for new_key in new:
+            self._index(new_key)
+        return old - new
+
+    def _subtree_keys(self, key):
+        """Clés chargées sous `key` (le groupe Lights, tenu à part, est exclu)."""
+        keys = set()
+        stack = list(self._nodes[key]["children"] or ())
+        while stack:
+            key = stack.pop()
+            if key == "lights":
+                continue
+            keys.add(key)
+            stack.extend(self._nodes[key]["children"] or ())
+        return keys
+
+    def _add_light(self, nodes, light_np):
+        """Ajoute (ou renomme) la ligne de `light_np` dans le groupe Lights."""
+        key = ("lights", light_np.get_key())
+        text = light_np.get_name() or '<light>'
+        if key in nodes:
+            nodes[key]["text"] = text
+            return
+        nodes[key] = {"text": text, "panda_node": light_np, "children": [], "hint": False}
+        nodes["lights"]["children"].append(key)
+
+    def _prune_lights(self):
+        """Retire du groupe Lights les lumières qui ne sont plus dans la scène."""
+        lights = self._nodes["lights"]
+        removed = set()
+        for key in lights["children"]:
+            light_np = self._nodes[key]["panda_node"]
+            if light_np.is_empty() or light_np.get_top() != self.app:
+                removed.add(key)
+                del self._nodes[key]
+        if removed:
+            lights["children"] = [key for key in lights["children"] if key not in removed]
+        return removed
+
+    def _index(self, key):
+        # Clés de l'arbre par node, pour retrouver les lignes d'un node invalidé
+        if isinstance(key, tuple) and key[0] != "lights":
+            self._by_node.setdefault(key[1], set()).add(key)
+
+    def _unindex(self, key):
+        keys = self._by_node.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_node[key[1]]
+
+    def _move_state(self, keys):
+        """Reporte l'ouverture et la sélection des lignes `keys`, disparues, sur le nouvel emplacement de leur node."""
+        for key in keys:
+            new_keys = self._by_node.get(key[1])
+            new_key = next(iter(new_keys)) if new_keys else None
+            if key in self._expanded:
+                self._expanded.discard(key)
+                if new_key is not None:
+                    self._expanded.add(new_key)
+                    if self._nodes[new_key]["children"] is None:
+                        # Chargé fermé à son nouvel emplacement : on charge la branche rouverte
+                        self._load_children(self._nodes, new_key)
+                        for child_key in self._subtree_keys(new_key):
+                            self._index(child_key)
+            if key == self._selected_key:
+                self._selected_key = new_key
+
+    def _load_children(self, nodes, parent_key):
+        """Charge les enfants de `parent_key`, et ceux des branches ouvertes en dessous."""
+        parent_np = self.app if parent_key == "render" else nodes[parent_key]["panda_node"]
+        nodes[parent_key]["children"] = []
+        keys = [parent_key]
+
+        def enter(visit):
             # Skip lights here (we'll list them in the Lights group)
-            if node_obj is not None and isinstance(node_obj, (DirectionalLight, AmbientLight, PointLight)):
-                return
-
-            display_name = panda_node.get_name() or '<unnamed>'
-
-            label = TreeViewLabel(text=display_name)
-            self.tree.add_node(label, parent_label)
-            label.panda_node = panda_node
-
-            for child in panda_node.get_children():
-                add_node(child, parent_label=label)
-
-        # First, add a 'Lights' group and collect all lights under render
-        lights_group = TreeViewLabel(text='Lights')
-        self.tree.add_node(lights_group)
-
-        def collect_lights(node, out_list):
-            try:
-                for child in node.get_children():
-                    try:
-                        obj = child.node()
-                    except Exception:
-                        obj = None
-                    if obj is not None and isinstance(obj, (DirectionalLight, AmbientLight, PointLight)):
-                        out_list.append(child)
-                    # Recurse
-                    collect_lights(child, out_list)
-            except Exception:
-                pass
-
-        lights = []
-        collect_lights(self.app, lights)
-        for light_np in lights:
-            lname = light_np.get_name() or '<light>'
-            llabel = TreeViewLabel(text=lname)
-            llabel.panda_node = light_np
-            self.tree.add_node(llabel, lights_group)
-
-        # Parcourir tous les NodePaths racine de la scène (en sautant les lights déjà listées)
-        for root_node in self.app.get_children():
-            add_node(root_node)
-
-    def on_select_node(self, tree, node):
-        if node:
-            self.selected_node = getattr(node, 'panda_node', None)
-            print("[INFO] selection du node:"+str(self.selected_node))
+            if visit.is_light:
+                return False
+            parent = keys[-1]
+            key = (None if parent == "render" else parent, visit.node.get_key())
+            is_open = key in self._expanded
+            nodes[key] = {
+                "text": visit.name or '<unnamed>',
+                "panda_node": visit.node,
+                "children": [] if is_open else None,
+                "hint": visit.node.get_num_children() > 0,
+            }
+            nodes[parent]["children"].append(key)
+            if not is_open:
+                return False
+            keys.append(key)
+            return True
+
+        self.panda_app.scene_walker.walk(parent_np.get_children(),
+                                         FunctionConsumer(enter, lambda visit: keys.pop()))
+
+    def _row(self, key, depth):
+        node = self._nodes[key]
+        is_open = key in self._expanded
+        # Branche chargée : ses enfants font foi ; sinon, l'indice relevé au parcours
+        has_children = bool(node["children"]) if node["children"] is not None else node["hint"]
+        if has_children:
+            text = ("- " if is_open else "+ ") + node["text"]
+        else:
+            text = "   " + node["text"]
+        return {
+            "text": text,
+            "key": key,
+            "sidebar": self,
+            "depth": depth,
+            "has_children": has_children,
+            "is_open": is_open,
+            "selected": key == self._selected_key,
+        }
+
+    def _flatten(self, key, depth):
+        """Lignes visibles de la branche `key` (elle comprise), dans l'ordre d'affichage."""
+        rows = []
+        stack = [(key, depth)]
+        while stack:
+            key, depth = stack.pop()
+            rows.append(self._row(key, depth))
+            if key in self._expanded:
+                stack.extend((child, depth + 1) for child in reversed(self._nodes[key]["children"] or ()))
+        return rows
+
+    def _update_rows(self):
+        """
+        Aplatit les branches ouvertes et ne remplace dans le RecycleView que la
+        plage de lignes qui diffère (début et fin communs laissés en place).
+        """
+        rows = self._flatten("render", 0)
+        data = self.rv.data
+        common = min(len(rows), len(data))
+        start = 0
+        while start < common and rows[start] == data[start]:
+            start += 1
+        if start == len(rows) == len(data):
+            return
+        tail = 0
+        while tail < common - start and rows[-1 - tail] == data[-1 - tail]:
+            tail += 1
+        data[start:len(data) - tail] = rows[start:len(rows) - tail]
+
+    def _row_index(self, key):
+        for index, row in enumerate(self.rv.data):
+            if row["key"] == key:
+                return index
+        return None
+
+    def toggle_row(self, key):
+        """Ouvre/ferme une branche en n'insérant ou ne retirant que ses lignes."""
+        index = self._row_index(key)
+        if index is None:
+            return
+        data = self.rv.data
+        depth = data[index]["depth"]
+        if key in self._expanded:
+            self._expanded.discard(key)
+            end = index + 1
+            while end < len(data) and data[end]["depth"] > depth:
+                end += 1
+            data[index:end] = [self._row(key, depth)]
+        else:
+            self._expanded.add(key)
+            if self._nodes[key]["children"] is None:
+                self._load_children(self._nodes, key)
+                for child_key in self._subtree_keys(key):
+                    self._index(child_key)
+            data[index:index + 1] = self._flatten(key, depth)
+
+    def select_row(self, key):
+        node = self._nodes.get(key)
+        if node is None:
+            return
+        for row in self.rv.data:
+            if row["selected"] or row["key"] == key:
+                row["selected"] = row["key"] == key
+        self._selected_key = key
+        self.rv.refresh_from_data()
+        self.on_select_node(node["panda_node"])
+
+    def on_select_node(self, panda_node):
+        if panda_node:
+            self.selected_node = panda_node
+            log.info("Sélection du node : %s", self.selected_node)
             # Mettre à jour la sidebar propriétés
-            if self.selected_node:
-                self.panda_app.properties_sidebar.set_node(self.selected_node)
+            self.panda_app.properties_sidebar.set_node(self.selected_node)